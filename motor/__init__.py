@@ -0,0 +1 @@
+# Piezas compartidas por los scrapers de supermercados.
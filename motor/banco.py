@@ -0,0 +1,402 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+
+try:
+    import resource  # no existe en Windows: ahí no se reporta RSS
+except ImportError:
+    resource = None
+
+from motor import extraccion
+from motor.lote import MODOS_VALIDOS
+from motor.metricas import ESPERAS_PURAS, Envoltura, es_de_playwright
+from tiendas import TIENDAS, cargar_adaptador
+
+# --- BANCO DE PRUEBAS OFFLINE ---
+# Corre el motor de extracción de cada tienda contra categorías grabadas,
+# sin tocar la red, para comparar estrategias de extracción antes de
+# desplegarlas. Cada caso del corpus vive en corpus/<tienda>/<caso>/:
+#   manifiesto.json  url, fecha y productos obtenidos al grabar
+#   red.har.zip      respuestas grabadas (documento, scripts, JSON de la API)
+#   dom.html         page.content() al final de la extracción
+#
+# Modos de reproducción:
+#   "replay": la página se sirve desde el HAR (page.route_from_har); lo que
+#             no está grabado se aborta. Ejercita scroll + captura de red.
+#   "dom":    solo se sirve dom.html sin <script>; mide la lectura del DOM.
+#
+# Para instrumentar sin tocar el motor se reemplaza sync_playwright y
+# realizar_scroll_adaptativo en motor/extraccion.py por versiones que
+# cuentan llamadas y guardan las estadísticas del scroll. Las esperas puras
+# (wait_for_timeout) se cuentan aparte para que llamadas_por_producto no
+# dependa de cuánto tardó la red.
+#
+# "arranque" mide, en un proceso nuevo por variante, el tiempo de importar
+# scraper.py y el de guardar N productos sintéticos por el mismo camino que
+# scraper.main (guardar_en_memoria: precios, deduplicación, fixture en
+# disco; solo ejecutar() se reemplaza por los productos), más el RSS pico.
+# La variante "(antes)" carga además pandas al importar, como hacían los
+# scripts.
+
+DIRECTORIO_CORPUS = "corpus"
+MODOS_REPRODUCCION = ("replay", "dom")
+MARCA_RESULTADO = "RESULTADO_BANCO "
+
+# Sin sesión guardada: grabación y reproducción recorren el mismo camino.
+# Sin cosecha: sobre el dom.html estático cada paso del scroll no trae nada
+# y se mediría el recorrido de la página en vez de la lectura.
+OPCIONES_BANCO = {'headless': True, 'reutilizar_sesion': False, 'cosechar': False}
+
+RE_SCRIPT = re.compile(r"<script\b(?![^>]*application/(?:ld\+)?json)[^>]*>.*?</script>",
+                       re.IGNORECASE | re.DOTALL)
+
+
+class _ContextoPlaywright:
+    def __init__(self, original, banco):
+        self._original = original
+        self._banco = banco
+
+    def __enter__(self):
+        return self._banco.envolver(self._original.__enter__())
+
+    def __exit__(self, *exc):
+        return self._original.__exit__(*exc)
+
+
+class Banco:
+    """
+    Instrumenta motor/extraccion.py para una corrida de grabación o reproducción.
+
+    caso: carpeta del caso en el corpus. modo: "grabar" o uno de MODOS_REPRODUCCION.
+    """
+
+    def __init__(self, caso, modo, url):
+        self.modulo = extraccion
+        self.caso = caso
+        self.modo = modo
+        self.url = url
+        self.llamadas = Counter()
+        self.esperas = Counter()
+        self.stats_scroll = []
+        self.ganchos = {
+            ('BrowserType', 'launch'): self._lanzar,
+            ('Browser', 'new_context'): self._nuevo_contexto,
+            ('Browser', 'new_page'): self._nueva_pagina_navegador,
+            ('BrowserContext', 'new_page'): self._nueva_pagina,
+            ('BrowserContext', 'close'): self._cerrar_contexto,
+        }
+        self._originales = {}
+
+    def envolver(self, valor):
+        if isinstance(valor, list):
+            return [self.envolver(v) for v in valor]
+        return Envoltura(valor, self) if es_de_playwright(valor) else valor
+
+    def llamar(self, objeto, clase, nombre, metodo, args, kwargs):
+        # Los sondeos con wait_for_timeout van aparte (ver motor/metricas.py)
+        (self.esperas if nombre in ESPERAS_PURAS else self.llamadas)[f"{clase}.{nombre}"] += 1
+        gancho = self.ganchos.get((clase, nombre))
+        if gancho:
+            return self.envolver(gancho(objeto, metodo, args, kwargs))
+        return self.envolver(metodo(*args, **kwargs))
+
+    def ruta(self, archivo):
+        return os.path.join(self.caso, archivo)
+
+    # --- ganchos sobre la API de Playwright ---
+    def _lanzar(self, objeto, original, args, kwargs):
+        # Siempre headless y sin slow_mo: se mide la extracción, no la demora visual
+        kwargs.update(headless=True, slow_mo=0)
+        return original(*args, **kwargs)
+
+    def _opciones_contexto(self, kwargs):
+        kwargs['service_workers'] = "block"
+        if self.modo == "grabar":
+            kwargs['record_har_path'] = self.ruta("red.har.zip")
+            kwargs['record_har_mode'] = "full"
+        return kwargs
+
+    def _nuevo_contexto(self, objeto, original, args, kwargs):
+        return original(*args, **self._opciones_contexto(kwargs))
+
+    def _nueva_pagina_navegador(self, objeto, original, args, kwargs):
+        page = original(*args, **self._opciones_contexto(kwargs))
+        self._preparar_pagina(page)
+        return page
+
+    def _nueva_pagina(self, objeto, original, args, kwargs):
+        page = original(*args, **kwargs)
+        self._preparar_pagina(page)
+        return page
+
+    def _preparar_pagina(self, page):
+        # Las rutas de página tienen prioridad sobre las del contexto (bloqueador),
+        # así ninguna petición sale a la red en reproducción.
+        if self.modo == "replay":
+            page.route_from_har(self.ruta("red.har.zip"), not_found="abort")
+        elif self.modo == "dom":
+            page.route("**/*", self._servir_dom)
+
+    def _servir_dom(self, route):
+        request = route.request
+        if request.resource_type == "document" and request.frame.parent_frame is None:
+            with open(self.ruta("dom.html"), encoding="utf-8") as f:
+                html = RE_SCRIPT.sub("", f.read())
+            route.fulfill(status=200, content_type="text/html; charset=utf-8", body=html)
+        else:
+            route.abort()
+
+    def _cerrar_contexto(self, objeto, original, args, kwargs):
+        # El DOM final se guarda justo antes de cerrar; el HAR se escribe al cerrar
+        if self.modo == "grabar" and objeto.pages:
+            with open(self.ruta("dom.html"), "w", encoding="utf-8") as f:
+                f.write(objeto.pages[0].content())
+        return original(*args, **kwargs)
+
+    # --- instalación en el módulo de la tienda ---
+    def _scroll(self, *args, **kwargs):
+        stats = self._originales['realizar_scroll_adaptativo'](*args, **kwargs)
+        self.stats_scroll.append(stats)
+        return stats
+
+    def instalar(self):
+        self._originales = {
+            'sync_playwright': self.modulo.sync_playwright,
+            'realizar_scroll_adaptativo': self.modulo.realizar_scroll_adaptativo,
+        }
+        original = self._originales['sync_playwright']
+        self.modulo.sync_playwright = lambda: _ContextoPlaywright(original(), self)
+        self.modulo.realizar_scroll_adaptativo = self._scroll
+
+    def desinstalar(self):
+        for nombre, valor in self._originales.items():
+            setattr(self.modulo, nombre, valor)
+
+
+def _rss_pico_mb():
+    """(proceso actual, hijo más grande: driver/navegador) en MB, o None si no se puede medir."""
+    if resource is None:
+        return None, None
+    escala = 1024 * 1024 if sys.platform == "darwin" else 1024  # ru_maxrss: bytes en macOS, KB en Linux
+    propio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / escala
+    hijos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / escala
+    return round(propio, 1), round(hijos, 1)
+
+
+def correr_caso(caso, modo="replay", lectura="lote"):
+    """Corre el motor de extracción sobre un caso del corpus y devuelve las métricas."""
+    with open(os.path.join(caso, "manifiesto.json"), encoding="utf-8") as f:
+        manifiesto = json.load(f)
+    adaptador = cargar_adaptador(manifiesto['tienda'])
+
+    banco = Banco(caso, modo, manifiesto['url'])
+    banco.instalar()
+    inicio = time.perf_counter()
+    try:
+        productos = extraccion.extraer_categoria(adaptador, manifiesto['url'],
+                                                 dict(OPCIONES_BANCO, modo=lectura))
+    finally:
+        banco.desinstalar()
+    total_s = time.perf_counter() - inicio
+
+    llamadas = sum(banco.llamadas.values())
+    rss_propio, rss_hijos = _rss_pico_mb()
+    return {
+        'caso': caso,
+        'tienda': manifiesto['tienda'],
+        'modo': modo,
+        'lectura': lectura,
+        'productos': len(productos),
+        'productos_grabados': manifiesto.get('productos'),
+        'total_s': round(total_s, 3),
+        'productos_por_s': round(len(productos) / total_s, 1) if total_s else None,
+        'llamadas_playwright': llamadas,
+        'llamadas_por_producto': round(llamadas / len(productos), 2) if productos else None,
+        'esperas_playwright': sum(banco.esperas.values()),
+        'espera_scroll_s': round(sum(s['espera_s'] for s in banco.stats_scroll), 3),
+        'pasos_scroll': sum(s['pasos'] for s in banco.stats_scroll),
+        'rss_pico_mb': rss_propio,
+        'rss_pico_navegador_mb': rss_hijos,
+        'llamadas_top': dict(banco.llamadas.most_common(8)),
+    }
+
+
+def grabar_caso(tienda, url, nombre, directorio=DIRECTORIO_CORPUS):
+    """Corre la extracción en vivo y guarda HAR + DOM + manifiesto en el corpus."""
+    caso = os.path.join(directorio, tienda, nombre)
+    os.makedirs(caso, exist_ok=True)
+    banco = Banco(caso, "grabar", url)
+    banco.instalar()
+    try:
+        productos = extraccion.extraer_categoria(cargar_adaptador(tienda), url, OPCIONES_BANCO)
+    finally:
+        banco.desinstalar()
+
+    with open(os.path.join(caso, "manifiesto.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            'tienda': tienda,
+            'url': url,
+            'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'productos': len(productos),
+        }, f, indent=2, ensure_ascii=False)
+    print(f"📼 Caso grabado en {caso}: {len(productos)} productos")
+    return caso
+
+
+def listar_casos(directorio=DIRECTORIO_CORPUS, tiendas=None):
+    casos = []
+    for tienda in sorted(os.listdir(directorio)) if os.path.isdir(directorio) else []:
+        if tiendas and tienda not in tiendas:
+            continue
+        carpeta = os.path.join(directorio, tienda)
+        for nombre in sorted(os.listdir(carpeta)):
+            if os.path.exists(os.path.join(carpeta, nombre, "manifiesto.json")):
+                casos.append(os.path.join(carpeta, nombre))
+    return casos
+
+
+def correr_en_subproceso(caso, modo, lectura):
+    """Un proceso por caso, así el RSS pico no se arrastra de un caso al otro."""
+    salida = subprocess.run(
+        [sys.executable, "-m", "motor.banco", "caso", caso, "--modo", modo, "--lectura", lectura],
+        capture_output=True, text=True, encoding="utf-8"
+    )
+    for linea in reversed(salida.stdout.splitlines()):
+        if linea.startswith(MARCA_RESULTADO):
+            return json.loads(linea[len(MARCA_RESULTADO):])
+    print(f"❌ {caso} ({modo}/{lectura}) no devolvió resultado:\n{salida.stderr[-2000:]}")
+    return None
+
+
+CODIGO_ARRANQUE = """
+import json, sys, time
+inicio = time.perf_counter()
+{precarga}
+import scraper
+import_s = time.perf_counter() - inicio
+
+productos = [{{
+    'supermercado': 'Jumbo', 'nombre': f'Marca - Producto {{i}}', 'marca': 'Marca',
+    'nombre_corto': f'Producto {{i}}', 'precio_texto': f'${{1000 + i % 9000:,}}'.replace(',', '.'),
+    'url_origen': f'https://www.jumbo.cl/producto-{{i % {unicos}}}/p',
+    'imagen_url': '', 'disponible': True, 'fecha_actualizacion': '2024-01-01 00:00:00',
+}} for i in range({n})]
+scraper.ejecutar = lambda *args, **kwargs: {{'jumbo': productos}}
+inicio = time.perf_counter()
+fixtures = scraper.guardar_en_memoria([('jumbo', '')], {{}}, {{}}, False, '.', False)
+guardado_s = time.perf_counter() - inicio
+
+from motor.banco import MARCA_RESULTADO, _rss_pico_mb
+with open(fixtures[0], encoding='utf-8') as f:
+    total = len(json.load(f))
+print(MARCA_RESULTADO + json.dumps({{
+    'import_s': round(import_s, 3), 'guardado_s': round(guardado_s, 3), 'rss_pico_mb': _rss_pico_mb()[0],
+    'pandas_cargado': 'pandas' in sys.modules, 'productos': total,
+}}))
+"""
+
+VARIANTES_ARRANQUE = {
+    'cli': {'precarga': ""},
+    'cli+pandas (antes)': {'precarga': "import pandas"},
+}
+
+
+def medir_arranque(n=20000, repeticiones=3):
+    """Corre cada variante en un proceso nuevo (en un directorio temporal) y se queda con la mediana."""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    entorno = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [raiz, os.environ.get('PYTHONPATH')])))
+    resultados = []
+    with tempfile.TemporaryDirectory() as temporal:
+        for nombre, variante in VARIANTES_ARRANQUE.items():
+            codigo = CODIGO_ARRANQUE.format(n=n, unicos=max(1, n * 9 // 10), **variante)
+            corridas = []
+            for _ in range(repeticiones):
+                salida = subprocess.run([sys.executable, "-c", codigo], cwd=temporal, env=entorno,
+                                        capture_output=True, text=True, encoding="utf-8")
+                lineas = [l for l in salida.stdout.splitlines() if l.startswith(MARCA_RESULTADO)]
+                if not lineas:
+                    print(f"❌ {nombre} no devolvió resultado:\n{salida.stderr[-2000:]}")
+                    break
+                corridas.append(json.loads(lineas[-1][len(MARCA_RESULTADO):]))
+            if corridas:
+                corridas.sort(key=lambda r: r['import_s'])
+                resultados.append(dict(corridas[len(corridas) // 2], variante=nombre))
+    return resultados
+
+
+def imprimir_arranque(resultados):
+    print(f"\n{'variante':<24} {'import_s':>9} {'guardado_s':>10} {'rss_mb':>7} {'pandas':>7} {'prod':>6}")
+    for r in resultados:
+        print(f"{r['variante']:<24} {r['import_s']:>9} {r['guardado_s']:>10} {r['rss_pico_mb'] or '-':>7} "
+              f"{'sí' if r['pandas_cargado'] else 'no':>7} {r['productos']:>6}")
+
+
+def imprimir_tabla(resultados):
+    print(f"\n{'caso':<40} {'modo':<14} {'prod':>5} {'prod/s':>8} {'llam/prod':>9} "
+          f"{'scroll_s':>8} {'rss_mb':>7} {'nav_mb':>7}")
+    for r in resultados:
+        aviso = " ⚠️" if r['productos_grabados'] and r['productos'] < r['productos_grabados'] else ""
+        print(f"{r['caso'][-40:]:<40} {r['modo'] + '/' + r['lectura']:<14} {r['productos']:>5} {r['productos_por_s'] or '-':>8} "
+              f"{r['llamadas_por_producto'] or '-':>9} {r['espera_scroll_s']:>8} "
+              f"{r['rss_pico_mb'] or '-':>7} {r['rss_pico_navegador_mb'] or '-':>7}{aviso}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banco de pruebas offline de los extractores.")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_grabar = sub.add_parser('grabar', help="Graba una categoría en vivo al corpus (requiere red)")
+    p_grabar.add_argument('tienda', choices=sorted(TIENDAS))
+    p_grabar.add_argument('url')
+    p_grabar.add_argument('--caso', required=True, help="Nombre de la carpeta del caso")
+    p_grabar.add_argument('--corpus', default=DIRECTORIO_CORPUS)
+
+    p_correr = sub.add_parser('correr', help="Corre todos los casos del corpus sin red")
+    p_correr.add_argument('--corpus', default=DIRECTORIO_CORPUS)
+    p_correr.add_argument('--tienda', action='append', choices=sorted(TIENDAS))
+    p_correr.add_argument('--modo', action='append', choices=MODOS_REPRODUCCION)
+    p_correr.add_argument('--lectura', action='append', choices=MODOS_VALIDOS,
+                          help="Modo de lectura de tarjetas a comparar (por defecto lote)")
+    p_correr.add_argument('--salida', help="Archivo JSON con los resultados")
+
+    p_arranque = sub.add_parser('arranque', help="Tiempo de importación y de guardado de la CLI, y RSS")
+    p_arranque.add_argument('--productos', type=int, default=20000)
+    p_arranque.add_argument('--repeticiones', type=int, default=3)
+    p_arranque.add_argument('--salida', help="Archivo JSON con los resultados")
+
+    p_caso = sub.add_parser('caso', help="Corre un solo caso en este proceso")
+    p_caso.add_argument('ruta')
+    p_caso.add_argument('--modo', default="replay", choices=MODOS_REPRODUCCION)
+    p_caso.add_argument('--lectura', default="lote", choices=MODOS_VALIDOS)
+
+    args = parser.parse_args()
+
+    if args.comando == 'grabar':
+        grabar_caso(args.tienda, args.url, args.caso, args.corpus)
+    elif args.comando == 'arranque':
+        resultados = medir_arranque(args.productos, args.repeticiones)
+        imprimir_arranque(resultados)
+        if args.salida:
+            with open(args.salida, "w", encoding="utf-8") as f:
+                json.dump(resultados, f, indent=2, ensure_ascii=False)
+    elif args.comando == 'caso':
+        print(MARCA_RESULTADO + json.dumps(correr_caso(args.ruta, args.modo, args.lectura), ensure_ascii=False))
+    else:
+        casos = listar_casos(args.corpus, args.tienda)
+        if not casos:
+            sys.exit(f"⚠️ No hay casos en '{args.corpus}'. Graba uno con: python -m motor.banco grabar ...")
+        resultados = [r for caso in casos
+                      for modo in (args.modo or ["replay"])
+                      for lectura in (args.lectura or ["lote"])
+                      if (r := correr_en_subproceso(caso, modo, lectura))]
+        imprimir_tabla(resultados)
+        if args.salida:
+            with open(args.salida, "w", encoding="utf-8") as f:
+                json.dump(resultados, f, indent=2, ensure_ascii=False)
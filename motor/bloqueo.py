@@ -0,0 +1,130 @@
+from urllib.parse import urlparse
+
+# --- BLOQUEO DE RECURSOS ---
+# Solo necesitamos el string `src` de las imágenes, no descargarlas. Con
+# context.route cortamos imágenes, fuentes, media y trackers antes de que
+# salgan a la red. Cada tienda puede agregar reglas propias y, sobre todo,
+# una lista "permitir" que siempre pasa (XHR de "Ver más", modal de comuna).
+
+TIPOS_BLOQUEADOS_BASE = ["image", "font", "media", "ping"]
+
+DOMINIOS_BLOQUEADOS_BASE = [
+    "googletagmanager.com",
+    "google-analytics.com",
+    "analytics.google.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "facebook.net",
+    "facebook.com",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "tiktok.com",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "newrelic.com",
+    "nr-data.net",
+    "segment.io",
+    "cdn.segment.com",
+    "bing.com",
+]
+
+# Tamaños promedio para estimar lo que se ahorra (lo bloqueado nunca se descarga)
+BYTES_ESTIMADOS_POR_TIPO = {
+    "image": 45_000,
+    "font": 35_000,
+    "media": 250_000,
+    "script": 60_000,
+    "ping": 500,
+    "xhr": 2_000,
+    "fetch": 2_000,
+}
+
+
+def _coincide_dominio(host, dominios):
+    return any(host == d or host.endswith("." + d) for d in dominios)
+
+
+class BloqueadorRecursos:
+    """
+    Decide qué peticiones abortar y lleva la cuenta de lo bloqueado y lo permitido.
+
+    reglas (todas opcionales):
+      'permitir': fragmentos de URL que nunca se bloquean.
+      'bloquear_tipos': resource types extra a bloquear.
+      'bloquear_dominios': dominios extra a bloquear.
+      'permitir_tipos': resource types base que esta tienda sí necesita.
+    """
+
+    def __init__(self, reglas=None):
+        reglas = reglas or {}
+        self.permitir = list(reglas.get('permitir', []))
+        permitir_tipos = set(reglas.get('permitir_tipos', []))
+        self.tipos = (set(TIPOS_BLOQUEADOS_BASE) | set(reglas.get('bloquear_tipos', []))) - permitir_tipos
+        self.dominios = DOMINIOS_BLOQUEADOS_BASE + list(reglas.get('bloquear_dominios', []))
+        self.bloqueados = {}
+        self.bytes_bloqueados_estimados = 0
+        self.permitidos = 0
+        self.bytes_permitidos = 0
+
+    def debe_bloquear(self, request):
+        url = request.url
+        if any(fragmento in url for fragmento in self.permitir):
+            return False
+        if request.resource_type in self.tipos:
+            return True
+        return _coincide_dominio(urlparse(url).hostname or "", self.dominios)
+
+    def _registrar_bloqueo(self, request):
+        tipo = request.resource_type
+        self.bloqueados[tipo] = self.bloqueados.get(tipo, 0) + 1
+        self.bytes_bloqueados_estimados += BYTES_ESTIMADOS_POR_TIPO.get(tipo, 5_000)
+
+    def _al_responder(self, response):
+        self.permitidos += 1
+        try:
+            self.bytes_permitidos += int(response.headers.get("content-length", 0))
+        except ValueError:
+            pass
+
+    # --- versión sync ---
+    def _manejar(self, route):
+        if self.debe_bloquear(route.request):
+            self._registrar_bloqueo(route.request)
+            route.abort()
+        else:
+            route.continue_()
+
+    def instalar(self, destino):
+        """destino puede ser un BrowserContext o una Page."""
+        destino.route("**/*", self._manejar)
+        destino.on("response", self._al_responder)
+
+    # --- versión async ---
+    async def _manejar_async(self, route):
+        if self.debe_bloquear(route.request):
+            self._registrar_bloqueo(route.request)
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def instalar_async(self, destino):
+        await destino.route("**/*", self._manejar_async)
+        destino.on("response", self._al_responder)
+
+    def resumen(self):
+        return {
+            'bloqueados': sum(self.bloqueados.values()),
+            'bloqueados_por_tipo': dict(self.bloqueados),
+            'bytes_bloqueados_estimados': self.bytes_bloqueados_estimados,
+            'permitidos': self.permitidos,
+            'bytes_permitidos': self.bytes_permitidos,
+        }
+
+    def imprimir_resumen(self, nombre_super):
+        r = self.resumen()
+        print(f"🧹 {nombre_super}: bloqueadas {r['bloqueados']} peticiones "
+              f"(~{r['bytes_bloqueados_estimados'] // 1024} KB estimados) | "
+              f"permitidas {r['permitidos']} ({r['bytes_permitidos'] // 1024} KB)")
@@ -0,0 +1,96 @@
+import hashlib
+import os
+
+# --- CACHÉ DE RED (grabar / reproducir) ---
+# Para iterar sobre selectores sin recorrer la tienda en vivo cada vez:
+#   "grabar":     cada categoría se extrae en vivo y su sesión completa
+#                 (documento, scripts, XHR/JSON) queda en un HAR comprimido
+#                 .cache_red/<tienda>/<hash de la url>.har.zip;
+#   "reproducir": si la categoría está grabada, la página se sirve desde el
+#                 HAR con route_from_har (lo no grabado se aborta) y la
+#                 extracción completa corre en segundos; si no, se graba.
+# El HAR se escribe al cerrar el contexto: se guarda con un nombre temporal
+# y solo pasa a la caché si la extracción terminó bien. La caché tiene un
+# tope en MB y se poda por LRU (la fecha de modificación de cada entrada se
+# renueva cada vez que se reproduce).
+
+DIRECTORIO_CACHE_RED = ".cache_red"
+MAX_MB_CACHE_RED = 1024
+MODOS_CACHE_RED = ("grabar", "reproducir")
+EXTENSION = ".har.zip"
+
+
+def ruta_entrada(directorio, tienda, url):
+    return os.path.join(directorio, tienda, hashlib.sha1(url.encode('utf-8')).hexdigest()[:20] + EXTENSION)
+
+
+def podar(directorio=DIRECTORIO_CACHE_RED, max_mb=MAX_MB_CACHE_RED):
+    """Borra las entradas usadas hace más tiempo hasta quedar bajo max_mb. Devuelve cuántas borró."""
+    entradas = []
+    for raiz, _, archivos in os.walk(directorio):
+        for archivo in archivos:
+            if archivo.endswith(EXTENSION) and not archivo.endswith(".tmp" + EXTENSION):
+                ruta = os.path.join(raiz, archivo)
+                estado = os.stat(ruta)
+                entradas.append((estado.st_mtime, estado.st_size, ruta))
+    total = sum(tamano for _, tamano, _ in entradas)
+    tope = max_mb * 1024 * 1024
+    borradas = 0
+    for _, tamano, ruta in sorted(entradas):
+        if total <= tope:
+            break
+        os.remove(ruta)
+        total -= tamano
+        borradas += 1
+    if borradas:
+        print(f"🧹 Caché de red: {borradas} entradas viejas borradas (tope {max_mb} MB).")
+    return borradas
+
+
+class EntradaCacheRed:
+    """La grabación o reproducción de una categoría; inactiva si opciones['cache_red'] es None."""
+
+    def __init__(self, opciones, tienda, url):
+        self.directorio = opciones['cache_red_directorio']
+        self.max_mb = opciones['cache_red_mb']
+        self.ruta = ruta_entrada(self.directorio, tienda, url)
+        self.temporal = self.ruta[:-len(EXTENSION)] + ".tmp" + EXTENSION
+        self.modo = opciones['cache_red']
+        if self.modo == "reproducir" and not os.path.exists(self.ruta):
+            self.modo = "grabar"
+        self.completa = False
+
+    def opciones_contexto(self):
+        """Argumentos extra para browser.new_context."""
+        if not self.modo:
+            return {}
+        # Los service workers se saltan el ruteo y no quedan en el HAR
+        opciones = {'service_workers': "block"}
+        if self.modo == "grabar":
+            os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+            opciones.update(record_har_path=self.temporal, record_har_mode="full")
+        return opciones
+
+    def instalar(self, page):
+        # En la página para que tenga prioridad sobre las rutas del bloqueador (contexto)
+        if self.modo == "reproducir":
+            os.utime(self.ruta)
+            page.route_from_har(self.ruta, not_found="abort")
+            print(f"📼 Reproduciendo {self.ruta}")
+
+    async def instalar_async(self, page):
+        if self.modo == "reproducir":
+            os.utime(self.ruta)
+            await page.route_from_har(self.ruta, not_found="abort")
+            print(f"📼 Reproduciendo {self.ruta}")
+
+    def cerrar(self):
+        """Llamar después de context.close(): ahí Playwright termina de escribir el HAR."""
+        if self.modo != "grabar" or not os.path.exists(self.temporal):
+            return
+        if not self.completa:
+            os.remove(self.temporal)
+            return
+        os.replace(self.temporal, self.ruta)
+        print(f"📼 Grabado {self.ruta}")
+        podar(self.directorio, self.max_mb)
@@ -0,0 +1,109 @@
+import asyncio
+import inspect
+import re
+
+# --- CAPTURA DE RESPUESTAS JSON ---
+# Mientras la página hace scroll, las tiendas piden su catálogo a APIs JSON.
+# En vez de esperar el render y leer el DOM, escuchamos page.on("response"),
+# parseamos cada payload apenas llega y armamos los productos desde ahí.
+
+
+def buscar_objetos(payload, es_producto):
+    """Recorre un JSON anidado y devuelve los dicts que cumplan es_producto."""
+    encontrados = []
+    pendientes = [payload]
+    while pendientes:
+        actual = pendientes.pop()
+        if isinstance(actual, dict):
+            if es_producto(actual):
+                encontrados.append(actual)
+                continue
+            pendientes.extend(actual.values())
+        elif isinstance(actual, list):
+            pendientes.extend(reversed(actual))
+    return encontrados
+
+
+def precio_a_entero(valor):
+    """Convierte 3990, 3990.0, "3990" o "$3.990" a entero; None si no se puede."""
+    if valor is None or isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return int(valor)
+    limpio = re.sub(r'[^\d]', '', str(valor).split(',')[0])
+    return int(limpio) if limpio else None
+
+
+class CapturaRespuestas:
+    """
+    Escucha las respuestas de una página y guarda los productos que encuentre.
+
+    patrones_url: fragmentos de URL que identifican la API de catálogo.
+    parsear: función payload -> lista de productos (mismo formato que el DOM).
+    al_agregar: opcional, recibe los productos de cada payload apenas se
+        parsean (checkpoint en motor/diario.py).
+    """
+
+    def __init__(self, nombre_super, patrones_url, parsear, al_agregar=None):
+        self.nombre_super = nombre_super
+        self.patrones_url = patrones_url
+        self.parsear = parsear
+        self.al_agregar = al_agregar
+        self.productos = {}
+        self.respuestas = 0
+        self.errores = 0
+        self._tareas = []
+
+    def conectar(self, page):
+        page.on("response", self._al_recibir)
+
+    def desconectar(self, page):
+        page.remove_listener("response", self._al_recibir)
+
+    def es_de_catalogo(self, response):
+        if not any(patron in response.url for patron in self.patrones_url):
+            return False
+        return "json" in response.headers.get("content-type", "")
+
+    def _al_recibir(self, response):
+        if not self.es_de_catalogo(response):
+            return
+        try:
+            payload = response.json()
+        except Exception:
+            self.errores += 1
+            return
+        if inspect.isawaitable(payload):
+            # Con playwright.async_api el cuerpo se lee en una tarea aparte
+            self._tareas.append(asyncio.ensure_future(self._agregar_async(payload)))
+            return
+        try:
+            self.agregar_payload(payload)
+        except Exception:
+            self.errores += 1
+
+    async def _agregar_async(self, payload):
+        try:
+            self.agregar_payload(await payload)
+        except Exception:
+            self.errores += 1
+
+    async def esperar_pendientes(self):
+        """Espera a que terminen de parsearse los payloads (solo modo async)."""
+        if self._tareas:
+            await asyncio.gather(*self._tareas, return_exceptions=True)
+            self._tareas = []
+
+    def agregar_payload(self, payload):
+        self.respuestas += 1
+        productos = [producto for producto in self.parsear(payload) if producto]
+        for producto in productos:
+            # La última observación de un mismo producto gana
+            self.productos[producto['url_origen']] = producto
+        if self.al_agregar and productos:
+            self.al_agregar(productos)
+
+    def resultados(self):
+        print(f" -> Red {self.nombre_super}: {len(self.productos)} productos en "
+              f"{self.respuestas} respuestas ({self.errores} con error)")
+        return list(self.productos.values())
@@ -0,0 +1,167 @@
+import argparse
+import json
+import sqlite3
+
+from motor.fixture import MODEL_NAME
+
+try:
+    import psycopg
+except ImportError:  # pip install psycopg (solo para cargar en Postgres)
+    psycopg = None
+
+# --- CARGA DIRECTA A LA BASE DE DJANGO ---
+# En vez de `manage.py loaddata` (un INSERT/UPDATE por objeto, con señales y
+# validación del ORM) los fixtures {tienda}_.json se cargan en la tabla del
+# modelo con upserts por lotes: INSERT ... ON CONFLICT (producto_url,
+# supermercado_id) DO UPDATE, que SQLite (>= 3.24) y Postgres entienden
+# igual. La clave es la URL del producto y no el pk del fixture: los ids
+# los asigna la base.
+#
+# Antes de escribir cada lote se leen las filas existentes para contar
+# insertados / actualizados / sin cambios; las que no cambiaron no se
+# reescriben (tampoco su fecha_actualizacion).
+#
+# La tabla necesita un índice único en (producto_url, supermercado_id) para
+# el ON CONFLICT. Para probar contra una base SQLite local:
+#   python -m motor.carga jumbo_.json lider_.json --db prueba.sqlite3 --crear-tabla
+#   python -m motor.carga jumbo_.json --db postgresql://usuario@localhost/tucanasta
+
+TABLA_PRODUCTOS = MODEL_NAME.replace(".", "_")
+TAMANO_LOTE = 500
+COLUMNA_CLAVE = "producto_url"
+# Campos del fixture que en la tabla son FK (Django les agrega _id)
+CAMPOS_FK = {"supermercado"}
+COLUMNAS = ["nombre", "marca", "tipo", "descripcion", "supermercado_id", "precio", "moneda",
+            "imagen_url", "producto_url", "disponible", "fecha_actualizacion"]
+# Lo que se compara para decidir si la fila cambió
+COLUMNAS_COMPARADAS = [c for c in COLUMNAS if c not in ("producto_url", "supermercado_id", "fecha_actualizacion")]
+
+ESQUEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS {tabla} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre TEXT NOT NULL,
+    marca TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    descripcion TEXT NOT NULL,
+    supermercado_id INTEGER NOT NULL,
+    precio INTEGER,
+    moneda TEXT NOT NULL,
+    imagen_url TEXT NOT NULL,
+    producto_url TEXT NOT NULL,
+    disponible INTEGER NOT NULL,
+    fecha_actualizacion TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS {tabla}_url_super ON {tabla} (producto_url, supermercado_id);
+"""
+
+
+def conectar(destino):
+    """postgresql://... usa psycopg; cualquier otra cosa es la ruta de una base SQLite."""
+    if destino.startswith(("postgres://", "postgresql://")):
+        if psycopg is None:
+            raise RuntimeError("Cargar en Postgres requiere psycopg: pip install psycopg")
+        return psycopg.connect(destino)
+    return sqlite3.connect(destino.removeprefix("sqlite:///"), timeout=30)
+
+
+def marcador(conexion):
+    return "?" if isinstance(conexion, sqlite3.Connection) else "%s"
+
+
+def crear_tabla_sqlite(conexion, tabla=TABLA_PRODUCTOS):
+    """Solo para pruebas locales: en producción la tabla la crean las migraciones de Django."""
+    conexion.executescript(ESQUEMA_SQLITE.format(tabla=tabla))
+
+
+def filas_desde_fixture(objetos):
+    """Objetos del fixture -> tuplas en el orden de COLUMNAS (el pk del fixture se ignora)."""
+    filas = []
+    for objeto in objetos:
+        campos = {(f"{k}_id" if k in CAMPOS_FK else k): v for k, v in objeto['fields'].items()}
+        filas.append(tuple(campos[c] for c in COLUMNAS))
+    return filas
+
+
+def sentencia_upsert(tabla, m):
+    actualizadas = ", ".join(f"{c} = excluded.{c}" for c in COLUMNAS
+                             if c not in (COLUMNA_CLAVE, "supermercado_id"))
+    return (f"INSERT INTO {tabla} ({', '.join(COLUMNAS)}) VALUES ({', '.join([m] * len(COLUMNAS))}) "
+            f"ON CONFLICT ({COLUMNA_CLAVE}, supermercado_id) DO UPDATE SET {actualizadas}")
+
+
+def existentes(cursor, tabla, m, supermercado_id, urls):
+    """(supermercado_id, url) -> valores de COLUMNAS_COMPARADAS de las filas que ya están."""
+    cursor.execute(
+        f"SELECT supermercado_id, {COLUMNA_CLAVE}, {', '.join(COLUMNAS_COMPARADAS)} FROM {tabla} "
+        f"WHERE supermercado_id = {m} AND {COLUMNA_CLAVE} IN ({', '.join([m] * len(urls))})",
+        [supermercado_id, *urls])
+    return {(fila[0], fila[1]): tuple(fila[2:]) for fila in cursor.fetchall()}
+
+
+def cargar_filas(conexion, filas, tabla=TABLA_PRODUCTOS, tamano_lote=TAMANO_LOTE):
+    """Upsert por lotes; devuelve {'insertados', 'actualizados', 'sin_cambios'}."""
+    m = marcador(conexion)
+    sql = sentencia_upsert(tabla, m)
+    i_super, i_url = COLUMNAS.index("supermercado_id"), COLUMNAS.index(COLUMNA_CLAVE)
+    i_comparadas = [COLUMNAS.index(c) for c in COLUMNAS_COMPARADAS]
+    stats = {'insertados': 0, 'actualizados': 0, 'sin_cambios': 0}
+
+    # La última aparición de cada producto gana, como en deduplicar
+    filas = list({(f[i_super], f[i_url]): f for f in filas}.values())
+    filas.sort(key=lambda f: f[i_super])
+    cursor = conexion.cursor()
+    for inicio in range(0, len(filas), tamano_lote):
+        lote = filas[inicio:inicio + tamano_lote]
+        actuales = {}
+        for supermercado_id in {f[i_super] for f in lote}:
+            urls = [f[i_url] for f in lote if f[i_super] == supermercado_id]
+            actuales.update(existentes(cursor, tabla, m, supermercado_id, urls))
+
+        escribir = []
+        for fila in lote:
+            anterior = actuales.get((fila[i_super], fila[i_url]))
+            nuevos = tuple(fila[i] for i in i_comparadas)
+            if anterior is None:
+                stats['insertados'] += 1
+            elif tuple(anterior) == nuevos:
+                stats['sin_cambios'] += 1
+                continue
+            else:
+                stats['actualizados'] += 1
+            escribir.append(fila)
+        if escribir:
+            cursor.executemany(sql, escribir)
+        conexion.commit()
+    return stats
+
+
+def cargar_fixture(conexion, ruta, tabla=TABLA_PRODUCTOS, tamano_lote=TAMANO_LOTE):
+    with open(ruta, encoding='utf-8') as f:
+        objetos = json.load(f)
+    stats = cargar_filas(conexion, filas_desde_fixture(objetos), tabla, tamano_lote)
+    print(f"🗄️ {ruta} -> {tabla}: {stats['insertados']} insertados, "
+          f"{stats['actualizados']} actualizados, {stats['sin_cambios']} sin cambios")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga fixtures {tienda}_.json directo en la tabla de productos.")
+    parser.add_argument('fixtures', nargs='+', metavar='FIXTURE')
+    parser.add_argument('--db', required=True, help="Ruta SQLite o postgresql://...")
+    parser.add_argument('--tabla', default=TABLA_PRODUCTOS)
+    parser.add_argument('--lote', type=int, default=TAMANO_LOTE)
+    parser.add_argument('--crear-tabla', action='store_true', help="Crea la tabla en SQLite (pruebas locales)")
+    args = parser.parse_args()
+
+    conexion = conectar(args.db)
+    try:
+        if args.crear_tabla:
+            crear_tabla_sqlite(conexion, args.tabla)
+        for ruta in args.fixtures:
+            cargar_fixture(conexion, ruta, args.tabla, args.lote)
+    finally:
+        conexion.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# --- COSECHA INCREMENTAL DURANTE EL SCROLL ---
+# Algunas tiendas virtualizan la grilla: al bajar, las tarjetas que quedan
+# arriba se sacan del DOM y leer todo al final del scroll pierde productos.
+# Con 'cosecha' en el adaptador, después de cada paso del scroll se corre el
+# mismo js_lote y se devuelven solo los registros cuyo id ('campo_id':
+# data-cnstrc-item-id, href del producto...) todavía no está completo.
+#
+# Las tarjetas ya completas no se vuelven a leer: mientras corre js_lote,
+# document.querySelectorAll del selector del contenedor ('arg_contenedor'
+# de args_lote) devuelve solo los elementos que no están en un WeakSet, así
+# que cada paso lee las tarjetas nuevas y no todo el DOM (el innerText de
+# Lider fuerza un layout por tarjeta). Para eso js_lote tiene que devolver
+# un registro por elemento y en orden, como hacen todos los adaptadores; si
+# no, solo se filtra por id. Los ids completos quedan en un Set. Ambos
+# viven en window (ESTADO_JS) y no en el DOM: page.content() queda igual
+# que sin cosecha (dom.html del banco, snapshots de html_estatico) y las
+# imágenes no se tocan.
+#
+# Una tarjeta cuenta como completa recién cuando sus 'requeridos' (precio e
+# imagen por defecto) tienen valor; un placeholder data: del lazy load no
+# cuenta. Mientras tanto se vuelve a leer en cada paso y en Python se guarda
+# su última versión, así una tarjeta que se desmonta antes de cargar el
+# precio sale igual, con lo que alcanzó a tener.
+
+ESTADO_JS = "__cosecha"
+REQUERIDOS_POR_DEFECTO = ('precio', 'imagen')
+
+PLANTILLA_JS_COSECHA = """
+({args, clave, campoId, requeridos}) => {
+    const estado = window.ESTADO_JS || (window.ESTADO_JS = {ids: new Set(), elementos: new WeakSet()});
+    const lleno = (v) => v != null && String(v).trim() !== '' && !String(v).startsWith('data:');
+    const original = document.querySelectorAll;
+    let pendientes = [];
+    document.querySelectorAll = function (sel) {
+        const todos = original.call(this, sel);
+        if (sel !== args[clave]) return todos;
+        pendientes = Array.from(todos).filter((el) => !estado.elementos.has(el));
+        return pendientes;
+    };
+    let registros;
+    try {
+        registros = (JS_LOTE)(args);
+    } finally {
+        document.querySelectorAll = original;
+    }
+    const alineados = registros.length === pendientes.length;
+    return registros.filter((registro, i) => {
+        const id = registro[campoId];
+        const completo = id != null && requeridos.every((campo) => lleno(registro[campo]));
+        if (completo && alineados) estado.elementos.add(pendientes[i]);
+        if (id == null || estado.ids.has(id)) return false;
+        if (completo) estado.ids.add(id);
+        return true;
+    });
+}
+"""
+
+
+def js_cosecha(js_lote):
+    return PLANTILLA_JS_COSECHA.replace("JS_LOTE", js_lote.strip()).replace("ESTADO_JS", ESTADO_JS)
+
+
+def registro_completo(registro, requeridos):
+    """Mismo criterio que `lleno` en PLANTILLA_JS_COSECHA."""
+    for campo in requeridos:
+        valor = registro.get(campo)
+        if valor is None or not str(valor).strip() or str(valor).startswith("data:"):
+            return False
+    return True
+
+
+class CosechaIncremental:
+    """Registros de tarjetas acumulados paso a paso, uno por id."""
+
+    def __init__(self, adaptador):
+        ajustes = adaptador['cosecha']
+        self.campo_id = ajustes['campo_id']
+        self.requeridos = list(ajustes.get('requeridos', REQUERIDOS_POR_DEFECTO))
+        self.js = js_cosecha(adaptador['js_lote'])
+        self.args = {'args': adaptador['args_lote'], 'clave': ajustes.get('arg_contenedor', 'contenedor'),
+                     'campoId': self.campo_id, 'requeridos': self.requeridos}
+        self.por_id = {}
+        self.completos = set()
+
+    @property
+    def registros(self):
+        return list(self.por_id.values())
+
+    def agregar(self, registros):
+        """Guarda la última versión de cada id; devuelve cuántos eran nuevos o se completaron."""
+        avances = 0
+        for registro in registros:
+            identificador = registro.get(self.campo_id)
+            if identificador is None or identificador in self.completos:
+                continue
+            nuevo = identificador not in self.por_id
+            self.por_id[identificador] = registro
+            if registro_completo(registro, self.requeridos):
+                self.completos.add(identificador)
+                avances += 1
+            elif nuevo:
+                avances += 1
+        return avances
+
+    def cosechar(self, page):
+        return self.agregar(page.evaluate(self.js, self.args))
+
+    async def cosechar_async(self, page):
+        return self.agregar(await page.evaluate(self.js, self.args))
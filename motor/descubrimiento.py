@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import re
+import time
+import urllib.request
+import xml.etree.ElementTree as ET
+from urllib.parse import urljoin, urlparse, urlunparse
+
+from playwright.sync_api import sync_playwright, Error as PlaywrightError
+
+from motor.bloqueo import BloqueadorRecursos
+from motor.navegador import lanzar
+from tiendas import TIENDAS, cargar_adaptador
+
+# --- DESCUBRIMIENTO DE CATEGORÍAS ---
+# Lee el árbol de categorías de cada tienda (sitemap, API de categorías o
+# menú de la página) una sola vez, lo guarda en disco con TTL y entrega la
+# lista de trabajos (tienda, url) para recorrer el catálogo completo.
+#
+# Cada adaptador declara 'descubrimiento':
+#   'fuentes': lista que se prueba en orden hasta que una devuelve URLs
+#       {'tipo': 'sitemap', 'url': ..., 'incluir': 'category'}   <loc> del XML (sigue sitemapindex)
+#       {'tipo': 'api', 'url': ...}                              todo campo 'url'/'href' del JSON
+#       {'tipo': 'menu', 'url': ..., 'abrir': selector,          <a href> de la página renderizada
+#        'enlaces': selector}                                    (acotados a 'enlaces', ej. el nav)
+#   'patron': regex que debe cumplir el path de una categoría. Si tiene el
+#       grupo (?P<ruta>...) la jerarquía se compara con ese grupo (ej. Lider,
+#       donde el path termina en un id numérico).
+#   'solo_hojas': True (defecto) descarta una categoría si otra es su hija,
+#       así un producto no se recorre una vez en "despensa" y otra en
+#       "despensa/arroz-y-legumbres".
+
+DIRECTORIO_CATEGORIAS = ".categorias"
+TTL_CATEGORIAS_HORAS = 24 * 7
+TIMEOUT_DESCARGA_S = 30
+
+
+def normalizar_url(url, url_base):
+    """Misma categoría, misma URL: sin query, fragmento ni '/' final, host de url_base."""
+    partes = urlparse(urljoin(url_base + "/", url.strip()))
+    base = urlparse(url_base)
+    return urlunparse((base.scheme, base.netloc, partes.path.rstrip('/') or '/', '', '', ''))
+
+
+def _ruta_categoria(path, patron):
+    coincidencia = patron.search(path)
+    if not coincidencia:
+        return None
+    ruta = coincidencia.groupdict().get('ruta') or path
+    return tuple(s for s in ruta.split('/') if s)
+
+
+def filtrar_categorias(urls, url_base, patron, solo_hojas=True):
+    """Normaliza, filtra por patrón, deduplica y (opcional) deja solo las hojas del árbol."""
+    patron = re.compile(patron)
+    rutas = {}
+    for url in urls:
+        if not url or urlparse(urljoin(url_base + "/", url)).netloc != urlparse(url_base).netloc:
+            continue
+        normalizada = normalizar_url(url, url_base)
+        ruta = _ruta_categoria(urlparse(normalizada).path, patron)
+        if ruta:
+            rutas.setdefault(ruta, normalizada)
+
+    if solo_hojas:
+        # Una ruta con hijas es un prefijo propio de otra ruta
+        padres = {ruta[:i] for ruta in rutas for i in range(1, len(ruta))}
+        rutas = {ruta: url for ruta, url in rutas.items() if ruta not in padres}
+    return sorted(rutas.values())
+
+
+# --- FUENTES ---
+def _descargar(url, user_agent):
+    peticion = urllib.request.Request(url, headers={'User-Agent': user_agent or "Mozilla/5.0"})
+    with urllib.request.urlopen(peticion, timeout=TIMEOUT_DESCARGA_S) as respuesta:
+        return respuesta.read()
+
+
+def urls_desde_sitemap(fuente, adaptador, profundidad=3):
+    """<loc> del sitemap; en un sitemapindex sigue los hijos que contienen 'incluir'."""
+    raiz = ET.fromstring(_descargar(fuente['url'], adaptador['user_agent']))
+    locs = [el.text.strip() for el in raiz.iter() if el.tag.endswith('loc') and el.text]
+    if not raiz.tag.endswith('sitemapindex'):
+        return locs
+
+    urls = []
+    for loc in locs:
+        if profundidad and fuente.get('incluir', '') in loc:
+            urls.extend(urls_desde_sitemap(dict(fuente, url=loc), adaptador, profundidad - 1))
+    return urls
+
+
+def _recorrer_json(nodo, urls):
+    if isinstance(nodo, dict):
+        for clave, valor in nodo.items():
+            if clave in ('url', 'href', 'link') and isinstance(valor, str):
+                urls.append(valor)
+            else:
+                _recorrer_json(valor, urls)
+    elif isinstance(nodo, list):
+        for hijo in nodo:
+            _recorrer_json(hijo, urls)
+
+
+def urls_desde_api(fuente, adaptador):
+    """Todos los campos url/href/link de la respuesta, a cualquier profundidad del árbol."""
+    urls = []
+    _recorrer_json(json.loads(_descargar(fuente['url'], adaptador['user_agent'])), urls)
+    # Las APIs suelen devolver el host interno de la plataforma: se conserva solo el path
+    return [urlparse(url).path for url in urls]
+
+
+JS_ENLACES = "(selector) => Array.from(document.querySelectorAll(selector), (a) => a.getAttribute('href'))"
+
+
+def urls_desde_menu(fuente, adaptador, headless=True):
+    """Enlaces de la página renderizada (abre el menú si hace falta)."""
+    with sync_playwright() as p:
+        browser = lanzar(p, headless=headless)
+        try:
+            opciones = {'user_agent': adaptador['user_agent']} if adaptador['user_agent'] else {}
+            context = browser.new_context(**opciones)
+            BloqueadorRecursos(adaptador['reglas_bloqueo']).instalar(context)
+            page = context.new_page()
+            page.goto(fuente['url'], timeout=90000, wait_until="domcontentloaded")
+            if fuente.get('abrir'):
+                try:
+                    page.locator(fuente['abrir']).first.click(timeout=10000)
+                    page.wait_for_timeout(1500)
+                except PlaywrightError:
+                    print(f"⚠️ No se pudo abrir el menú de {adaptador['nombre']}, se leen los enlaces visibles.")
+            return [href for href in page.evaluate(JS_ENLACES, fuente.get('enlaces', 'a[href]')) if href]
+        finally:
+            browser.close()
+
+
+FUENTES = {
+    'sitemap': urls_desde_sitemap,
+    'api': urls_desde_api,
+    'menu': urls_desde_menu,
+}
+
+
+# --- CACHÉ ---
+def _ruta_cache(tienda, directorio):
+    return os.path.join(directorio, f"{tienda}.json")
+
+
+def leer_cache(tienda, ttl_horas=TTL_CATEGORIAS_HORAS, directorio=DIRECTORIO_CATEGORIAS):
+    ruta = _ruta_cache(tienda, directorio)
+    if not os.path.exists(ruta) or time.time() - os.path.getmtime(ruta) >= ttl_horas * 3600:
+        return None
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)['categorias']
+
+
+def guardar_cache(tienda, categorias, fuente, directorio=DIRECTORIO_CATEGORIAS):
+    os.makedirs(directorio, exist_ok=True)
+    ruta = _ruta_cache(tienda, directorio)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump({'tienda': tienda, 'fuente': fuente, 'generado': time.strftime('%Y-%m-%d %H:%M:%S'),
+                   'categorias': categorias}, f, indent=2, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def descubrir_categorias(tienda, refrescar=False, ttl_horas=TTL_CATEGORIAS_HORAS,
+                         directorio=DIRECTORIO_CATEGORIAS):
+    """
+    URLs de categoría de la tienda: desde la caché si está vigente, si no
+    desde la primera fuente que responda. Si ninguna sirve, las categorías
+    por defecto del adaptador.
+    """
+    adaptador = cargar_adaptador(tienda)
+    config = adaptador['descubrimiento']
+    if not config:
+        print(f"⚠️ {adaptador['nombre']} no declara descubrimiento, se usan sus categorías por defecto.")
+        return list(adaptador['categorias'])
+
+    if not refrescar:
+        categorias = leer_cache(tienda, ttl_horas, directorio)
+        if categorias:
+            print(f"📂 {adaptador['nombre']}: {len(categorias)} categorías desde la caché.")
+            return categorias
+
+    for fuente in config['fuentes']:
+        try:
+            urls = FUENTES[fuente['tipo']](fuente, adaptador)
+        except Exception as e:
+            print(f"⚠️ Fuente '{fuente['tipo']}' de {adaptador['nombre']} falló: {e}")
+            continue
+        categorias = filtrar_categorias(urls, adaptador['url_base'], config['patron'],
+                                        config.get('solo_hojas', True))
+        if categorias:
+            guardar_cache(tienda, categorias, fuente['tipo'], directorio)
+            print(f"🗂️ {adaptador['nombre']}: {len(categorias)} categorías desde '{fuente['tipo']}' "
+                  f"({len(urls)} enlaces leídos).")
+            return categorias
+        print(f"⚠️ Fuente '{fuente['tipo']}' de {adaptador['nombre']} no devolvió categorías.")
+
+    print(f"⚠️ Sin categorías descubiertas para {adaptador['nombre']}, se usan las por defecto.")
+    return list(adaptador['categorias'])
+
+
+def trabajos_descubiertos(tiendas, refrescar=False):
+    """Lista de trabajos (tienda, url) para el catálogo completo de las tiendas dadas."""
+    return [(tienda, url) for tienda in tiendas for url in descubrir_categorias(tienda, refrescar)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Descubre las categorías de cada tienda.")
+    parser.add_argument('tiendas', nargs='+', choices=sorted(TIENDAS))
+    parser.add_argument('--refrescar', action='store_true', help="Ignora la caché vigente")
+    parser.add_argument('--salida', help="Escribe los trabajos como JSON para `scraper.py --archivo`")
+    args = parser.parse_args()
+
+    trabajos = trabajos_descubiertos(args.tiendas, args.refrescar)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump([list(t) for t in trabajos], f, indent=2, ensure_ascii=False)
+        print(f"✅ {len(trabajos)} trabajos -> {args.salida}")
+    else:
+        for tienda, url in trabajos:
+            print(f"{tienda}\t{url}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+# --- DIARIO DE TRABAJOS (checkpoint / reanudar) ---
+# Con cientos de categorías por corrida, un error o un corte no debe
+# tirar lo ya extraído. El diario (SQLite) guarda cada categoría al
+# terminar y, mientras se hace scroll, los productos que va capturando la
+# red. Al volver a correr con el mismo diario:
+#   - las categorías completadas no se vuelven a abrir: sus productos se
+#     entregan desde el diario;
+#   - las pendientes se extraen de nuevo y se suman los productos parciales
+#     del intento anterior que no volvieron a aparecer;
+#   - si una vuelve a fallar, se entregan sus parciales y queda pendiente.
+# Cuando una corrida termina sin pendientes el diario se borra.
+
+RUTA_DIARIO = "diario_trabajos.sqlite3"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS trabajos (
+    tienda TEXT NOT NULL,
+    url TEXT NOT NULL,
+    estado TEXT NOT NULL,
+    intentos INTEGER NOT NULL DEFAULT 0,
+    productos TEXT,
+    error TEXT,
+    actualizado TEXT NOT NULL,
+    PRIMARY KEY (tienda, url)
+);
+CREATE TABLE IF NOT EXISTS parciales (
+    tienda TEXT NOT NULL,
+    url TEXT NOT NULL,
+    url_origen TEXT NOT NULL,
+    datos TEXT NOT NULL,
+    PRIMARY KEY (tienda, url, url_origen)
+);
+"""
+
+
+def _ahora():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class DiarioTrabajos:
+    """Estado de cada trabajo (tienda, url) de una corrida larga."""
+
+    def __init__(self, ruta=RUTA_DIARIO):
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta, timeout=30)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.executescript(ESQUEMA)
+
+    def completados(self):
+        return {(t, u) for t, u in self.conexion.execute(
+            "SELECT tienda, url FROM trabajos WHERE estado = 'completado'")}
+
+    def productos_completados(self, tienda, url):
+        fila = self.conexion.execute(
+            "SELECT productos FROM trabajos WHERE tienda = ? AND url = ? AND estado = 'completado'",
+            (tienda, url)).fetchone()
+        return json.loads(fila[0]) if fila else []
+
+    def parciales(self, tienda, url):
+        return [json.loads(datos) for (datos,) in self.conexion.execute(
+            "SELECT datos FROM parciales WHERE tienda = ? AND url = ?", (tienda, url))]
+
+    def reanudar(self, trabajos, entregar):
+        """Entrega los productos de los trabajos ya completados y devuelve los pendientes."""
+        completados = self.completados()
+        pendientes = []
+        for tienda, url in trabajos:
+            if (tienda, url) in completados:
+                entregar(tienda, self.productos_completados(tienda, url))
+            else:
+                pendientes.append((tienda, url))
+        if len(pendientes) < len(trabajos):
+            print(f"⏭️ Diario {self.ruta}: {len(trabajos) - len(pendientes)} categorías ya completadas, "
+                  f"quedan {len(pendientes)}.")
+        return pendientes
+
+    def registrador_parcial(self, tienda, url):
+        """Callback para CapturaRespuestas: guarda cada lote de productos apenas llega."""
+        def registrar(productos):
+            with self.conexion:
+                self.conexion.executemany(
+                    "INSERT OR REPLACE INTO parciales (tienda, url, url_origen, datos) VALUES (?, ?, ?, ?)",
+                    ((tienda, url, p['url_origen'], json.dumps(p, ensure_ascii=False)) for p in productos)
+                )
+        return registrar
+
+    def completar(self, tienda, url, productos):
+        """
+        Marca el trabajo como completado y devuelve sus productos, sumando los
+        parciales de intentos anteriores que esta vez no aparecieron.
+        """
+        vistos = {p.get('url_origen') for p in productos}
+        productos = productos + [p for p in self.parciales(tienda, url) if p['url_origen'] not in vistos]
+        with self.conexion:
+            self.conexion.execute(
+                "INSERT INTO trabajos (tienda, url, estado, intentos, productos, actualizado) "
+                "VALUES (?, ?, 'completado', 1, ?, ?) "
+                "ON CONFLICT (tienda, url) DO UPDATE SET estado = 'completado', intentos = intentos + 1, "
+                "productos = excluded.productos, error = NULL, actualizado = excluded.actualizado",
+                (tienda, url, json.dumps(productos, ensure_ascii=False), _ahora())
+            )
+            self.conexion.execute("DELETE FROM parciales WHERE tienda = ? AND url = ?", (tienda, url))
+        return productos
+
+    def fallar(self, tienda, url, error):
+        """Registra el fallo y devuelve los parciales guardados (pueden ser [])."""
+        with self.conexion:
+            self.conexion.execute(
+                "INSERT INTO trabajos (tienda, url, estado, intentos, error, actualizado) "
+                "VALUES (?, ?, 'fallido', 1, ?, ?) "
+                "ON CONFLICT (tienda, url) DO UPDATE SET estado = 'fallido', intentos = intentos + 1, "
+                "error = excluded.error, actualizado = excluded.actualizado",
+                (tienda, url, str(error), _ahora())
+            )
+        parciales = self.parciales(tienda, url)
+        if parciales:
+            print(f"💾 {tienda} {url}: se conservan {len(parciales)} productos parciales.")
+        return parciales
+
+    def dejar_pendiente(self, tienda, url, productos, motivo):
+        """Guarda los productos como parciales y deja el trabajo pendiente para la próxima corrida."""
+        self.registrador_parcial(tienda, url)(productos)
+        return self.fallar(tienda, url, motivo)
+
+    def cerrar(self, trabajos):
+        """Cierra el diario; lo borra si todos los trabajos quedaron completados."""
+        completados = self.completados()
+        pendientes = [t for t in trabajos if t not in completados]
+        self.conexion.close()
+        if pendientes:
+            print(f"📓 {len(pendientes)} categorías pendientes en {self.ruta}: "
+                  f"vuelve a correr con el mismo --diario para reanudar.")
+            return
+        for sufijo in ("", "-wal", "-shm"):
+            if os.path.exists(self.ruta + sufijo):
+                os.remove(self.ruta + sufijo)
@@ -0,0 +1,269 @@
+import argparse
+import json
+import re
+import unicodedata
+from collections import Counter
+
+import numpy as np
+
+try:
+    import scipy.sparse as sp
+except ImportError:  # pip install scipy
+    sp = None
+
+from tiendas import TIENDAS, cargar_adaptador, tienda_de_url
+
+# --- EMPAREJAMIENTO ENTRE SUPERMERCADOS ---
+# Une el mismo producto en Jumbo, Lider, Santa Isabel y Unimarc a partir
+# de los fixtures ({tienda}_.json). Pasos:
+#   1. Normaliza nombre + marca (minúsculas, sin tildes ni signos) y saca el
+#      tamaño a una medida base: "1 kg" -> 1000 g, "6 x 350 cc" -> 2100 ml,
+#      "12 un" -> 12 un.
+#   2. Índice TF-IDF de n-gramas de caracteres en una matriz dispersa. Los
+#      n-gramas que aparecen en demasiados productos se descartan: no
+#      distinguen nada y son los que harían crecer X @ X.T hacia n².
+#   3. Similitud coseno solo entre productos del mismo tamaño base ("1 kg"
+#      y "1000 g" caen juntos, "900 g" no), por bloques de filas y en
+#      matrices dispersas; quedan los pares de tiendas distintas sobre el
+#      umbral (filtro vectorizado).
+#   4. Grupos con union-find de mayor a menor similitud, sin juntar dos
+#      productos de la misma tienda en un grupo.
+
+N_GRAMA = 3
+MAX_DF = 0.05             # fracción de productos sobre la que un n-grama se descarta...
+MIN_DF_DESCARTE = 50      # ...siempre que además aparezca en más de estos productos
+UMBRAL_SIMILITUD = 0.6
+FILAS_POR_BLOQUE = 2000
+
+UNIDADES = {
+    'kg': ('g', 1000), 'kilo': ('g', 1000), 'kilos': ('g', 1000),
+    'g': ('g', 1), 'gr': ('g', 1), 'grs': ('g', 1), 'gramos': ('g', 1),
+    'l': ('ml', 1000), 'lt': ('ml', 1000), 'lts': ('ml', 1000), 'litro': ('ml', 1000), 'litros': ('ml', 1000),
+    'ml': ('ml', 1), 'cc': ('ml', 1),
+    'un': ('un', 1), 'u': ('un', 1), 'und': ('un', 1), 'unid': ('un', 1), 'unidades': ('un', 1),
+}
+DIMENSIONES = {'g': 1, 'ml': 2, 'un': 3}  # 0 = sin tamaño
+
+RE_TAMANO = re.compile(
+    r'\b(?:(\d+)\s*x\s*)?(\d+(?:[.,]\d+)?)\s*(' + '|'.join(sorted(UNIDADES, key=len, reverse=True)) + r')\b'
+)
+
+
+def normalizar_texto(texto):
+    """Minúsculas, sin tildes y sin signos salvo el decimal: "Leche Entera 1,5 L." -> "leche entera 1,5 l"."""
+    texto = unicodedata.normalize('NFKD', texto or "")
+    texto = "".join(c for c in texto if not unicodedata.combining(c)).lower()
+    texto = re.sub(r'[^a-z0-9,.]+|(?<!\d)[,.]|[,.](?!\d)', ' ', texto)
+    return " ".join(texto.split())
+
+
+def _numero(valor):
+    # "1,5" -> 1.5 ; "1.000" -> 1000 (punto de miles) ; "0.5" -> 0.5
+    if ',' in valor:
+        return float(valor.replace('.', '').replace(',', '.'))
+    entero, _, decimales = valor.partition('.')
+    return float(entero + decimales) if len(decimales) == 3 else float(valor)
+
+
+def extraer_tamano(texto):
+    """(texto sin el tamaño, unidad base, cantidad) sobre texto ya normalizado."""
+    coincidencia = None
+    for coincidencia in RE_TAMANO.finditer(texto):
+        pass  # el último tamaño del nombre suele ser el del envase
+    if not coincidencia:
+        return texto, None, None
+    multiplo, valor, unidad = coincidencia.groups()
+    base, factor = UNIDADES[unidad]
+    cantidad = _numero(valor) * factor * (int(multiplo) if multiplo else 1)
+    resto = texto[:coincidencia.start()] + " " + texto[coincidencia.end():]
+    return " ".join(resto.split()), base, cantidad
+
+
+def clave_tamano(unidad, cantidad):
+    """Entero que identifica el tamaño en unidad base; 0 si no hay tamaño."""
+    if not unidad:
+        return 0
+    return DIMENSIONES[unidad] * 10 ** 12 + round(cantidad * 1000)
+
+
+def tienda_de_objeto(campos):
+    """La tienda sale de la URL: el id de supermercado del fixture puede repetirse (Jumbo y Unimarc)."""
+    try:
+        return tienda_de_url(campos.get('producto_url') or "")
+    except ValueError:
+        return str(campos['supermercado'])
+
+
+def preparar_producto(objeto, nombres_super):
+    """Del objeto del fixture a lo que usa el índice."""
+    campos = objeto['fields']
+    tienda = tienda_de_objeto(campos)
+    texto = normalizar_texto(f"{campos.get('marca') or ''} {campos.get('nombre') or ''}")
+    texto, unidad, cantidad = extraer_tamano(texto)
+    return {
+        'pk': objeto['pk'],
+        'supermercado': campos['supermercado'],
+        'tienda': nombres_super.get(tienda, tienda),
+        '_tienda': tienda,
+        'nombre': campos.get('nombre'),
+        'marca': campos.get('marca'),
+        'precio': campos.get('precio'),
+        'producto_url': campos.get('producto_url'),
+        'tamano': f"{cantidad:g} {unidad}" if unidad else None,
+        '_texto': re.sub(r'[,.]', ' ', texto),
+        '_clave_tamano': clave_tamano(unidad, cantidad),
+    }
+
+
+# --- ÍNDICE TF-IDF ---
+def _ngramas(texto, n=N_GRAMA):
+    texto = f" {texto} "
+    return [texto[i:i + n] for i in range(len(texto) - n + 1)]
+
+
+def matriz_tfidf(textos, n=N_GRAMA, max_df=MAX_DF, min_df_descarte=MIN_DF_DESCARTE):
+    """Matriz CSR (productos x n-gramas) con tf sublineal, idf suavizado y filas de norma 1."""
+    if sp is None:
+        raise RuntimeError("Falta scipy para el índice de emparejamiento: pip install scipy")
+    vocabulario = {}
+    filas, columnas, valores = [], [], []
+    for i, texto in enumerate(textos):
+        for ngrama, cuenta in Counter(_ngramas(texto, n)).items():
+            filas.append(i)
+            columnas.append(vocabulario.setdefault(ngrama, len(vocabulario)))
+            valores.append(cuenta)
+
+    columnas = np.asarray(columnas, dtype=np.int64)
+    tf = 1.0 + np.log(np.asarray(valores, dtype=np.float64))
+    frecuencia = np.bincount(columnas, minlength=len(vocabulario))
+    idf = np.log((1 + len(textos)) / (1 + frecuencia)) + 1.0
+    idf[frecuencia > max(max_df * len(textos), min_df_descarte)] = 0.0
+
+    matriz = sp.csr_matrix((tf * idf[columnas], (np.asarray(filas), columnas)),
+                           shape=(len(textos), len(vocabulario)))
+    matriz.eliminate_zeros()
+    normas = np.sqrt(np.asarray(matriz.multiply(matriz).sum(axis=1)).ravel())
+    normas[normas == 0] = 1.0
+    return sp.diags(1.0 / normas) @ matriz
+
+
+def _comparar(matriz, filas, columnas, umbral, supermercados, filas_por_bloque):
+    """Pares (i, j, similitud) entre `filas` y `columnas` sobre el umbral y de tiendas distintas."""
+    traspuesta = matriz[columnas].T.tocsr()
+    for inicio in range(0, len(filas), filas_por_bloque):
+        bloque = filas[inicio:inicio + filas_por_bloque]
+        similitud = (matriz[bloque] @ traspuesta).tocoo()
+        i, j, s = bloque[similitud.row], columnas[similitud.col], similitud.data
+        mascara = (s >= umbral) & (supermercados[i] != supermercados[j])
+        yield i[mascara], j[mascara], s[mascara]
+
+
+def pares_candidatos(matriz, supermercados, claves_tamano, umbral=UMBRAL_SIMILITUD,
+                     filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    (i, j, similitud) con i < j, de tiendas distintas y mismo tamaño.
+
+    Solo se comparan productos del mismo tamaño (clave 0 = sin tamaño, que
+    se compara contra todos): cada bloque es una fracción del catálogo y
+    X @ X.T nunca se arma completo.
+    """
+    lotes = []
+    orden = np.argsort(claves_tamano, kind='stable')
+    claves, inicios = np.unique(claves_tamano[orden], return_index=True)
+    for clave, filas in zip(claves, np.split(orden, inicios[1:])):
+        if clave == 0:
+            continue
+        for i, j, s in _comparar(matriz, filas, filas, umbral, supermercados, filas_por_bloque):
+            lotes.append((i[j > i], j[j > i], s[j > i]))
+
+    sin_tamano = np.flatnonzero(claves_tamano == 0)
+    if len(sin_tamano):
+        todas = np.arange(matriz.shape[0])
+        for i, j, s in _comparar(matriz, sin_tamano, todas, umbral, supermercados, filas_por_bloque):
+            # Entre dos sin tamaño el par aparece dos veces: se deja el de i < j
+            mascara = (claves_tamano[j] != 0) | (j > i)
+            i, j = np.minimum(i, j)[mascara], np.maximum(i, j)[mascara]
+            lotes.append((i, j, s[mascara]))
+
+    if not lotes:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0)
+    return tuple(np.concatenate(partes) for partes in zip(*lotes))
+
+
+def agrupar(n, pares_i, pares_j, similitudes, supermercados):
+    """
+    Union-find de mayor a menor similitud; un grupo no repite tienda.
+
+    Devuelve ({raíz: [índices]} de los grupos con 2 o más, similitud mínima por raíz).
+    """
+    padre = list(range(n))
+    tiendas = [{supermercados[k]} for k in range(n)]
+    minima = [1.0] * n
+
+    def raiz(k):
+        while padre[k] != k:
+            padre[k] = padre[padre[k]]
+            k = padre[k]
+        return k
+
+    for k in np.argsort(-similitudes, kind='stable'):
+        a, b = raiz(int(pares_i[k])), raiz(int(pares_j[k]))
+        if a == b or tiendas[a] & tiendas[b]:
+            continue
+        if len(tiendas[a]) < len(tiendas[b]):
+            a, b = b, a
+        padre[b] = a
+        tiendas[a] |= tiendas[b]
+        minima[a] = min(minima[a], minima[b], float(similitudes[k]))
+
+    grupos = {}
+    for k in range(n):
+        grupos.setdefault(raiz(k), []).append(k)
+    return {r: miembros for r, miembros in grupos.items() if len(miembros) > 1}, minima
+
+
+def emparejar(objetos, umbral=UMBRAL_SIMILITUD):
+    """Grupos candidatos de equivalencia a partir de objetos de fixture de varias tiendas."""
+    nombres_super = {t: cargar_adaptador(t)['nombre'] for t in TIENDAS}
+    productos = [preparar_producto(o, nombres_super) for o in objetos]
+    if not productos:
+        return []
+
+    matriz = matriz_tfidf([p['_texto'] for p in productos])
+    supermercados = np.array([p['_tienda'] for p in productos])
+    claves_tamano = np.array([p['_clave_tamano'] for p in productos], dtype=np.int64)
+
+    pares_i, pares_j, similitudes = pares_candidatos(matriz, supermercados, claves_tamano, umbral)
+    grupos, minima = agrupar(len(productos), pares_i, pares_j, similitudes, supermercados)
+    print(f"🔗 {len(productos)} productos, {len(similitudes)} pares candidatos, {len(grupos)} grupos.")
+
+    salida = []
+    for numero, (raiz, miembros) in enumerate(sorted(grupos.items(), key=lambda g: -len(g[1])), start=1):
+        salida.append({
+            'grupo': numero,
+            'similitud_minima': round(minima[raiz], 3),
+            'productos': [{k: v for k, v in productos[m].items() if not k.startswith('_')}
+                          for m in miembros],
+        })
+    return salida
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agrupa el mismo producto entre supermercados.")
+    parser.add_argument('fixtures', nargs='+', help="Fixtures {tienda}_.json de las tiendas a cruzar")
+    parser.add_argument('--umbral', type=float, default=UMBRAL_SIMILITUD, help="Similitud coseno mínima")
+    parser.add_argument('--salida', default="grupos_productos.json")
+    args = parser.parse_args()
+
+    objetos = []
+    for ruta in args.fixtures:
+        with open(ruta, encoding='utf-8') as f:
+            objetos.extend(json.load(f))
+    grupos = emparejar(objetos, args.umbral)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(grupos, f, indent=2, ensure_ascii=False)
+    print(f"✅ {len(grupos)} grupos -> {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+import time
+
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+
+from motor.bloqueo import BloqueadorRecursos
+from motor.cache_red import DIRECTORIO_CACHE_RED, MAX_MB_CACHE_RED, EntradaCacheRed
+from motor.captura_red import CapturaRespuestas
+from motor.cosecha import CosechaIncremental
+from motor.html_estatico import extraer_registros
+from motor.huellas import calcular_huella
+from motor.lote import leer_tarjetas
+from motor.metricas import Metricas, RegistroMetricas
+from motor.navegador import PERFIL_POR_DEFECTO, lanzar, viewport
+from motor.planificador import ExtraccionParcial, Planificador
+from motor.precios import normalizar_precios
+from motor.preparacion import preparar, sesion_valida
+from motor.scroll import MOTIVOS_PARCIALES, imprimir_resumen_tiempos, realizar_scroll_adaptativo
+from motor.sesion import SesionTienda
+from tiendas import cargar_adaptador
+
+# --- MOTOR DE EXTRACCIÓN (sync) ---
+# Un solo flujo para todas las tiendas: contexto con user agent y sesión,
+# bloqueo de recursos, captura de la API, preparación declarativa, scroll
+# adaptativo y lectura de tarjetas (html / lote / locator). Lo propio de
+# cada tienda viene en su adaptador (tiendas/).
+
+OPCIONES_POR_DEFECTO = {
+    'headless': True,
+    'perfil': PERFIL_POR_DEFECTO,  # "ligero", "completo" o "depuracion" (motor/navegador.py)
+    'conectar': None,          # ws://... o http://... de un navegador ya abierto
+    'modo': "lote",            # "html", "lote" o "locator" (motor/lote.py)
+    'comparar': False,         # True ejecuta todos los modos e imprime los tiempos
+    'cosechar': True,          # lectura incremental durante el scroll (motor/cosecha.py)
+    'capturar_red': True,
+    'bloquear_recursos': True,
+    'reutilizar_sesion': True,
+    'cache_red': None,         # "grabar" o "reproducir" (motor/cache_red.py)
+    'cache_red_directorio': DIRECTORIO_CACHE_RED,
+    'cache_red_mb': MAX_MB_CACHE_RED,
+}
+
+
+def completar_opciones(opciones=None):
+    return dict(OPCIONES_POR_DEFECTO, **(opciones or {}))
+
+
+def crear_sesion(adaptador, opciones):
+    if not adaptador['sesion'] or not opciones['reutilizar_sesion']:
+        return None
+    return SesionTienda(*adaptador['sesion'])
+
+
+def opciones_contexto(adaptador, sesion, perfil=PERFIL_POR_DEFECTO):
+    """Argumentos para browser.new_context según el adaptador, el perfil y la sesión guardada."""
+    opciones = {}
+    if adaptador['user_agent']:
+        opciones['user_agent'] = adaptador['user_agent']
+    if viewport(perfil, adaptador):
+        opciones['viewport'] = viewport(perfil, adaptador)
+    if sesion:
+        opciones.update(sesion.opciones_contexto())
+    return opciones
+
+
+def crear_captura(adaptador, url, opciones, al_parcial=None):
+    if not opciones['capturar_red'] or not adaptador['patrones_api']:
+        return None
+    return CapturaRespuestas(adaptador['nombre'], adaptador['patrones_api'],
+                             lambda payload: adaptador['productos_desde_json'](payload, url),
+                             al_agregar=al_parcial)
+
+
+def crear_cosecha(adaptador, opciones):
+    """Solo en modo lote: html y locator leen el DOM completo al final."""
+    if not opciones['cosechar'] or not adaptador['cosecha'] or opciones['modo'] != "lote" or opciones['comparar']:
+        return None
+    return CosechaIncremental(adaptador)
+
+
+def combinar_productos(capturados, del_dom):
+    """Lo capturado de la API primero; del DOM se suman las url_origen que la API no trajo."""
+    vistos = {p.get('url_origen') for p in capturados}
+    return capturados + [p for p in del_dom if p.get('url_origen') not in vistos]
+
+
+def extraer_desde_dom(page, adaptador, url, opciones):
+    leer_locator = adaptador['leer_locator']
+    campos_html = adaptador['campos_html']
+    registros = leer_tarjetas(
+        adaptador['nombre'],
+        lambda: page.evaluate(adaptador['js_lote'], adaptador['args_lote']),
+        (lambda: leer_locator(page)) if leer_locator else None,
+        modo=opciones['modo'],
+        comparar=opciones['comparar'],
+        leer_html=(lambda: extraer_registros(page.content(), campos_html)) if campos_html else None,
+    )
+    return adaptador['productos_desde_registros'](registros, url)
+
+
+def extraer_con_navegador(browser, adaptador, url, opciones=None, al_parcial=None, metricas=None,
+                          huellas=None):
+    """
+    Extrae una categoría en un contexto nuevo del navegador dado.
+
+    al_parcial(productos), si se pasa, recibe lo que captura la red mientras
+    se hace scroll (ver motor/diario.py). metricas (motor/metricas.py)
+    acumula el tiempo, las llamadas y los bytes de cada fase. Con una
+    CacheHuellas (motor/huellas.py), si la primera página no cambió se
+    devuelven los productos de la última extracción sin hacer scroll.
+    Con opciones['cache_red'] la sesión se graba o se reproduce desde un
+    HAR (motor/cache_red.py).
+    """
+    opciones = completar_opciones(opciones)
+    metricas = metricas or Metricas()
+    nombre = adaptador['nombre']
+    sesion = crear_sesion(adaptador, opciones)
+    cache_red = EntradaCacheRed(opciones, adaptador['clave'], url)
+    with metricas.fase("contexto"):
+        context = browser.new_context(**opciones_contexto(adaptador, sesion, opciones['perfil']),
+                                      **cache_red.opciones_contexto())
+        bloqueador = None
+        if opciones['bloquear_recursos']:
+            bloqueador = BloqueadorRecursos(adaptador['reglas_bloqueo'])
+            bloqueador.instalar(context)
+        page = metricas.envolver(context.new_page())
+        cache_red.instalar(page)
+        metricas.conectar_red(page)
+
+        captura = crear_captura(adaptador, url, opciones, al_parcial)
+        if captura:
+            captura.conectar(page)
+
+    try:
+        with metricas.fase("goto"):
+            page.goto(url, timeout=90000, wait_until="domcontentloaded")
+
+        # Cookies, comuna, etc. (solo si la sesión guardada no sirve)
+        receta = adaptador['preparacion']
+        if receta:
+            with metricas.fase("preparacion"):
+                if sesion and sesion.cargada and sesion_valida(page, receta):
+                    print(f"🔑 Sesión reutilizada en {nombre}.")
+                else:
+                    if sesion and sesion.cargada:
+                        sesion.invalidar()
+                    if preparar(page, receta) and sesion:
+                        sesion.guardar(context.storage_state())
+
+        stats_scroll = None
+        huella = None
+        cosecha = crear_cosecha(adaptador, opciones)
+        try:
+            with metricas.fase("espera_tarjetas"):
+                page.wait_for_selector(adaptador['selector_tarjetas'], timeout=adaptador['espera_tarjetas_ms'])
+            if huellas and adaptador['campos_huella']:
+                with metricas.fase("huella"):
+                    huella = calcular_huella(page.evaluate(adaptador['js_lote'], adaptador['args_lote']),
+                                             adaptador['campos_huella'])
+                    guardados = huellas.reutilizar(adaptador['clave'], url, huella)
+                if guardados is not None:
+                    print(f"♻️ {nombre} {url}: primera página sin cambios, {len(guardados)} productos reutilizados.")
+                    return guardados
+            with metricas.fase("scroll"):
+                stats_scroll = realizar_scroll_adaptativo(page, adaptador['selector_tarjetas'],
+                                                          cosecha=cosecha, **adaptador['ajustes_scroll'])
+            metricas.iteraciones_scroll += stats_scroll['pasos']
+        except PlaywrightTimeoutError:
+            # Sin tarjetas ni nada capturado no hay qué leer: el planificador reintenta
+            if not (captura and captura.productos):
+                raise
+            print(f"⚠️ Alerta: no se cargaron tarjetas en {nombre}, se usa lo capturado.")
+
+        inicio_extraccion = time.perf_counter()
+        with metricas.fase("extraccion"):
+            productos = captura.resultados() if captura else []
+            # Con la primera página renderizada en el servidor la API solo trae
+            # las siguientes: si faltan tarjetas se completa desde el DOM
+            tarjetas = stats_scroll['tarjetas'] if stats_scroll else 0
+            if len(productos) < tarjetas:
+                if cosecha and cosecha.registros:
+                    del_dom = adaptador['productos_desde_registros'](cosecha.registros, url)
+                else:
+                    del_dom = extraer_desde_dom(page, adaptador, url, opciones)
+                productos = combinar_productos(productos, del_dom)
+        if stats_scroll and stats_scroll['motivo'] in MOTIVOS_PARCIALES:
+            print(f"⚠️ {nombre} {url}: scroll cortado por {stats_scroll['motivo']}, la categoría puede estar incompleta.")
+            productos = ExtraccionParcial(productos, stats_scroll['motivo'])
+        elif huella:
+            huellas.guardar(adaptador['clave'], url, huella, productos)
+        imprimir_resumen_tiempos(nombre, stats_scroll, time.perf_counter() - inicio_extraccion)
+        if bloqueador:
+            bloqueador.imprimir_resumen(nombre)
+        cache_red.completa = True
+        return productos
+    finally:
+        context.close()
+        cache_red.cerrar()
+
+
+def extraer_categoria(adaptador, url, opciones=None):
+    """
+    Abre un navegador, extrae una categoría y lo cierra. Devuelve [] si algo falla.
+
+    Los productos salen con los precios ya normalizados (precio_clp, ...),
+    como los devolvían los extraer_productos_* de los scripts históricos.
+    """
+    opciones = completar_opciones(opciones)
+    print(f"--- Iniciando extracción en {adaptador['nombre']} ({url}) ---")
+    productos = []
+    with sync_playwright() as p:
+        browser = lanzar(p, opciones['perfil'], opciones['headless'], opciones['conectar'])
+        try:
+            productos = extraer_con_navegador(browser, adaptador, url, opciones)
+        except Exception as e:
+            print(f"❌ ERROR CRÍTICO {adaptador['nombre']}: {e}")
+        finally:
+            browser.close()
+    return normalizar_precios(productos)
+
+
+def ejecutar_trabajos_sync(trabajos, opciones=None, al_terminar=None, diario=None, planificador=None,
+                           metricas=None, huellas=None):
+    """
+    Versión secuencial del runner: un navegador para todos los trabajos.
+
+    Devuelve {tienda: [productos]} o, con al_terminar(tienda, productos),
+    entrega cada categoría apenas termina. Con un DiarioTrabajos se saltan
+    las categorías ya completadas y se guarda el avance. El Planificador
+    pone el ritmo, reintenta y registra el resultado de cada trabajo; el
+    RegistroMetricas junta las fases de todos. La CacheHuellas salta las
+    categorías cuya primera página no cambió.
+    """
+    opciones = completar_opciones(opciones)
+    planificador = planificador or Planificador()
+    metricas = metricas or RegistroMetricas()
+    resultados = {tienda: [] for tienda, _ in trabajos}
+    entregar = al_terminar or (lambda tienda, productos: resultados[tienda].extend(productos))
+    if diario:
+        trabajos = diario.reanudar(trabajos, entregar)
+    if not trabajos:
+        return resultados
+
+    with sync_playwright() as p:
+        with metricas.globales.fase("lanzamiento"):
+            browser = lanzar(p, opciones['perfil'], opciones['headless'], opciones['conectar'])
+        try:
+            for tienda, url in trabajos:
+                al_parcial = diario.registrador_parcial(tienda, url) if diario else None
+                metricas_trabajo = Metricas()
+                try:
+                    productos = planificador.ejecutar(tienda, url, lambda: extraer_con_navegador(
+                        browser, cargar_adaptador(tienda), url, opciones, al_parcial, metricas_trabajo, huellas))
+                except Exception as e:
+                    print(f"❌ ERROR en {tienda} {url}: {e}")
+                    productos = diario.fallar(tienda, url, e) if diario else []
+                    if not productos:
+                        continue
+                else:
+                    if diario and isinstance(productos, ExtraccionParcial):
+                        productos = diario.dejar_pendiente(tienda, url, productos, productos.motivo)
+                    elif diario:
+                        productos = diario.completar(tienda, url, productos)
+                finally:
+                    metricas.agregar(tienda, metricas_trabajo)
+                entregar(tienda, productos)
+        finally:
+            browser.close()
+    return resultados
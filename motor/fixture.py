@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from motor.pk import asignar_pks
+
+# --- FIXTURE DE DJANGO ---
+# Un solo formato de salida para todas las tiendas (antes cada script tenía
+# su propia copia de formatear_a_django_serializado).
+
+MODEL_NAME = "tucanasta.producto"
+MONEDA = "CLP"
+TIPO_POR_DEFECTO = "Despensa"
+
+
+def formatear_a_django_serializado(datos, model_name, super_id, supermercado, tipo=TIPO_POR_DEFECTO):
+    """Convierte los productos extraídos a objetos del fixture de Django."""
+    output = []
+    # pk estable por producto, compartido entre tiendas y corridas
+    pks = asignar_pks(supermercado, [p['url_origen'] for p in datos])
+    fecha = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
+    for p in datos:
+        output.append({
+            "model": model_name,
+            "pk": pks[p['url_origen']],
+            "fields": {
+                "nombre": p['nombre_corto'][:200],
+                "marca": p['marca'][:100],
+                "tipo": tipo,
+                "descripcion": p['nombre'],
+                "supermercado": super_id,
+                "precio": p['precio_clp'],
+                "moneda": MONEDA,
+                "imagen_url": p.get('imagen_url') or "",
+                "producto_url": p['url_origen'],
+                "disponible": p.get('disponible', True),
+                "fecha_actualizacion": fecha
+            }
+        })
+    return output
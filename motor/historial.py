@@ -0,0 +1,162 @@
+import json
+import sqlite3
+from datetime import datetime
+
+# --- HISTORIAL DE PRECIOS (SQLite) ---
+# Un producto se identifica por (supermercado, url_origen). Cada corrida
+# registra una observación solo si el producto es nuevo o si cambió su
+# precio o disponibilidad; así la historia queda completa y el fixture
+# de Django que se exporta es solo el delta de la corrida.
+
+RUTA_HISTORIAL = "historial_precios.sqlite3"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS productos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    supermercado TEXT NOT NULL,
+    url_origen TEXT NOT NULL,
+    nombre TEXT,
+    nombre_corto TEXT,
+    marca TEXT,
+    imagen_url TEXT,
+    precio INTEGER,
+    disponible INTEGER,
+    primera_vez TEXT,
+    ultima_vez TEXT,
+    UNIQUE (supermercado, url_origen)
+);
+CREATE TABLE IF NOT EXISTS corridas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    supermercado TEXT NOT NULL,
+    fecha TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS observaciones (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    producto_id INTEGER NOT NULL REFERENCES productos(id),
+    corrida_id INTEGER NOT NULL REFERENCES corridas(id),
+    precio INTEGER,
+    disponible INTEGER,
+    fecha TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_observaciones_corrida ON observaciones (corrida_id);
+CREATE INDEX IF NOT EXISTS idx_observaciones_producto ON observaciones (producto_id, fecha);
+"""
+
+
+def conectar(ruta=RUTA_HISTORIAL):
+    conexion = sqlite3.connect(ruta, timeout=30)
+    conexion.row_factory = sqlite3.Row
+    # WAL permite que varios procesos escriban corridas sin bloquearse tanto
+    conexion.execute("PRAGMA journal_mode=WAL")
+    conexion.executescript(ESQUEMA)
+    return conexion
+
+
+def registrar_corrida(conexion, supermercado, productos):
+    """
+    Registra las observaciones de una corrida.
+
+    Devuelve (corrida_id, stats) con la cuenta de nuevos, cambiados y sin_cambio.
+    """
+    ahora = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    stats = {'nuevos': 0, 'cambiados': 0, 'sin_cambio': 0}
+
+    with conexion:
+        corrida_id = conexion.execute(
+            "INSERT INTO corridas (supermercado, fecha) VALUES (?, ?)", (supermercado, ahora)
+        ).lastrowid
+
+        for p in productos:
+            precio = p.get('precio_clp')
+            disponible = int(p.get('disponible', True))
+            fila = conexion.execute(
+                "SELECT id, precio, disponible FROM productos WHERE supermercado = ? AND url_origen = ?",
+                (supermercado, p['url_origen'])
+            ).fetchone()
+
+            if fila is None:
+                producto_id = conexion.execute(
+                    """INSERT INTO productos (supermercado, url_origen, nombre, nombre_corto, marca,
+                                              imagen_url, precio, disponible, primera_vez, ultima_vez)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (supermercado, p['url_origen'], p.get('nombre'), p.get('nombre_corto'), p.get('marca'),
+                     p.get('imagen_url'), precio, disponible, ahora, ahora)
+                ).lastrowid
+                stats['nuevos'] += 1
+            else:
+                producto_id = fila['id']
+                cambio = fila['precio'] != precio or fila['disponible'] != disponible
+                conexion.execute(
+                    """UPDATE productos SET nombre = ?, nombre_corto = ?, marca = ?, imagen_url = ?,
+                                            precio = ?, disponible = ?, ultima_vez = ? WHERE id = ?""",
+                    (p.get('nombre'), p.get('nombre_corto'), p.get('marca'), p.get('imagen_url'),
+                     precio, disponible, ahora, producto_id)
+                )
+                if not cambio:
+                    stats['sin_cambio'] += 1
+                    continue
+                stats['cambiados'] += 1
+
+            conexion.execute(
+                "INSERT INTO observaciones (producto_id, corrida_id, precio, disponible, fecha) VALUES (?, ?, ?, ?, ?)",
+                (producto_id, corrida_id, precio, disponible, ahora)
+            )
+
+    return corrida_id, stats
+
+
+def productos_de_corrida(conexion, corrida_id):
+    """Productos que tuvieron observación (nuevos o con cambios) en la corrida."""
+    filas = conexion.execute(
+        """SELECT p.id, p.supermercado, p.url_origen, p.nombre, p.nombre_corto, p.marca,
+                  p.imagen_url, o.precio, o.disponible
+           FROM observaciones o JOIN productos p ON p.id = o.producto_id
+           WHERE o.corrida_id = ? ORDER BY p.id""",
+        (corrida_id,)
+    ).fetchall()
+    return [{
+        'id': f['id'],
+        'supermercado': f['supermercado'],
+        'nombre': f['nombre'],
+        'marca': f['marca'],
+        'nombre_corto': f['nombre_corto'],
+        'precio_clp': f['precio'],
+        'url_origen': f['url_origen'],
+        'imagen_url': f['imagen_url'],
+        'disponible': bool(f['disponible']),
+    } for f in filas]
+
+
+def fixture_delta(conexion, corrida_id, formatear, model_name, super_id):
+    """
+    Fixture de Django solo con el delta de la corrida.
+
+    Usa el formatear_a_django_serializado de la tienda, que ya asigna el
+    pk estable del producto (motor/pk.py).
+    """
+    return formatear(productos_de_corrida(conexion, corrida_id), model_name, super_id)
+
+
+def historial_producto(conexion, supermercado, url_origen):
+    return [dict(f) for f in conexion.execute(
+        """SELECT o.fecha, o.precio, o.disponible
+           FROM observaciones o JOIN productos p ON p.id = o.producto_id
+           WHERE p.supermercado = ? AND p.url_origen = ? ORDER BY o.fecha""",
+        (supermercado, url_origen)
+    )]
+
+
+def guardar_delta(productos, supermercado, formatear, model_name, super_id, archivo, ruta=RUTA_HISTORIAL):
+    """Registra la corrida y escribe el fixture delta. Devuelve las estadísticas."""
+    conexion = conectar(ruta)
+    try:
+        corrida_id, stats = registrar_corrida(conexion, supermercado, productos)
+        delta = fixture_delta(conexion, corrida_id, formatear, model_name, super_id)
+    finally:
+        conexion.close()
+
+    with open(archivo, 'w', encoding='utf-8') as f:
+        json.dump(delta, f, indent=2, ensure_ascii=False)
+    print(f"🗃️ Historial {supermercado}: {stats['nuevos']} nuevos, {stats['cambiados']} cambiados, "
+          f"{stats['sin_cambio']} sin cambio -> delta en '{archivo}'")
+    return stats
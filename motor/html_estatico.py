@@ -0,0 +1,124 @@
+import argparse
+import json
+import re
+from functools import lru_cache
+
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+except ImportError:  # pip install lxml cssselect
+    lxml = None
+
+from motor.precios import normalizar_precios
+from tiendas import TIENDAS, cargar_adaptador
+
+# --- LECTURA DE TARJETAS DESDE HTML ESTÁTICO ---
+# Al terminar el scroll todas las tarjetas ya están en page.content(). En vez
+# de recorrerlas con locators (o con JS dentro del navegador) se parsea el
+# HTML una vez en Python con los selectores que cada tienda declara en su
+# CAMPOS_HTML_*. Sirve también sobre snapshots archivados (ej. dom.html del
+# banco de pruebas) para re-extraer sin volver a crawlear.
+#
+# Formato de CAMPOS_HTML_*:
+#   'contenedor': selector CSS de cada tarjeta
+#   'campos': {campo: (selector, extractor) o lista de alternativas}
+#     selector:  '' = la tarjeta misma, CSS relativo, o 'xpath:...' relativo
+#     extractor: 'texto', '@atributo' o 'regex:PATRON' (sobre el texto)
+# Con alternativas gana la primera que devuelve algo (las data: URI no cuentan).
+
+
+class BackendLxml:
+    """Backend por defecto: lxml.html + cssselect."""
+
+    def __init__(self):
+        if lxml is None:
+            raise RuntimeError("Falta lxml para leer HTML estático: pip install lxml cssselect")
+
+    def analizar(self, html):
+        return lxml.html.fromstring(html)
+
+    def seleccionar(self, nodo, selector):
+        if not selector:
+            return [nodo]
+        if selector.startswith("xpath:"):
+            return nodo.xpath(selector[len("xpath:"):])
+        return _css(selector)(nodo)
+
+    def texto(self, nodo):
+        return " ".join(nodo.text_content().split())
+
+    def atributo(self, nodo, nombre):
+        return nodo.get(nombre)
+
+
+@lru_cache(maxsize=None)
+def _css(selector):
+    return CSSSelector(selector)
+
+
+BACKENDS = {
+    'lxml': BackendLxml,
+}
+BACKEND_POR_DEFECTO = 'lxml'
+
+
+def registrar_backend(nombre, clase):
+    """La clase debe implementar analizar, seleccionar, texto y atributo."""
+    BACKENDS[nombre] = clase
+
+
+def _extraer(backend, nodo, extractor):
+    if extractor == "texto":
+        return backend.texto(nodo)
+    if extractor.startswith("@"):
+        return backend.atributo(nodo, extractor[1:])
+    if extractor.startswith("regex:"):
+        coincidencia = re.search(extractor[len("regex:"):], backend.texto(nodo))
+        return coincidencia.group(0) if coincidencia else None
+    raise ValueError(f"Extractor desconocido: {extractor}")
+
+
+def _valor_campo(backend, tarjeta, definicion):
+    alternativas = definicion if isinstance(definicion, list) else [definicion]
+    for selector, extractor in alternativas:
+        nodos = backend.seleccionar(tarjeta, selector)
+        if not nodos:
+            continue
+        valor = _extraer(backend, nodos[0], extractor)
+        if valor and not valor.startswith("data:"):
+            return valor
+    return None
+
+
+def extraer_registros(html, campos, backend=BACKEND_POR_DEFECTO):
+    """Aplica la declaración CAMPOS_HTML_* a un snapshot y devuelve registros planos."""
+    parser = BACKENDS[backend]()
+    raiz = parser.analizar(html)
+    return [
+        {campo: _valor_campo(parser, tarjeta, definicion) for campo, definicion in campos['campos'].items()}
+        for tarjeta in parser.seleccionar(raiz, campos['contenedor'])
+    ]
+
+
+def extraer_de_archivo(tienda, ruta_html, url="", backend=BACKEND_POR_DEFECTO):
+    """Re-extrae los productos de un snapshot archivado con los selectores de la tienda."""
+    adaptador = cargar_adaptador(tienda)
+    with open(ruta_html, encoding="utf-8") as f:
+        registros = extraer_registros(f.read(), adaptador['campos_html'], backend)
+    return normalizar_precios(adaptador['productos_desde_registros'](registros, url))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extrae productos desde un snapshot HTML guardado.")
+    parser.add_argument('tienda', choices=sorted(TIENDAS))
+    parser.add_argument('archivo', help="HTML guardado (page.content())")
+    parser.add_argument('--url', default="", help="URL de la categoría del snapshot")
+    parser.add_argument('--backend', default=BACKEND_POR_DEFECTO, choices=sorted(BACKENDS))
+    parser.add_argument('--salida', help="Archivo JSON con los productos")
+    args = parser.parse_args()
+
+    productos = extraer_de_archivo(args.tienda, args.archivo, args.url, args.backend)
+    print(f"✅ {args.tienda}: {len(productos)} productos desde {args.archivo}")
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(productos, f, indent=2, ensure_ascii=False)
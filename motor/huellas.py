@@ -0,0 +1,82 @@
+import hashlib
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+# --- HUELLAS DE CATEGORÍA ---
+# La mayoría de las categorías casi no cambian de un día a otro. Antes del
+# scroll se leen las tarjetas de la primera página y se calcula una huella
+# (hash de los campos declarados en 'campos_huella' del adaptador, p. ej.
+# data-cnstrc-item-id y precio en Jumbo). Si coincide con la de la última
+# extracción completa de esa URL se saltan el scroll y la lectura y se
+# reutilizan los productos guardados. Cada REFRESCO_FORZADO_HORAS la
+# categoría se extrae completa igual, para que nada quede viejo para siempre.
+
+RUTA_HUELLAS = "huellas_categorias.sqlite3"
+REFRESCO_FORZADO_HORAS = 72
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS huellas (
+    tienda TEXT NOT NULL,
+    url TEXT NOT NULL,
+    huella TEXT NOT NULL,
+    productos TEXT NOT NULL,
+    extraida TEXT NOT NULL,
+    PRIMARY KEY (tienda, url)
+);
+"""
+
+FORMATO_FECHA = '%Y-%m-%d %H:%M:%S'
+
+
+def calcular_huella(registros, campos):
+    """Hash de los campos de cada tarjeta, sin importar el orden; None si no hay tarjetas."""
+    filas = sorted(json.dumps([registro.get(campo) for campo in campos], ensure_ascii=False)
+                   for registro in registros)
+    if not filas:
+        return None
+    return hashlib.sha1("\n".join(filas).encode('utf-8')).hexdigest()
+
+
+class CacheHuellas:
+    """Huella y productos de la última extracción completa de cada (tienda, url)."""
+
+    def __init__(self, ruta=RUTA_HUELLAS, refresco_horas=REFRESCO_FORZADO_HORAS):
+        self.ruta = ruta
+        self.refresco = timedelta(hours=refresco_horas)
+        self.reutilizadas = 0
+        self.conexion = sqlite3.connect(ruta, timeout=30)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.executescript(ESQUEMA)
+
+    def reutilizar(self, tienda, url, huella):
+        """Productos guardados si la huella coincide y no toca refresco; si no, None."""
+        if not huella:
+            return None
+        fila = self.conexion.execute(
+            "SELECT huella, productos, extraida FROM huellas WHERE tienda = ? AND url = ?",
+            (tienda, url)).fetchone()
+        if not fila or fila[0] != huella:
+            return None
+        if datetime.now() - datetime.strptime(fila[2], FORMATO_FECHA) > self.refresco:
+            return None
+        ahora = datetime.now().strftime(FORMATO_FECHA)
+        productos = json.loads(fila[1])
+        for producto in productos:
+            producto['fecha_actualizacion'] = ahora
+        self.reutilizadas += 1
+        return productos
+
+    def guardar(self, tienda, url, huella, productos):
+        if not huella or not productos:
+            return
+        with self.conexion:
+            self.conexion.execute(
+                "INSERT OR REPLACE INTO huellas (tienda, url, huella, productos, extraida) VALUES (?, ?, ?, ?, ?)",
+                (tienda, url, huella, json.dumps(productos, ensure_ascii=False),
+                 datetime.now().strftime(FORMATO_FECHA)))
+
+    def cerrar(self):
+        if self.reutilizadas:
+            print(f"♻️ Huellas {self.ruta}: {self.reutilizadas} categorías sin cambios reutilizadas.")
+        self.conexion.close()
@@ -0,0 +1,47 @@
+import time
+
+# --- LECTURA DE TARJETAS: HTML vs LOTE vs LOCATOR ---
+# "html": se toma page.content() una vez y se parsea en Python con los
+#         selectores declarados por la tienda (motor/html_estatico.py).
+# "lote": un solo page.evaluate recorre todas las tarjetas dentro del navegador
+#         y devuelve una lista de diccionarios planos.
+# "locator": el camino clásico, varias llamadas de Playwright por tarjeta.
+MODOS_VALIDOS = ("html", "lote", "locator")
+
+
+def leer_tarjetas(nombre_super, leer_lote, leer_locator, modo="lote", comparar=False, leer_html=None):
+    """
+    Devuelve los registros crudos de las tarjetas del listado.
+
+    Si el modo elegido falla o no devuelve nada se prueba el siguiente
+    (html -> lote -> locator). Con comparar=True se ejecutan todos los
+    caminos disponibles y se imprimen los tiempos.
+    """
+    if modo not in MODOS_VALIDOS:
+        raise ValueError(f"Modo de extracción desconocido: {modo}")
+
+    lectores = {"html": leer_html, "lote": leer_lote, "locator": leer_locator}
+    orden = MODOS_VALIDOS[MODOS_VALIDOS.index(modo):]
+    if comparar:
+        orden = (modo,) + tuple(m for m in MODOS_VALIDOS if m != modo)
+
+    tiempos = {}
+    registros = []
+
+    for nombre in orden:
+        lector = lectores[nombre]
+        if lector is None or (registros and not comparar):
+            continue
+        inicio = time.perf_counter()
+        try:
+            resultado = lector() or []
+        except Exception as e:
+            print(f"⚠️ Lectura '{nombre}' falló en {nombre_super}: {e}")
+            resultado = []
+        tiempos[nombre] = time.perf_counter() - inicio
+        if not registros:
+            registros = resultado
+
+    detalle = " | ".join(f"{k}: {round(v, 2)}s" for k, v in tiempos.items())
+    print(f"⏱️ Lectura de tarjetas {nombre_super} ({len(registros)} registros) -> {detalle}")
+    return registros
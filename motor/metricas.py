@@ -0,0 +1,201 @@
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# --- MÉTRICAS POR FASE ---
+# Cada trabajo (tienda, url) mide sus fases: contexto, goto, preparación,
+# espera de tarjetas, huella, scroll y extracción. La corrida suma además
+# el lanzamiento del navegador, la normalización de precios y la
+# serialización. Por fase se guardan segundos, veces, llamadas a
+# Playwright (la página va envuelta en un proxy que las cuenta) y bytes de
+# red de cada petición terminada según request.sizes() (cuerpo tal como
+# llegó más cabeceras: cuenta también las respuestas chunked o comprimidas
+# sin content-length). Se exporta a JSON o a texto Prometheus para un
+# colector local.
+# Las esperas puras (wait_for_timeout, que el scroll usa para sondear la
+# red cada 50 ms) van aparte en 'esperas': contarlas como llamadas haría
+# que el número dependa de cuánto tardó la red y no se pueda comparar.
+
+FASES = ("lanzamiento", "contexto", "goto", "preparacion", "espera_tarjetas", "huella",
+         "scroll", "extraccion", "precios", "serializacion")
+PREFIJO_PROMETHEUS = "scraper"
+ESPERAS_PURAS = frozenset({"wait_for_timeout"})
+
+
+def es_de_playwright(objeto):
+    if isinstance(objeto, Envoltura):
+        return True
+    return type(objeto).__module__.startswith("playwright.") and not isinstance(objeto, BaseException)
+
+
+def _desenvolver(valor):
+    return valor._objeto if isinstance(valor, Envoltura) else valor
+
+
+class Envoltura:
+    """
+    Proxy de un objeto de Playwright: cada llamada a un método pasa por
+    medidor.llamar(...) y lo que devuelve se vuelve a envolver.
+    """
+
+    __slots__ = ("_objeto", "_medidor")
+
+    def __init__(self, objeto, medidor):
+        object.__setattr__(self, "_objeto", objeto)
+        object.__setattr__(self, "_medidor", medidor)
+
+    def __getattr__(self, nombre):
+        valor = getattr(self._objeto, nombre)
+        if not callable(valor):
+            return self._medidor.envolver(valor)
+
+        clase = type(_desenvolver(self._objeto)).__name__
+
+        def llamada(*args, **kwargs):
+            args = [_desenvolver(a) for a in args]
+            kwargs = {k: _desenvolver(v) for k, v in kwargs.items()}
+            return self._medidor.llamar(self._objeto, clase, nombre, valor, args, kwargs)
+
+        return llamada
+
+    def __setattr__(self, nombre, valor):
+        setattr(self._objeto, nombre, valor)
+
+
+def _fase_vacia():
+    return {'segundos': 0.0, 'veces': 0, 'llamadas': 0, 'esperas': 0, 'bytes': 0}
+
+
+class Metricas:
+    """Fases de un trabajo (o de la corrida). No es compartible entre tareas concurrentes."""
+
+    def __init__(self):
+        self.fases = {}
+        self.fase_actual = None
+        self.iteraciones_scroll = 0
+
+    def _fase(self, nombre=None):
+        return self.fases.setdefault(nombre or self.fase_actual or "otros", _fase_vacia())
+
+    @contextmanager
+    def fase(self, nombre):
+        anterior = self.fase_actual
+        self.fase_actual = nombre
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            datos = self._fase(nombre)
+            datos['segundos'] += time.perf_counter() - inicio
+            datos['veces'] += 1
+            self.fase_actual = anterior
+
+    # --- llamadas a Playwright ---
+    def envolver(self, valor):
+        if isinstance(valor, list):
+            return [self.envolver(v) for v in valor]
+        return Envoltura(valor, self) if es_de_playwright(valor) else valor
+
+    def llamar(self, objeto, clase, nombre, metodo, args, kwargs):
+        self._fase()['esperas' if nombre in ESPERAS_PURAS else 'llamadas'] += 1
+        return self.envolver(metodo(*args, **kwargs))
+
+    # --- bytes de red ---
+    def _sumar_bytes(self, fase, tamanos):
+        fase['bytes'] += max(0, tamanos['responseBodySize']) + max(0, tamanos['responseHeadersSize'])
+
+    def _al_terminar(self, request):
+        fase = self._fase()
+        try:
+            self._sumar_bytes(fase, request.sizes())
+        except Exception:
+            pass  # la página se cerró antes de pedir los tamaños
+
+    async def _al_terminar_async(self, request):
+        fase = self._fase()
+        try:
+            self._sumar_bytes(fase, await request.sizes())
+        except Exception:
+            pass
+
+    def conectar_red(self, page):
+        pagina = _desenvolver(page)
+        asincrona = type(pagina).__module__.startswith("playwright.async_api")
+        pagina.on("requestfinished", self._al_terminar_async if asincrona else self._al_terminar)
+
+    def sumar(self, otra):
+        for nombre, datos in otra.fases.items():
+            propia = self._fase(nombre)
+            for clave, valor in datos.items():
+                propia[clave] += valor
+        self.iteraciones_scroll += otra.iteraciones_scroll
+
+
+class RegistroMetricas:
+    """Métricas de la corrida: las de cada trabajo sumadas por tienda más las globales."""
+
+    def __init__(self):
+        self.globales = Metricas()
+        self.por_tienda = {}
+        self.trabajos = Counter()
+
+    def agregar(self, tienda, metricas):
+        self.por_tienda.setdefault(tienda, Metricas()).sumar(metricas)
+        self.trabajos[tienda] += 1
+
+    def sumar(self, otro):
+        """Suma otro registro (por ejemplo, el de un proceso hijo)."""
+        self.globales.sumar(otro.globales)
+        for tienda, metricas in otro.por_tienda.items():
+            self.por_tienda.setdefault(tienda, Metricas()).sumar(metricas)
+        self.trabajos.update(otro.trabajos)
+
+    def _filas(self):
+        """(tienda, fase, datos) con tienda '' para las fases globales."""
+        filas = [("", fase, datos) for fase, datos in self.globales.fases.items()]
+        for tienda, metricas in self.por_tienda.items():
+            filas.extend((tienda, fase, datos) for fase, datos in metricas.fases.items())
+        orden = {fase: i for i, fase in enumerate(FASES)}
+        return sorted(filas, key=lambda f: (f[0], orden.get(f[1], len(FASES)), f[1]))
+
+    def como_dict(self):
+        salida = {'globales': self.globales.fases, 'tiendas': {}}
+        for tienda, metricas in self.por_tienda.items():
+            salida['tiendas'][tienda] = {
+                'trabajos': self.trabajos[tienda],
+                'iteraciones_scroll': metricas.iteraciones_scroll,
+                'fases': metricas.fases,
+            }
+        return salida
+
+    def a_prometheus(self, prefijo=PREFIJO_PROMETHEUS):
+        lineas = []
+        for clave, ayuda in (('segundos', "Segundos acumulados en la fase"),
+                             ('veces', "Veces que se entró a la fase"),
+                             ('llamadas', "Llamadas a Playwright dentro de la fase"),
+                             ('esperas', "Esperas puras (wait_for_timeout) dentro de la fase"),
+                             ('bytes', "Bytes de red (cuerpo y cabeceras) recibidos en la fase")):
+            metrica = f"{prefijo}_fase_{clave}_total"
+            lineas += [f"# HELP {metrica} {ayuda}", f"# TYPE {metrica} counter"]
+            for tienda, fase, datos in self._filas():
+                lineas.append(f'{metrica}{{tienda="{tienda}",fase="{fase}"}} {round(datos[clave], 4)}')
+        metrica = f"{prefijo}_iteraciones_scroll_total"
+        lineas += [f"# HELP {metrica} Pasos de scroll por tienda", f"# TYPE {metrica} counter"]
+        for tienda, metricas in sorted(self.por_tienda.items()):
+            lineas.append(f'{metrica}{{tienda="{tienda}"}} {metricas.iteraciones_scroll}')
+        return "\n".join(lineas) + "\n"
+
+    def guardar(self, ruta):
+        """Exporta a Prometheus si la ruta termina en .prom, si no a JSON."""
+        with open(ruta, 'w', encoding='utf-8') as f:
+            if ruta.endswith(".prom"):
+                f.write(self.a_prometheus())
+            else:
+                json.dump(self.como_dict(), f, indent=2, ensure_ascii=False)
+
+    def imprimir_resumen(self):
+        print(f"{'tienda':<10} {'fase':<16} {'seg':>9} {'veces':>6} {'llamadas':>9} {'esperas':>8} {'KB':>9}")
+        for tienda, fase, datos in self._filas():
+            print(f"{tienda or '-':<10} {fase:<16} {datos['segundos']:>9.2f} {datos['veces']:>6} "
+                  f"{datos['llamadas']:>9} {datos['esperas']:>8} {datos['bytes'] / 1024:>9.1f}")
@@ -0,0 +1,101 @@
+import argparse
+import time
+
+from playwright.sync_api import sync_playwright
+
+# --- PERFILES DE LANZAMIENTO ---
+# Cómo se abre Chromium para extraer:
+#   "ligero":     headless, flags recortados (sin GPU, extensiones, sync,
+#                 audio ni throttling de pestañas en segundo plano, que
+#                 frenaría las páginas concurrentes del runner async) y un
+#                 viewport de escritorio chico: 1280 de ancho para no caer
+#                 en el layout móvil y 800 de alto, más que el rebote del
+#                 scroll (máx. 700 px) para que el lazy load se siga
+#                 disparando.
+#   "completo":   flags por defecto de Playwright y el viewport del adaptador.
+#   "depuracion": con ventana y slow_mo, para mirar lo que hace el motor.
+#
+# En vez de lanzar, el motor puede conectarse a un navegador que ya está
+# corriendo (opción 'conectar'): ws://... usa chromium.connect (servidor de
+# Playwright) y http://... usa connect_over_cdp. El arranque en frío se paga
+# una vez por máquina y no una vez por corrida o por proceso:
+#   python -m motor.navegador --puerto 9222
+#   python scraper.py jumbo --conectar http://localhost:9222
+
+ARGS_LIGEROS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--mute-audio",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+]
+VIEWPORT_LIGERO = {'width': 1280, 'height': 800}
+
+PERFILES_NAVEGADOR = {
+    'ligero': {'args': ARGS_LIGEROS, 'viewport': VIEWPORT_LIGERO},
+    'completo': {'args': [], 'viewport': None},
+    'depuracion': {'args': [], 'viewport': None, 'headless': False, 'slow_mo': 100},
+}
+PERFIL_POR_DEFECTO = "ligero"
+PUERTO_CDP = 9222
+
+
+def argumentos_lanzamiento(perfil=PERFIL_POR_DEFECTO, headless=True):
+    datos = PERFILES_NAVEGADOR[perfil]
+    return {
+        'headless': headless and datos.get('headless', True),
+        'args': list(datos['args']),
+        'slow_mo': datos.get('slow_mo', 0),
+    }
+
+
+def viewport(perfil, adaptador):
+    """El del perfil si define uno; si no, el del adaptador."""
+    return PERFILES_NAVEGADOR[perfil]['viewport'] or adaptador['viewport']
+
+
+def lanzar(playwright, perfil=PERFIL_POR_DEFECTO, headless=True, conectar=None):
+    if conectar:
+        if conectar.startswith("ws"):
+            return playwright.chromium.connect(conectar)
+        return playwright.chromium.connect_over_cdp(conectar)
+    return playwright.chromium.launch(**argumentos_lanzamiento(perfil, headless))
+
+
+async def lanzar_async(playwright, perfil=PERFIL_POR_DEFECTO, headless=True, conectar=None):
+    if conectar:
+        if conectar.startswith("ws"):
+            return await playwright.chromium.connect(conectar)
+        return await playwright.chromium.connect_over_cdp(conectar)
+    return await playwright.chromium.launch(**argumentos_lanzamiento(perfil, headless))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deja un Chromium abierto para `scraper.py --conectar`.")
+    parser.add_argument('--puerto', type=int, default=PUERTO_CDP)
+    parser.add_argument('--perfil', default=PERFIL_POR_DEFECTO, choices=sorted(PERFILES_NAVEGADOR))
+    args = parser.parse_args()
+
+    argumentos = argumentos_lanzamiento(args.perfil)
+    argumentos['args'].append(f"--remote-debugging-port={args.puerto}")
+    with sync_playwright() as p:
+        browser = p.chromium.launch(**argumentos)
+        print(f"🌐 Chromium {browser.version} escuchando: --conectar http://localhost:{args.puerto} (Ctrl+C para cerrar)")
+        try:
+            while browser.is_connected():
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            browser.close()
+
+
+if __name__ == "__main__":
+    main()
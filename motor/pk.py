@@ -0,0 +1,67 @@
+import sqlite3
+
+# --- ASIGNADOR DE PK ESTABLE ---
+# Cada producto (supermercado, url_origen) recibe un pk la primera vez que
+# aparece y lo conserva para siempre. El índice es compartido por todas las
+# tiendas y corridas, así los fixtures de Jumbo, Lider, Santa Isabel y
+# Unimarc se pueden cargar juntos (o generarse en paralelo) sin chocar.
+
+RUTA_INDICE_PK = "indice_pk.sqlite3"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS claves (
+    pk INTEGER PRIMARY KEY AUTOINCREMENT,
+    supermercado TEXT NOT NULL,
+    url_origen TEXT NOT NULL,
+    UNIQUE (supermercado, url_origen)
+);
+"""
+
+
+def conectar(ruta=RUTA_INDICE_PK):
+    # isolation_level=None: las transacciones se abren a mano con BEGIN IMMEDIATE
+    conexion = sqlite3.connect(ruta, timeout=30, isolation_level=None)
+    conexion.execute("PRAGMA journal_mode=WAL")
+    conexion.executescript(ESQUEMA)
+    return conexion
+
+
+def _buscar(conexion, supermercado, urls):
+    pks = {}
+    # Consultas por bloques para no pasar el límite de parámetros de SQLite
+    for i in range(0, len(urls), 500):
+        bloque = urls[i:i + 500]
+        marcas = ",".join("?" * len(bloque))
+        pks.update(conexion.execute(
+            f"SELECT url_origen, pk FROM claves WHERE supermercado = ? AND url_origen IN ({marcas})",
+            [supermercado, *bloque]
+        ).fetchall())
+    return pks
+
+
+def asignar_pks(supermercado, urls, ruta=RUTA_INDICE_PK):
+    """
+    Devuelve {url_origen: pk} para las urls dadas, creando los que falten.
+
+    Los pk nuevos se asignan en el orden de `urls`. BEGIN IMMEDIATE toma el
+    lock de escritura al inicio, así dos procesos no reciben el mismo pk.
+    """
+    urls = list(dict.fromkeys(urls))
+    conexion = conectar(ruta)
+    try:
+        conexion.execute("BEGIN IMMEDIATE")
+        pks = _buscar(conexion, supermercado, urls)
+        faltantes = [url for url in urls if url not in pks]
+        # Solo se insertan las faltantes: un INSERT ignorado igual gastaría un pk
+        conexion.executemany(
+            "INSERT INTO claves (supermercado, url_origen) VALUES (?, ?)",
+            ((supermercado, url) for url in faltantes)
+        )
+        pks.update(_buscar(conexion, supermercado, faltantes))
+        conexion.execute("COMMIT")
+    except Exception:
+        conexion.execute("ROLLBACK")
+        raise
+    finally:
+        conexion.close()
+    return pks
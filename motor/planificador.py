@@ -0,0 +1,230 @@
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+# --- PLANIFICADOR: RITMO, REINTENTOS E INTERRUPTOR ---
+# Envuelve cada trabajo (tienda, url) de los runners:
+#   - un cubo de tokens por dominio limita las navegaciones por minuto;
+#   - los timeouts de page.goto / wait_for_selector se reintentan con
+#     backoff exponencial con jitter (cada intento abre un contexto nuevo);
+#   - un interruptor por tienda la pausa tras varios fallos seguidos y,
+#     si sigue fallando después de MAX_APERTURAS pausas, omite el resto;
+#   - cada trabajo deja un resultado estructurado (ok, parcial, vacio,
+#     error, omitido) en vez de solo un print.
+
+PETICIONES_POR_MINUTO = 20
+RAFAGA = 2
+
+REINTENTOS = 2
+BACKOFF_BASE_S = 2.0
+BACKOFF_TOPE_S = 30.0
+
+FALLOS_PARA_ABRIR = 3
+PAUSA_INTERRUPTOR_S = 120
+MAX_APERTURAS = 3
+
+# Errores que valen un reintento (la tienda tardó, no es un bug nuestro)
+ERRORES_REINTENTABLES = (PlaywrightTimeoutError,)
+
+
+class TiendaEnPausa(Exception):
+    """El interruptor de la tienda está abierto: el trabajo no se intentó."""
+
+
+class ExtraccionParcial(list):
+    """Productos de una categoría que no se terminó de recorrer (ej. el scroll llegó al plazo)."""
+
+    def __init__(self, productos, motivo):
+        super().__init__(productos)
+        self.motivo = motivo
+
+
+class CuboTokens:
+    """Token bucket por reserva: devuelve cuánto esperar para el próximo token."""
+
+    def __init__(self, por_minuto=PETICIONES_POR_MINUTO, rafaga=RAFAGA):
+        self.tasa = por_minuto / 60
+        self.capacidad = rafaga
+        self.tokens = float(rafaga)
+        self.ultimo = time.monotonic()
+
+    def reservar(self):
+        ahora = time.monotonic()
+        self.tokens = min(self.capacidad, self.tokens + (ahora - self.ultimo) * self.tasa)
+        self.ultimo = ahora
+        # Los tokens pueden quedar negativos: cada reserva hace fila detrás de la anterior
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.tasa)
+
+    def tomar(self):
+        time.sleep(self.reservar())
+
+    async def tomar_async(self):
+        await asyncio.sleep(self.reservar())
+
+
+class Interruptor:
+    """Circuit breaker por tienda: cerrado -> abierto (pausa) -> medio abierto."""
+
+    def __init__(self, nombre, fallos_para_abrir=FALLOS_PARA_ABRIR,
+                 pausa_s=PAUSA_INTERRUPTOR_S, max_aperturas=MAX_APERTURAS):
+        self.nombre = nombre
+        self.fallos_para_abrir = fallos_para_abrir
+        self.pausa_s = pausa_s
+        self.max_aperturas = max_aperturas
+        self.fallos_seguidos = 0
+        self.aperturas = 0
+        self.abierto_hasta = 0.0
+
+    def espera(self):
+        """Segundos hasta poder intentar; None si la tienda quedó descartada."""
+        if self.aperturas >= self.max_aperturas and self.fallos_seguidos >= self.fallos_para_abrir:
+            return None
+        return max(0.0, self.abierto_hasta - time.monotonic())
+
+    def registrar_exito(self):
+        self.fallos_seguidos = 0
+
+    def registrar_fallo(self):
+        self.fallos_seguidos += 1
+        if self.fallos_seguidos < self.fallos_para_abrir or self.abierto_hasta > time.monotonic():
+            return
+        self.aperturas += 1
+        self.abierto_hasta = time.monotonic() + self.pausa_s
+        if self.aperturas >= self.max_aperturas:
+            print(f"⛔ {self.nombre}: {self.aperturas} pausas seguidas, se omiten sus trabajos restantes.")
+        else:
+            print(f"⏸️ {self.nombre}: {self.fallos_seguidos} fallos seguidos, pausa de {self.pausa_s}s.")
+
+
+def backoff(intento, base=BACKOFF_BASE_S, tope=BACKOFF_TOPE_S):
+    """Espera antes del reintento `intento` (1, 2, ...): exponencial con jitter completo."""
+    return random.uniform(0, min(tope, base * 2 ** (intento - 1)))
+
+
+class Planificador:
+    """Ritmo por dominio, reintentos e interruptor por tienda, con registro de resultados."""
+
+    def __init__(self, por_minuto=PETICIONES_POR_MINUTO, reintentos=REINTENTOS):
+        self.por_minuto = por_minuto
+        self.reintentos = reintentos
+        self.cubos = {}
+        self.interruptores = {}
+        self.resultados = []
+
+    def cubo(self, url):
+        dominio = urlparse(url).netloc
+        if dominio not in self.cubos:
+            self.cubos[dominio] = CuboTokens(self.por_minuto)
+        return self.cubos[dominio]
+
+    def interruptor(self, tienda):
+        if tienda not in self.interruptores:
+            self.interruptores[tienda] = Interruptor(tienda)
+        return self.interruptores[tienda]
+
+    def _registrar(self, tienda, url, estado, intentos, inicio, productos=0, error=None):
+        self.resultados.append({
+            'tienda': tienda,
+            'url': url,
+            'estado': estado,
+            'intentos': intentos,
+            'productos': productos,
+            'segundos': round(time.perf_counter() - inicio, 2),
+            'tipo_error': type(error).__name__ if error else None,
+            'error': (str(error).splitlines() or [repr(error)])[0] if error else None,
+        })
+
+    def registrar_error(self, tienda, url, error, inicio):
+        """Registra un trabajo que falló fuera de ejecutar() (ej. se cayó el proceso que lo corría)."""
+        self._registrar(tienda, url, 'error', 0, inicio, error=error)
+
+    def _cerrar_intento(self, tienda, url, intento, inicio, productos):
+        interruptor = self.interruptor(tienda)
+        if productos:
+            interruptor.registrar_exito()
+            estado = 'parcial' if isinstance(productos, ExtraccionParcial) else 'ok'
+            self._registrar(tienda, url, estado, intento, inicio, len(productos))
+        else:
+            # Una categoría vacía suele ser un bloqueo o un cambio de HTML: cuenta como fallo
+            interruptor.registrar_fallo()
+            self._registrar(tienda, url, 'vacio', intento, inicio)
+        return productos
+
+    def _fallar(self, tienda, url, intento, inicio, error):
+        self.interruptor(tienda).registrar_fallo()
+        self._registrar(tienda, url, 'error', intento, inicio, error=error)
+
+    def _omitir(self, tienda, url, inicio):
+        self._registrar(tienda, url, 'omitido', 0, inicio)
+        raise TiendaEnPausa(f"{tienda} en pausa por fallos seguidos")
+
+    def ejecutar(self, tienda, url, extraer):
+        """Corre extraer() respetando el ritmo y el interruptor; reintenta timeouts."""
+        inicio = time.perf_counter()
+        espera = self.interruptor(tienda).espera()
+        if espera is None:
+            self._omitir(tienda, url, inicio)
+        time.sleep(espera)
+
+        for intento in range(1, self.reintentos + 2):
+            self.cubo(url).tomar()
+            try:
+                productos = extraer()
+            except ERRORES_REINTENTABLES as e:
+                if intento > self.reintentos:
+                    self._fallar(tienda, url, intento, inicio, e)
+                    raise
+                pausa = backoff(intento)
+                print(f"🔁 {tienda} {url}: timeout, reintento {intento}/{self.reintentos} en {pausa:.1f}s")
+                time.sleep(pausa)
+            except Exception as e:
+                self._fallar(tienda, url, intento, inicio, e)
+                raise
+            else:
+                return self._cerrar_intento(tienda, url, intento, inicio, productos)
+
+    async def ejecutar_async(self, tienda, url, extraer):
+        """Igual que ejecutar, con extraer() corrutina."""
+        inicio = time.perf_counter()
+        espera = self.interruptor(tienda).espera()
+        if espera is None:
+            self._omitir(tienda, url, inicio)
+        await asyncio.sleep(espera)
+
+        for intento in range(1, self.reintentos + 2):
+            await self.cubo(url).tomar_async()
+            try:
+                productos = await extraer()
+            except ERRORES_REINTENTABLES as e:
+                if intento > self.reintentos:
+                    self._fallar(tienda, url, intento, inicio, e)
+                    raise
+                pausa = backoff(intento)
+                print(f"🔁 {tienda} {url}: timeout, reintento {intento}/{self.reintentos} en {pausa:.1f}s")
+                await asyncio.sleep(pausa)
+            except Exception as e:
+                self._fallar(tienda, url, intento, inicio, e)
+                raise
+            else:
+                return self._cerrar_intento(tienda, url, intento, inicio, productos)
+
+    def fallidos(self):
+        return [r for r in self.resultados if r['estado'] != 'ok']
+
+    def imprimir_resumen(self):
+        por_tienda = {}
+        for resultado in self.resultados:
+            por_tienda.setdefault(resultado['tienda'], Counter())[resultado['estado']] += 1
+        for tienda, cuenta in por_tienda.items():
+            detalle = ", ".join(f"{estado}: {n}" for estado, n in sorted(cuenta.items()))
+            print(f"📋 {tienda}: {detalle}")
+
+    def guardar(self, ruta):
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(self.resultados, f, indent=2, ensure_ascii=False)
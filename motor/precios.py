@@ -0,0 +1,157 @@
+import math
+import os
+import re
+
+from motor.historial import RUTA_HISTORIAL, conectar
+
+# --- NORMALIZACIÓN DE PRECIOS ---
+# Las tarjetas entregan el precio como texto ("$12.990", "Normal $3.490
+# $2.990", "$6.980 x kg", "2 x $5.000"). Los adaptadores lo dejan tal cual
+# en 'precio_texto' y esta etapa lo parsea para cada lote entregado por
+# los runners. Corre en cada corrida de la CLI, así que es Python puro
+# (re + sqlite3): con pandas, cada proceso pagaba su importación solo
+# para esto (ver `python -m motor.banco arranque`).
+#   precio_clp       lo que se paga hoy (el menor de los montos normales)
+#   precio_regular   el mayor de los montos normales (o ListPrice de la API)
+#   en_oferta        precio_regular > precio_clp
+#   precio_unidad    monto seguido de "x kg", "/lt", "el kg", "x 100 g",
+#                    "x un", "c/u"... o precedido por la unidad ("Precio x
+#                    kg $5.980")
+#   unidad_precio    esa unidad ("kg", "100 g", "un", ...)
+# Los montos "N x $M" (promociones por cantidad) y "Ahorra $M" no cuentan
+# como precio. Si el texto no trae ningún monto normal (productos a granel:
+# "$6.980 x kg") el precio es el por unidad.
+# Los productos sin precio válido se descartan; los que se alejan mucho del
+# último precio del historial (o de un rango razonable) quedan marcados
+# como 'atipico' para revisarlos, sin descartarlos.
+
+# Con cantidad delante solo las de medida: "x 100 g" es precio por unidad,
+# "x 6 un" es el tamaño de un pack
+MEDIDAS = r'(?:kg|kilos?|gr|g|lt|l|ml|cc|mt|m)'
+UNIDADES = r'(?:(?:\d+\s*)?' + MEDIDAS + r'|unid(?:ad(?:es)?)?|un)'
+CONECTORES = r'(?:\b(?:x|el|la|por)|/)'
+# La unidad no cruza saltos de línea, y si le sigue un monto es de ese monto
+# ("$1.990\nx kg $3.980"): de ahí los [ \t] y el lookahead del sufijo
+RE_MONTO = re.compile(
+    r'(?P<ahorro>(?:ahorr[ao]s?|dcto\.?|descuento|-)\s*)?'
+    r'(?P<multiplo>\d+\s*x\s*)?'
+    r'(?P<unidad_antes>' + CONECTORES + r'[ \t]*' + UNIDADES + r'\b[ \t]*:?[ \t]*)?'
+    r'\$\s*(?P<entero>\d{1,3}(?:[.,]\d{3})+(?!\d)|\d+)(?:,(?P<decimales>\d{1,2})(?!\d))?'
+    r'(?P<unidad>[ \t]*(?:' + CONECTORES + r'[ \t]*' + UNIDADES + r'\b|c/u\b)(?![ \t]*:?[ \t]*\$))?'
+)
+RE_CONECTOR_UNIDAD = re.compile(r'^\s*(?:(?:x|/|el|la|por)\s*)?|\s*:?\s*$')
+# Cómo queda escrita la unidad en unidad_precio
+SINONIMOS_UNIDAD = {'kilo': 'kg', 'kilos': 'kg', 'c/u': 'un', 'unid': 'un', 'unidad': 'un', 'unidades': 'un'}
+RE_NUMERO_SUELTO = re.compile(r'^\s*(?:(?P<miles>\d{1,3}(?:[.,]\d{3})+)|(?P<numero>\d+(?:\.\d{1,2})?))\s*$')
+
+FACTOR_ATIPICO = 3         # 3 veces más caro o más barato que la última observación
+PRECIO_MINIMO = 50
+PRECIO_MAXIMO = 2_000_000
+
+
+def parsear_texto(texto):
+    """Texto de precio -> dict con precio_clp, precio_regular, precio_unidad, unidad_precio (None si no hay)."""
+    texto = str(texto).lower().replace('\xa0', ' ')
+    normales, unidades = [], []
+    for monto in RE_MONTO.finditer(texto):
+        if monto['multiplo'] or monto['ahorro']:
+            continue
+        valor = float(re.sub(r'[.,]', '', monto['entero'])) + float("0." + (monto['decimales'] or "0"))
+        unidad = monto['unidad'] or monto['unidad_antes']
+        if unidad:
+            unidad = RE_CONECTOR_UNIDAD.sub('', unidad)
+            unidades.append((valor, SINONIMOS_UNIDAD.get(unidad, unidad)))
+        else:
+            normales.append(valor)
+
+    resultado = {'precio_clp': None, 'precio_regular': None, 'precio_unidad': None, 'unidad_precio': None}
+    if unidades:
+        resultado['precio_unidad'], resultado['unidad_precio'] = unidades[0]
+    if normales:
+        resultado['precio_clp'], resultado['precio_regular'] = min(normales), max(normales)
+    elif unidades:
+        # A granel: sin monto normal, se cobra el precio por unidad
+        resultado['precio_clp'] = resultado['precio_regular'] = resultado['precio_unidad']
+    else:
+        # Sin "$": número suelto ("12990", "12.990" con punto de miles, "2990.0")
+        suelto = RE_NUMERO_SUELTO.match(texto)
+        if suelto:
+            resultado['precio_clp'] = float(re.sub(r'[.,]', '', suelto['miles']) if suelto['miles'] else suelto['numero'])
+    return resultado
+
+
+def _numero(valor):
+    """float o None (lo que no es número, NaN incluido)."""
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(numero) else numero
+
+
+def precios_anteriores(claves, ruta_historial=RUTA_HISTORIAL):
+    """{(supermercado, url_origen): último precio del historial} para las claves pedidas."""
+    if not ruta_historial or not os.path.exists(ruta_historial):
+        return {}
+    por_supermercado = {}
+    for supermercado, url in claves:
+        por_supermercado.setdefault(supermercado, []).append(url)
+    conexion = conectar(ruta_historial)
+    try:
+        anteriores = {}
+        for supermercado, urls in por_supermercado.items():
+            # Consultas por bloques para no pasar el límite de parámetros de SQLite
+            for i in range(0, len(urls), 500):
+                bloque = urls[i:i + 500]
+                marcas = ",".join("?" * len(bloque))
+                for fila in conexion.execute(
+                        f"SELECT supermercado, url_origen, precio FROM productos "
+                        f"WHERE supermercado = ? AND url_origen IN ({marcas})",
+                        [supermercado, *bloque]):
+                    anteriores[(fila[0], fila[1])] = fila[2]
+    finally:
+        conexion.close()
+    return anteriores
+
+
+def normalizar_precios(productos, ruta_historial=RUTA_HISTORIAL):
+    """Parsea precio_texto, separa regular / oferta / por unidad y marca atípicos."""
+    if not productos:
+        return productos
+    validos = []
+    for producto in productos:
+        producto = dict(producto)
+        texto = producto.pop('precio_texto', None)
+        if texto is not None:
+            producto.update(parsear_texto(texto))
+        for campo in ('precio_unidad', 'unidad_precio'):
+            producto.setdefault(campo, None)
+
+        clp = _numero(producto.get('precio_clp'))
+        if clp is None or round(clp) <= 0:
+            continue
+        producto['precio_clp'] = int(round(clp))
+        regular = _numero(producto.get('precio_regular'))
+        regular = int(round(regular)) if regular is not None else None
+        producto['precio_regular'] = regular if regular is not None and regular >= producto['precio_clp'] \
+            else producto['precio_clp']
+        producto['en_oferta'] = producto['precio_regular'] > producto['precio_clp']
+        validos.append(producto)
+
+    if len(validos) < len(productos):
+        print(f"⚠️ {len(productos) - len(validos)} productos sin precio válido descartados.")
+
+    anteriores = precios_anteriores({(p.get('supermercado'), p.get('url_origen')) for p in validos},
+                                    ruta_historial)
+    atipicos = 0
+    for producto in validos:
+        anterior = anteriores.get((producto.get('supermercado'), producto.get('url_origen')))
+        producto['precio_anterior'] = anterior
+        razon = None if anterior is None else producto['precio_clp'] / anterior if anterior else math.inf
+        producto['atipico'] = bool(
+            (razon is not None and (razon > FACTOR_ATIPICO or razon < 1 / FACTOR_ATIPICO))
+            or producto['precio_clp'] < PRECIO_MINIMO or producto['precio_clp'] > PRECIO_MAXIMO)
+        atipicos += producto['atipico']
+    if atipicos:
+        print(f"🔎 {atipicos} precios atípicos marcados (ver columna 'atipico').")
+    return validos
@@ -0,0 +1,135 @@
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+# --- PREPARACIÓN DECLARATIVA (cookies, comuna) ---
+# Cada adaptador declara los pasos en vez de escribir preparar_pagina dos
+# veces (sync y async). Formato:
+#   'pasos':        lista que se ejecuta siempre, en orden
+#   'listo':        {'selector', 'timeout'}: si aparece, la página ya sirve
+#   'si_no_listo':  pasos extra cuando 'listo' no aparece (ej. elegir comuna)
+#   'sesion_valida': {'presente', 'ausente', 'timeout', 'espera_ausente'}
+# Cada paso es un dict con 'accion' (clic, esperar, esperar_oculto, llenar,
+# red_inactiva), 'selector', 'texto', 'timeout' y 'opcional'.
+# preparar devuelve True si la página quedó lista (se guarda la sesión).
+
+TIMEOUT_PASO = 10000
+
+
+def _ejecutar_paso(page, paso):
+    timeout = paso.get('timeout', TIMEOUT_PASO)
+    accion = paso['accion']
+    if accion == 'clic':
+        page.locator(paso['selector']).first.click(timeout=timeout)
+    elif accion == 'esperar':
+        page.wait_for_selector(paso['selector'], timeout=timeout)
+    elif accion == 'esperar_oculto':
+        page.wait_for_selector(paso['selector'], state="hidden", timeout=timeout)
+    elif accion == 'llenar':
+        page.fill(paso['selector'], paso['texto'], timeout=timeout)
+    elif accion == 'red_inactiva':
+        page.wait_for_load_state("networkidle", timeout=timeout)
+    else:
+        raise ValueError(f"Paso de preparación desconocido: {accion}")
+
+
+def _ejecutar_pasos(page, pasos):
+    for paso in pasos:
+        try:
+            _ejecutar_paso(page, paso)
+        except PlaywrightError:
+            if not paso.get('opcional'):
+                return False
+    return True
+
+
+def preparar(page, receta):
+    if not _ejecutar_pasos(page, receta.get('pasos', [])):
+        return False
+    listo = receta.get('listo')
+    if not listo:
+        return True
+    try:
+        page.wait_for_selector(listo['selector'], timeout=listo.get('timeout', TIMEOUT_PASO))
+        return True
+    except PlaywrightTimeoutError:
+        return _ejecutar_pasos(page, receta.get('si_no_listo', []))
+
+
+def sesion_valida(page, receta):
+    """Con una sesión vigente la página aparece lista, sin banner ni modal."""
+    criterio = receta.get('sesion_valida') or {}
+    try:
+        if criterio.get('presente'):
+            page.wait_for_selector(criterio['presente'], timeout=criterio.get('timeout', TIMEOUT_PASO))
+        if criterio.get('ausente'):
+            espera = criterio.get('espera_ausente', 0)
+            if not espera:
+                return not page.locator(criterio['ausente']).first.is_visible()
+            try:
+                page.wait_for_selector(criterio['ausente'], timeout=espera)
+                return False
+            except PlaywrightTimeoutError:
+                return True
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+# --- VERSIÓN ASYNC ---
+
+async def _ejecutar_paso_async(page, paso):
+    timeout = paso.get('timeout', TIMEOUT_PASO)
+    accion = paso['accion']
+    if accion == 'clic':
+        await page.locator(paso['selector']).first.click(timeout=timeout)
+    elif accion == 'esperar':
+        await page.wait_for_selector(paso['selector'], timeout=timeout)
+    elif accion == 'esperar_oculto':
+        await page.wait_for_selector(paso['selector'], state="hidden", timeout=timeout)
+    elif accion == 'llenar':
+        await page.fill(paso['selector'], paso['texto'], timeout=timeout)
+    elif accion == 'red_inactiva':
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+    else:
+        raise ValueError(f"Paso de preparación desconocido: {accion}")
+
+
+async def _ejecutar_pasos_async(page, pasos):
+    for paso in pasos:
+        try:
+            await _ejecutar_paso_async(page, paso)
+        except PlaywrightError:
+            if not paso.get('opcional'):
+                return False
+    return True
+
+
+async def preparar_async(page, receta):
+    if not await _ejecutar_pasos_async(page, receta.get('pasos', [])):
+        return False
+    listo = receta.get('listo')
+    if not listo:
+        return True
+    try:
+        await page.wait_for_selector(listo['selector'], timeout=listo.get('timeout', TIMEOUT_PASO))
+        return True
+    except PlaywrightTimeoutError:
+        return await _ejecutar_pasos_async(page, receta.get('si_no_listo', []))
+
+
+async def sesion_valida_async(page, receta):
+    criterio = receta.get('sesion_valida') or {}
+    try:
+        if criterio.get('presente'):
+            await page.wait_for_selector(criterio['presente'], timeout=criterio.get('timeout', TIMEOUT_PASO))
+        if criterio.get('ausente'):
+            espera = criterio.get('espera_ausente', 0)
+            if not espera:
+                return not await page.locator(criterio['ausente']).first.is_visible()
+            try:
+                await page.wait_for_selector(criterio['ausente'], timeout=espera)
+                return False
+            except PlaywrightTimeoutError:
+                return True
+        return True
+    except PlaywrightTimeoutError:
+        return False
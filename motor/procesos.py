@@ -0,0 +1,147 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from urllib.parse import urlparse
+
+from motor.diario import DiarioTrabajos
+from motor.extraccion import ejecutar_trabajos_sync
+from motor.huellas import CacheHuellas
+from motor.metricas import RegistroMetricas
+from motor.planificador import CuboTokens, Planificador
+from motor.runner_async import ejecutar_trabajos
+
+# --- VARIOS PROCESOS ---
+# Con un solo proceso el driver de Playwright y el parseo compiten por el
+# mismo núcleo. Aquí los trabajos (tienda, url) se reparten entre varios
+# procesos, cada uno con su propio navegador y su runner (async o sync).
+# Cada proceso manda los productos de cada categoría por una cola apenas
+# termina (acotada: si el principal no da abasto, los hijos esperan), así
+# con --streaming la memoria del principal no crece con el tamaño de la
+# parte de cada hijo. Al final cada hijo devuelve los resultados del
+# planificador y sus métricas. La salida (scraper.py) deduplica y arma un
+# solo fixture por tienda, igual que con un proceso.
+#   - El ritmo por dominio se reparte: si 3 procesos tocan jumbo.cl, cada
+#     uno usa un tercio de las peticiones por minuto.
+#   - El diario y las huellas son SQLite en WAL: cada proceso abre su
+#     propia conexión.
+#   - Con procesos=1 todo corre en el proceso actual (para depurar).
+
+PROCESOS_POR_DEFECTO = os.cpu_count() or 1
+# Categorías en tránsito por hijo antes de que put() espere
+CATEGORIAS_EN_COLA = 2
+
+
+def repartir(trabajos, procesos):
+    """Round robin sobre los trabajos ordenados por tienda: cada proceso recibe una mezcla."""
+    ordenados = sorted(trabajos, key=lambda t: t[0])
+    return [parte for parte in (ordenados[i::procesos] for i in range(procesos)) if parte]
+
+
+def ritmo_por_dominio(partes, por_minuto):
+    """{dominio: peticiones por minuto para cada proceso que lo toca}."""
+    procesos_por_dominio = {}
+    for parte in partes:
+        for dominio in {urlparse(url).netloc for _, url in parte}:
+            procesos_por_dominio[dominio] = procesos_por_dominio.get(dominio, 0) + 1
+    return {dominio: por_minuto / n for dominio, n in procesos_por_dominio.items()}
+
+
+def _correr_runner(trabajos, opciones, sync, concurrencia, al_terminar=None, **servicios):
+    if sync:
+        return ejecutar_trabajos_sync(trabajos, opciones, al_terminar=al_terminar, **servicios)
+    return asyncio.run(ejecutar_trabajos(trabajos, opciones, al_terminar=al_terminar,
+                                         **concurrencia, **servicios))
+
+
+def _trabajador(trabajos, opciones, sync, concurrencia, ritmo, reintentos, ruta_diario, huellas, cola):
+    """Corre en un proceso hijo: un navegador para su parte de los trabajos."""
+    planificador = Planificador(reintentos=reintentos)
+    for dominio, por_minuto in ritmo.items():
+        planificador.cubos[dominio] = CuboTokens(por_minuto)
+    metricas = RegistroMetricas()
+    diario = DiarioTrabajos(ruta_diario) if ruta_diario else None
+    huellas = CacheHuellas(*huellas) if huellas else None
+    try:
+        _correr_runner(trabajos, opciones, sync, concurrencia,
+                       al_terminar=lambda tienda, productos: cola.put((tienda, list(productos))),
+                       diario=diario, planificador=planificador, metricas=metricas, huellas=huellas)
+    finally:
+        if diario:
+            diario.conexion.close()
+        if huellas:
+            huellas.cerrar()
+    return planificador.resultados, metricas
+
+
+def ejecutar_en_procesos(trabajos, opciones=None, procesos=PROCESOS_POR_DEFECTO, sync=False,
+                         concurrencia=None, al_terminar=None, diario=None, planificador=None,
+                         metricas=None, huellas=None):
+    """
+    Reparte los trabajos entre `procesos` procesos con su propio navegador.
+
+    Devuelve {tienda: [productos]} como los runners o, con
+    al_terminar(tienda, productos), entrega cada categoría apenas la
+    termina un hijo. Los resultados del planificador y las métricas de los hijos
+    se suman a los que se pasan.
+    """
+    concurrencia = concurrencia or {}
+    planificador = planificador or Planificador()
+    metricas = metricas or RegistroMetricas()
+    servicios = {'diario': diario, 'planificador': planificador, 'metricas': metricas, 'huellas': huellas}
+    if procesos <= 1:
+        return _correr_runner(trabajos, opciones, sync, concurrencia, al_terminar, **servicios)
+
+    resultados = {tienda: [] for tienda, _ in trabajos}
+    entregar = al_terminar or (lambda tienda, productos: resultados[tienda].extend(productos))
+    if diario:
+        trabajos = diario.reanudar(trabajos, entregar)
+    partes = repartir(trabajos, procesos)
+    if not partes:
+        return resultados
+    ritmo = ritmo_por_dominio(partes, planificador.por_minuto)
+    print(f"🧵 {len(trabajos)} categorías repartidas en {len(partes)} procesos.")
+
+    inicio = time.perf_counter()
+    # spawn: los hijos no heredan hilos ni estado de Playwright del padre
+    contexto = multiprocessing.get_context("spawn")
+    with contexto.Manager() as manager, ProcessPoolExecutor(len(partes), mp_context=contexto) as pool:
+        cola = manager.Queue(CATEGORIAS_EN_COLA * len(partes))
+        futuros = {
+            pool.submit(_trabajador, parte, opciones, sync, concurrencia, ritmo,
+                        planificador.reintentos, diario.ruta if diario else None,
+                        (huellas.ruta, huellas.refresco.total_seconds() / 3600) if huellas else None,
+                        cola): parte
+            for parte in partes
+        }
+        pendientes = set(futuros)
+        while pendientes:
+            _vaciar_cola(cola, entregar, espera=0.2)
+            terminados, pendientes = wait(pendientes, timeout=0, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                try:
+                    registros, metricas_hijo = futuro.result()
+                except Exception as e:
+                    print(f"❌ ERROR en un proceso ({len(futuros[futuro])} categorías): {e}")
+                    for tienda, url in futuros[futuro]:
+                        planificador.registrar_error(tienda, url, e, inicio)
+                    continue
+                planificador.resultados.extend(registros)
+                metricas.sumar(metricas_hijo)
+        # Lo que los hijos alcanzaron a poner antes de terminar
+        _vaciar_cola(cola, entregar)
+    return resultados
+
+
+def _vaciar_cola(cola, entregar, espera=0):
+    """Entrega las categorías que llegaron; espera hasta `espera` segundos por la primera."""
+    while True:
+        try:
+            tienda, productos = cola.get(timeout=espera) if espera else cola.get_nowait()
+        except queue.Empty:
+            return
+        espera = 0
+        if productos:
+            entregar(tienda, productos)
@@ -0,0 +1,192 @@
+import asyncio
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+from motor.bloqueo import BloqueadorRecursos
+from motor.cache_red import EntradaCacheRed
+from motor.extraccion import (combinar_productos, completar_opciones, crear_captura, crear_cosecha, crear_sesion,
+                              opciones_contexto)
+from motor.html_estatico import extraer_registros
+from motor.huellas import calcular_huella
+from motor.metricas import Metricas, RegistroMetricas
+from motor.navegador import lanzar_async
+from motor.planificador import ExtraccionParcial, Planificador
+from motor.preparacion import preparar_async, sesion_valida_async
+from motor.scroll import MOTIVOS_PARCIALES, realizar_scroll_adaptativo_async
+from tiendas import cargar_adaptador
+
+# --- RUNNER CONCURRENTE ---
+# Un solo Chromium compartido, un contexto por trabajo y concurrencia
+# acotada por dominio. Cada trabajo es una tupla (tienda, url_categoria).
+# Se usa desde scraper.py (la CLI única).
+
+MAX_PAGINAS_POR_DOMINIO = 2
+MAX_PAGINAS_TOTAL = 6
+
+
+async def leer_registros_async(page, adaptador, opciones):
+    """Lectura de tarjetas en una sola llamada: html (si se pidió) o lote."""
+    if opciones['modo'] == "html" and adaptador['campos_html']:
+        try:
+            registros = extraer_registros(await page.content(), adaptador['campos_html'])
+            if registros:
+                return registros
+        except Exception as e:
+            print(f"⚠️ Lectura 'html' falló en {adaptador['nombre']}: {e}")
+    return await page.evaluate(adaptador['js_lote'], adaptador['args_lote'])
+
+
+async def extraer_categoria(browser, adaptador, url, opciones=None, al_parcial=None, metricas=None,
+                            huellas=None):
+    """Extrae una categoría en su propio contexto y devuelve los productos."""
+    opciones = completar_opciones(opciones)
+    metricas = metricas or Metricas()
+    sesion = crear_sesion(adaptador, opciones)
+    cache_red = EntradaCacheRed(opciones, adaptador['clave'], url)
+    with metricas.fase("contexto"):
+        context = await browser.new_context(**opciones_contexto(adaptador, sesion, opciones['perfil']),
+                                            **cache_red.opciones_contexto())
+        bloqueador = None
+        if opciones['bloquear_recursos']:
+            bloqueador = BloqueadorRecursos(adaptador['reglas_bloqueo'])
+            await bloqueador.instalar_async(context)
+        page = metricas.envolver(await context.new_page())
+        await cache_red.instalar_async(page)
+        metricas.conectar_red(page)
+
+        captura = crear_captura(adaptador, url, opciones, al_parcial)
+        if captura:
+            captura.conectar(page)
+
+    try:
+        with metricas.fase("goto"):
+            await page.goto(url, timeout=90000, wait_until="domcontentloaded")
+        receta = adaptador['preparacion']
+        if receta:
+            with metricas.fase("preparacion"):
+                reutilizada = sesion and sesion.cargada and await sesion_valida_async(page, receta)
+                if not reutilizada:
+                    if sesion and sesion.cargada:
+                        sesion.invalidar()
+                    if await preparar_async(page, receta) and sesion:
+                        sesion.guardar(await context.storage_state())
+
+        stats = {'pasos': 0, 'tarjetas': 0, 'espera_s': 0.0, 'motivo': None}
+        huella = None
+        cosecha = crear_cosecha(adaptador, opciones)
+        try:
+            with metricas.fase("espera_tarjetas"):
+                await page.wait_for_selector(adaptador['selector_tarjetas'],
+                                             timeout=adaptador['espera_tarjetas_ms'])
+            if huellas and adaptador['campos_huella']:
+                with metricas.fase("huella"):
+                    huella = calcular_huella(await page.evaluate(adaptador['js_lote'], adaptador['args_lote']),
+                                             adaptador['campos_huella'])
+                    guardados = huellas.reutilizar(adaptador['clave'], url, huella)
+                if guardados is not None:
+                    print(f"♻️ {adaptador['nombre']} {url}: primera página sin cambios, "
+                          f"{len(guardados)} productos reutilizados.")
+                    return guardados
+            with metricas.fase("scroll"):
+                stats = await realizar_scroll_adaptativo_async(page, adaptador['selector_tarjetas'],
+                                                               cosecha=cosecha, **adaptador['ajustes_scroll'])
+            metricas.iteraciones_scroll += stats['pasos']
+        except PlaywrightTimeoutError:
+            # Sin tarjetas ni nada capturado no hay qué leer: el planificador reintenta
+            if captura:
+                await captura.esperar_pendientes()
+            if not (captura and captura.productos):
+                raise
+            print(f"⚠️ Alerta: no se cargaron tarjetas en {adaptador['nombre']}, se usa lo capturado.")
+
+        with metricas.fase("extraccion"):
+            productos = []
+            if captura:
+                await captura.esperar_pendientes()
+                productos = captura.resultados()
+            # Primera página renderizada en el servidor: se completa desde el DOM
+            if len(productos) < stats['tarjetas']:
+                if cosecha and cosecha.registros:
+                    registros = cosecha.registros
+                else:
+                    registros = await leer_registros_async(page, adaptador, opciones)
+                productos = combinar_productos(productos, adaptador['productos_desde_registros'](registros, url))
+        if stats['motivo'] in MOTIVOS_PARCIALES:
+            print(f"⚠️ {adaptador['nombre']} {url}: scroll cortado por {stats['motivo']}, "
+                  f"la categoría puede estar incompleta.")
+            productos = ExtraccionParcial(productos, stats['motivo'])
+        elif huella:
+            huellas.guardar(adaptador['clave'], url, huella, productos)
+
+        print(f" -> {adaptador['nombre']} {url}: {len(productos)} productos "
+              f"({stats['pasos']} pasos, {round(stats['espera_s'], 2)}s esperando)")
+        if bloqueador:
+            bloqueador.imprimir_resumen(adaptador['nombre'])
+        cache_red.completa = True
+        return productos
+    finally:
+        await context.close()
+        cache_red.cerrar()
+
+
+async def ejecutar_trabajos(trabajos, opciones=None,
+                            max_por_dominio=MAX_PAGINAS_POR_DOMINIO,
+                            max_total=MAX_PAGINAS_TOTAL, al_terminar=None, diario=None, planificador=None,
+                            metricas=None, huellas=None):
+    """
+    Ejecuta todos los trabajos sobre un mismo navegador.
+
+    Devuelve {tienda: [productos]} con los productos crudos de cada tienda.
+    Si se pasa al_terminar(tienda, productos), cada categoría se entrega
+    apenas termina y no se acumula en memoria. Con un DiarioTrabajos se
+    saltan las categorías ya completadas y se guarda el avance. El
+    Planificador pone el ritmo, reintenta y registra el resultado de cada
+    trabajo; el RegistroMetricas junta las fases de todos. La CacheHuellas
+    salta las categorías cuya primera página no cambió.
+    """
+    opciones = completar_opciones(opciones)
+    planificador = planificador or Planificador()
+    metricas = metricas or RegistroMetricas()
+    semaforo_total = asyncio.Semaphore(max_total)
+    semaforos_dominio = {}
+    resultados = {tienda: [] for tienda, _ in trabajos}
+    entregar = al_terminar or (lambda tienda, productos: resultados[tienda].extend(productos))
+    if diario:
+        trabajos = diario.reanudar(trabajos, entregar)
+    if not trabajos:
+        return resultados
+
+    async with async_playwright() as p:
+        with metricas.globales.fase("lanzamiento"):
+            browser = await lanzar_async(p, opciones['perfil'], opciones['headless'], opciones['conectar'])
+
+        async def correr(tienda, url):
+            dominio = urlparse(url).netloc
+            semaforo = semaforos_dominio.setdefault(dominio, asyncio.Semaphore(max_por_dominio))
+            async with semaforo_total, semaforo:
+                al_parcial = diario.registrador_parcial(tienda, url) if diario else None
+                metricas_trabajo = Metricas()
+                try:
+                    productos = await planificador.ejecutar_async(tienda, url, lambda: extraer_categoria(
+                        browser, cargar_adaptador(tienda), url, opciones, al_parcial, metricas_trabajo, huellas))
+                except Exception as e:
+                    print(f"❌ ERROR en {tienda} {url}: {e}")
+                    productos = diario.fallar(tienda, url, e) if diario else []
+                    if not productos:
+                        return
+                else:
+                    if diario and isinstance(productos, ExtraccionParcial):
+                        productos = diario.dejar_pendiente(tienda, url, productos, productos.motivo)
+                    elif diario:
+                        productos = diario.completar(tienda, url, productos)
+                finally:
+                    metricas.agregar(tienda, metricas_trabajo)
+                entregar(tienda, productos)
+
+        try:
+            await asyncio.gather(*(correr(tienda, url) for tienda, url in trabajos))
+        finally:
+            await browser.close()
+
+    return resultados
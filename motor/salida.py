@@ -0,0 +1,113 @@
+import gzip
+import hashlib
+import json
+
+# --- SALIDA STREAMING (JSONL) ---
+# Cada producto se escribe como una línea JSON apenas se extrae, en vez de
+# juntar todo en listas + DataFrame y volcarlo al final. La deduplicación
+# guarda solo un hash de 8 bytes por clave vista. Al terminar, el JSONL se
+# convierte a fixture de Django por bloques, sin cargarlo entero en memoria.
+# Como scraper.deduplicar, de cada clave queda la última aparición: el JSONL
+# lo tiene todo y se filtra al leerlo (leer_jsonl_unicos, dos pasadas).
+
+
+def _abrir(ruta, modo):
+    if ruta.endswith(".gz"):
+        return gzip.open(ruta, modo + "t", encoding="utf-8")
+    return open(ruta, modo, encoding="utf-8")
+
+
+def clave_compacta(producto, claves):
+    valores = json.dumps([producto.get(c) for c in claves], ensure_ascii=False)
+    return hashlib.blake2b(valores.encode("utf-8"), digest_size=8).digest()
+
+
+class EscritorStreaming:
+    """
+    Escribe productos en JSONL (comprimido si la ruta termina en .gz).
+
+    Escribe todas las apariciones y cuenta las claves de `claves_dedup`
+    repetidas; cuál queda se decide al leer (leer_jsonl_unicos).
+    """
+
+    def __init__(self, ruta, claves_dedup):
+        self.ruta = ruta
+        self.claves_dedup = claves_dedup
+        self.vistos = set()
+        self.escritos = 0
+        self.duplicados = 0
+        self._archivo = _abrir(ruta, "w")
+
+    def escribir(self, producto):
+        clave = clave_compacta(producto, self.claves_dedup)
+        if clave in self.vistos:
+            self.duplicados += 1
+        self.vistos.add(clave)
+        self._archivo.write(json.dumps(producto, ensure_ascii=False))
+        self._archivo.write("\n")
+        self.escritos += 1
+
+    def escribir_todos(self, productos):
+        for producto in productos:
+            self.escribir(producto)
+
+    def cerrar(self):
+        if not self._archivo.closed:
+            self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def leer_jsonl(ruta):
+    """Generador de productos desde un JSONL (o .jsonl.gz)."""
+    with _abrir(ruta, "r") as f:
+        for linea in f:
+            if linea.strip():
+                yield json.loads(linea)
+
+
+def leer_jsonl_unicos(ruta, claves_dedup):
+    """Como leer_jsonl, pero solo la última aparición de cada clave (en su posición)."""
+    ultima = {}
+    for numero, producto in enumerate(leer_jsonl(ruta)):
+        ultima[clave_compacta(producto, claves_dedup)] = numero
+    for numero, producto in enumerate(leer_jsonl(ruta)):
+        if ultima[clave_compacta(producto, claves_dedup)] == numero:
+            yield producto
+
+
+def _en_bloques(iterable, tamano):
+    bloque = []
+    for item in iterable:
+        bloque.append(item)
+        if len(bloque) >= tamano:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def jsonl_a_fixture(ruta_jsonl, ruta_fixture, formatear, model_name, super_id, tamano_bloque=500,
+                    claves_dedup=None):
+    """
+    Convierte el JSONL en un fixture de Django (lista JSON) escribiendo por bloques.
+
+    Con claves_dedup queda la última aparición de cada clave.
+    Devuelve la cantidad de objetos escritos.
+    """
+    productos = leer_jsonl_unicos(ruta_jsonl, claves_dedup) if claves_dedup else leer_jsonl(ruta_jsonl)
+    total = 0
+    with open(ruta_fixture, "w", encoding="utf-8") as salida:
+        salida.write("[\n")
+        for bloque in _en_bloques(productos, tamano_bloque):
+            for objeto in formatear(bloque, model_name, super_id):
+                if total:
+                    salida.write(",\n")
+                salida.write(json.dumps(objeto, ensure_ascii=False))
+                total += 1
+        salida.write("\n]\n")
+    return total
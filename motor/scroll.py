@@ -0,0 +1,326 @@
+import time
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+# --- MOTOR DE SCROLL ADAPTATIVO ---
+# En vez de dormir tiempos fijos, cada paso espera señales reales:
+#   1. que crezca la cantidad de tarjetas en el DOM,
+#   2. que las peticiones de red pendientes (xhr/fetch) queden en cero,
+#   3. que el botón "Ver más productos" deje de estar visible.
+# Todo con un plazo total por categoría.
+#
+# Con una CosechaIncremental (motor/cosecha.py) cada paso baja casi una altura
+# de ventana en vez de saltar al final: en una grilla virtualizada el salto
+# desmonta las tarjetas del medio sin que se lleguen a leer. Mientras la
+# página baja basta con que se calme la red; recién cuando ya no se puede
+# bajar más (el fondo es el chequeo final) se espera que crezca la página y
+# se cuentan los pasos sin ids nuevos ni completados. Como baja de a poco,
+# el plazo total se multiplica por FACTOR_PLAZO_COSECHA. Si igual se acaba,
+# el motivo es 'plazo' y los runners entregan la categoría como parcial.
+#
+# Memoria del navegador: la cosecha no saca nodos ni imágenes del DOM (es
+# de la tienda y lo leen los snapshots), así que el tope es cortar. Cada
+# paso se mira el heap JS de la página (performance.memory, solo Chromium)
+# y si pasa de max_heap_mb el scroll termina con motivo 'memoria', que
+# también se entrega como parcial (MOTIVOS_PARCIALES).
+
+TIPOS_RED_SEGUIDOS = ("xhr", "fetch", "document")
+
+JS_CONTAR = "(sel) => document.querySelectorAll(sel).length"
+JS_CRECIO = "([sel, n]) => document.querySelectorAll(sel).length > n"
+JS_AL_FINAL = "window.scrollTo(0, document.body.scrollHeight)"
+# Paso de la cosecha: algo menos que una ventana, para que las tarjetas del
+# borde de abajo sigan montadas (y terminen de cargar precio e imagen) en el
+# paso siguiente
+FRACCION_VENTANA = 0.8
+FACTOR_PLAZO_COSECHA = 3
+MAX_HEAP_MB = 768
+MOTIVOS_PARCIALES = ("plazo", "memoria")
+JS_HEAP_MB = "performance.memory ? performance.memory.usedJSHeapSize / 1048576 : 0"
+JS_ALTURA = "document.body.scrollHeight"
+JS_CRECIO_ALTURA = "(altura) => document.body.scrollHeight > altura"
+JS_BAJAR_VENTANA = """(fraccion) => {
+    const antes = window.scrollY;
+    window.scrollBy(0, window.innerHeight * fraccion);
+    return window.scrollY > antes;
+}"""
+
+
+class MonitorRed:
+    """Lleva la cuenta de las peticiones xhr/fetch que siguen en vuelo."""
+
+    def __init__(self):
+        self.pendientes = set()
+
+    def conectar(self, page):
+        page.on("request", self._al_pedir)
+        page.on("requestfinished", self._al_terminar)
+        page.on("requestfailed", self._al_terminar)
+
+    def desconectar(self, page):
+        page.remove_listener("request", self._al_pedir)
+        page.remove_listener("requestfinished", self._al_terminar)
+        page.remove_listener("requestfailed", self._al_terminar)
+
+    def _al_pedir(self, request):
+        if request.resource_type in TIPOS_RED_SEGUIDOS:
+            self.pendientes.add(request)
+
+    def _al_terminar(self, request):
+        self.pendientes.discard(request)
+
+    def en_vuelo(self):
+        return len(self.pendientes)
+
+
+def esperar_crecimiento(page, selector, cantidad_actual, segundos):
+    """True si aparecen más tarjetas que cantidad_actual antes del límite."""
+    try:
+        page.wait_for_function(JS_CRECIO, arg=[selector, cantidad_actual],
+                               timeout=segundos * 1000)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+def esperar_altura(page, altura, segundos):
+    """True si la página crece más allá de `altura` antes del límite."""
+    try:
+        page.wait_for_function(JS_CRECIO_ALTURA, arg=altura, timeout=segundos * 1000)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+def esperar_red_inactiva(page, monitor, quietud, segundos):
+    """Espera hasta que no haya peticiones en vuelo durante `quietud` segundos."""
+    limite = time.perf_counter() + segundos
+    quieto_desde = None
+    while time.perf_counter() < limite:
+        if monitor.en_vuelo() == 0:
+            quieto_desde = quieto_desde or time.perf_counter()
+            if time.perf_counter() - quieto_desde >= quietud:
+                return True
+        else:
+            quieto_desde = None
+        # wait_for_timeout (y no time.sleep) para que Playwright despache eventos
+        page.wait_for_timeout(50)
+    return False
+
+
+def click_ver_mas(page, selector_boton):
+    """Hace click en el botón de "Ver más" si está visible y habilitado."""
+    boton = page.locator(selector_boton).first
+    try:
+        if boton.count() and boton.is_visible() and boton.is_enabled():
+            boton.click(timeout=3000)
+            print(" -> Botón 'Ver más' clickeado.")
+            return True
+    except Exception:
+        pass
+    return False
+
+
+def realizar_scroll_adaptativo(page, selector_tarjetas, selector_boton=None,
+                               plazo_total=90, espera_max_paso=6, quietud_red=0.4,
+                               pasos_sin_cambio=2, rebote=500, cosecha=None, max_heap_mb=MAX_HEAP_MB):
+    """
+    Baja por la página hasta que dejen de aparecer tarjetas.
+
+    Con cosecha, las tarjetas nuevas se leen después de cada paso.
+    Devuelve un dict con pasos, tarjetas, segundos esperando señales,
+    segundos totales, el heap máximo de la página y el motivo de término.
+    """
+    if cosecha:
+        plazo_total *= FACTOR_PLAZO_COSECHA
+    monitor = MonitorRed()
+    monitor.conectar(page)
+
+    inicio = time.perf_counter()
+    stats = {'pasos': 0, 'tarjetas': 0, 'espera_s': 0.0, 'total_s': 0.0, 'heap_mb': 0.0, 'motivo': 'estable'}
+    tarjetas = page.evaluate(JS_CONTAR, selector_tarjetas)
+    if cosecha:
+        cosecha.cosechar(page)
+    sin_cambio = 0
+
+    try:
+        while True:
+            restante = plazo_total - (time.perf_counter() - inicio)
+            if restante <= 0:
+                stats['motivo'] = 'plazo'
+                break
+
+            if cosecha:
+                altura = page.evaluate(JS_ALTURA)
+                bajo = page.evaluate(JS_BAJAR_VENTANA, FRACCION_VENTANA)
+            else:
+                page.evaluate(JS_AL_FINAL)
+            if selector_boton:
+                click_ver_mas(page, selector_boton)
+
+            t0 = time.perf_counter()
+            if cosecha:
+                crecio = bajo or esperar_altura(page, altura, min(espera_max_paso, restante))
+            else:
+                crecio = esperar_crecimiento(page, selector_tarjetas, tarjetas,
+                                             min(espera_max_paso, restante))
+            esperar_red_inactiva(page, monitor, quietud_red, min(espera_max_paso, restante))
+            stats['espera_s'] += time.perf_counter() - t0
+            stats['pasos'] += 1
+            stats['heap_mb'] = max(stats['heap_mb'], page.evaluate(JS_HEAP_MB))
+            if max_heap_mb and stats['heap_mb'] > max_heap_mb:
+                stats['motivo'] = 'memoria'
+                if cosecha:
+                    cosecha.cosechar(page)
+                break
+
+            nuevas = page.evaluate(JS_CONTAR, selector_tarjetas)
+            if cosecha:
+                # En una grilla virtualizada la cuenta no crece: el avance son los ids nuevos
+                avanzo = cosecha.cosechar(page) > 0
+                if bajo and not avanzo:
+                    # Todavía en medio de la página: el paso no cuenta como estancado
+                    tarjetas = nuevas
+                    continue
+            else:
+                avanzo = crecio or nuevas > tarjetas
+            if avanzo:
+                sin_cambio = 0
+            else:
+                sin_cambio += 1
+                if sin_cambio >= pasos_sin_cambio:
+                    break
+                # Pequeño rebote hacia arriba para despertar el lazy load
+                page.evaluate(f"window.scrollBy(0, -{rebote})")
+            tarjetas = nuevas
+    finally:
+        monitor.desconectar(page)
+
+    stats['tarjetas'] = len(cosecha.registros) if cosecha else tarjetas
+    stats['total_s'] = time.perf_counter() - inicio
+    print(f" -> Fin del scroll ({stats['motivo']}): {stats['tarjetas']} tarjetas en {stats['pasos']} pasos.")
+    return stats
+
+
+# --- VERSIÓN ASYNC (playwright.async_api) ---
+# Misma lógica que la versión sync, para el runner concurrente.
+
+async def esperar_crecimiento_async(page, selector, cantidad_actual, segundos):
+    try:
+        await page.wait_for_function(JS_CRECIO, arg=[selector, cantidad_actual],
+                                     timeout=segundos * 1000)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def esperar_altura_async(page, altura, segundos):
+    try:
+        await page.wait_for_function(JS_CRECIO_ALTURA, arg=altura, timeout=segundos * 1000)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def esperar_red_inactiva_async(page, monitor, quietud, segundos):
+    limite = time.perf_counter() + segundos
+    quieto_desde = None
+    while time.perf_counter() < limite:
+        if monitor.en_vuelo() == 0:
+            quieto_desde = quieto_desde or time.perf_counter()
+            if time.perf_counter() - quieto_desde >= quietud:
+                return True
+        else:
+            quieto_desde = None
+        await page.wait_for_timeout(50)
+    return False
+
+
+async def click_ver_mas_async(page, selector_boton):
+    boton = page.locator(selector_boton).first
+    try:
+        if await boton.count() and await boton.is_visible() and await boton.is_enabled():
+            await boton.click(timeout=3000)
+            return True
+    except Exception:
+        pass
+    return False
+
+
+async def realizar_scroll_adaptativo_async(page, selector_tarjetas, selector_boton=None,
+                                           plazo_total=90, espera_max_paso=6, quietud_red=0.4,
+                                           pasos_sin_cambio=2, rebote=500, cosecha=None, max_heap_mb=MAX_HEAP_MB):
+    if cosecha:
+        plazo_total *= FACTOR_PLAZO_COSECHA
+    monitor = MonitorRed()
+    monitor.conectar(page)
+
+    inicio = time.perf_counter()
+    stats = {'pasos': 0, 'tarjetas': 0, 'espera_s': 0.0, 'total_s': 0.0, 'heap_mb': 0.0, 'motivo': 'estable'}
+    tarjetas = await page.evaluate(JS_CONTAR, selector_tarjetas)
+    if cosecha:
+        await cosecha.cosechar_async(page)
+    sin_cambio = 0
+
+    try:
+        while True:
+            restante = plazo_total - (time.perf_counter() - inicio)
+            if restante <= 0:
+                stats['motivo'] = 'plazo'
+                break
+
+            if cosecha:
+                altura = await page.evaluate(JS_ALTURA)
+                bajo = await page.evaluate(JS_BAJAR_VENTANA, FRACCION_VENTANA)
+            else:
+                await page.evaluate(JS_AL_FINAL)
+            if selector_boton:
+                await click_ver_mas_async(page, selector_boton)
+
+            t0 = time.perf_counter()
+            if cosecha:
+                crecio = bajo or await esperar_altura_async(page, altura, min(espera_max_paso, restante))
+            else:
+                crecio = await esperar_crecimiento_async(page, selector_tarjetas, tarjetas,
+                                                         min(espera_max_paso, restante))
+            await esperar_red_inactiva_async(page, monitor, quietud_red,
+                                             min(espera_max_paso, restante))
+            stats['espera_s'] += time.perf_counter() - t0
+            stats['pasos'] += 1
+            stats['heap_mb'] = max(stats['heap_mb'], await page.evaluate(JS_HEAP_MB))
+            if max_heap_mb and stats['heap_mb'] > max_heap_mb:
+                stats['motivo'] = 'memoria'
+                if cosecha:
+                    await cosecha.cosechar_async(page)
+                break
+
+            nuevas = await page.evaluate(JS_CONTAR, selector_tarjetas)
+            if cosecha:
+                # En una grilla virtualizada la cuenta no crece: el avance son los ids nuevos
+                avanzo = await cosecha.cosechar_async(page) > 0
+                if bajo and not avanzo:
+                    # Todavía en medio de la página: el paso no cuenta como estancado
+                    tarjetas = nuevas
+                    continue
+            else:
+                avanzo = crecio or nuevas > tarjetas
+            if avanzo:
+                sin_cambio = 0
+            else:
+                sin_cambio += 1
+                if sin_cambio >= pasos_sin_cambio:
+                    break
+                await page.evaluate(f"window.scrollBy(0, -{rebote})")
+            tarjetas = nuevas
+    finally:
+        monitor.desconectar(page)
+
+    stats['tarjetas'] = len(cosecha.registros) if cosecha else tarjetas
+    stats['total_s'] = time.perf_counter() - inicio
+    return stats
+
+
+def imprimir_resumen_tiempos(nombre_super, stats_scroll, segundos_extraccion):
+    espera = stats_scroll['espera_s'] if stats_scroll else 0.0
+    print(f"⏱️ {nombre_super}: esperando carga {round(espera, 2)}s | "
+          f"extrayendo {round(segundos_extraccion, 2)}s")
@@ -0,0 +1,54 @@
+import json
+import os
+import re
+import time
+
+# --- CACHÉ DE SESIÓN (storage_state) ---
+# Las cookies aceptadas y la comuna elegida viven en cookies/localStorage.
+# Guardamos el storage_state del contexto tras la primera preparación exitosa
+# y lo reutilizamos en los contextos siguientes. Si al cargar la página la
+# sesión ya no sirve (vuelve el banner, no hay precios) se invalida y se
+# vuelve a preparar.
+
+DIRECTORIO_SESIONES = ".sesiones"
+TTL_SESION_HORAS = 24
+
+
+def _slug(texto):
+    return re.sub(r'[^a-z0-9]+', '_', texto.lower()).strip('_')
+
+
+class SesionTienda:
+    """storage_state guardado en disco para una tienda (y variante, ej. comuna)."""
+
+    def __init__(self, tienda, variante="", ttl_horas=TTL_SESION_HORAS,
+                 directorio=DIRECTORIO_SESIONES):
+        nombre = _slug(tienda) + (f"_{_slug(variante)}" if variante else "")
+        self.ruta = os.path.join(directorio, f"{nombre}.json")
+        self.ttl_segundos = ttl_horas * 3600
+        self.cargada = False
+
+    def esta_vigente(self):
+        if not os.path.exists(self.ruta):
+            return False
+        return time.time() - os.path.getmtime(self.ruta) < self.ttl_segundos
+
+    def opciones_contexto(self):
+        """Argumentos extra para browser.new_context (vacío si no hay sesión vigente)."""
+        self.cargada = self.esta_vigente()
+        return {'storage_state': self.ruta} if self.cargada else {}
+
+    def guardar(self, estado):
+        """Guarda el dict de context.storage_state() de forma atómica."""
+        os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+        temporal = f"{self.ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(estado, f)
+        os.replace(temporal, self.ruta)
+        print(f"🔑 Sesión guardada en {self.ruta}")
+
+    def invalidar(self):
+        self.cargada = False
+        if os.path.exists(self.ruta):
+            os.remove(self.ruta)
+        print(f"⚠️ Sesión vencida, se vuelve a preparar: {self.ruta}")
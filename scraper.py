@@ -0,0 +1,281 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from motor.cache_red import MAX_MB_CACHE_RED, MODOS_CACHE_RED
+from motor.carga import cargar_fixture, conectar as conectar_db
+from motor.descubrimiento import descubrir_categorias
+from motor.diario import RUTA_DIARIO, DiarioTrabajos
+from motor.fixture import MODEL_NAME
+from motor.historial import guardar_delta
+from motor.huellas import REFRESCO_FORZADO_HORAS, RUTA_HUELLAS, CacheHuellas
+from motor.lote import MODOS_VALIDOS
+from motor.metricas import RegistroMetricas
+from motor.navegador import PERFIL_POR_DEFECTO, PERFILES_NAVEGADOR
+from motor.planificador import PETICIONES_POR_MINUTO, REINTENTOS, Planificador
+from motor.precios import normalizar_precios
+from motor.procesos import PROCESOS_POR_DEFECTO, ejecutar_en_procesos
+from motor.runner_async import MAX_PAGINAS_POR_DOMINIO, MAX_PAGINAS_TOTAL
+from motor.salida import EscritorStreaming, jsonl_a_fixture, leer_jsonl_unicos
+from tiendas import TIENDAS, cargar_adaptador, tienda_de_url
+
+# --- CLI ÚNICA ---
+# Todas las tiendas pasan por el mismo motor (tiendas/ + motor/).
+#   python scraper.py jumbo lider                      categorías por defecto
+#   python scraper.py --categoria https://www.jumbo.cl/...   la tienda sale del dominio
+#   python scraper.py --archivo trabajos.json --streaming --historial --salida salidas/
+#   python scraper.py jumbo --descubrir                  catálogo completo (motor/descubrimiento.py)
+#   python scraper.py jumbo lider --descubrir --procesos    un navegador por núcleo (motor/procesos.py)
+#   python scraper.py jumbo --conectar http://localhost:9222  navegador ya abierto (motor/navegador.py)
+#   python scraper.py jumbo --cargar-db db.sqlite3      upsert directo en la base de Django (motor/carga.py)
+
+
+def deduplicar(tienda, productos):
+    """Se queda con la última aparición de cada clave 'dedup' del adaptador (url_origen, ...)."""
+    claves = cargar_adaptador(tienda)['dedup']
+    unicos = {}
+    for producto in productos:
+        clave = tuple(producto.get(c) for c in claves)
+        unicos.pop(clave, None)
+        unicos[clave] = producto
+    return list(unicos.values())
+
+
+def serializar_resultados(resultados):
+    """Deduplica por tienda y pasa por el formatear del adaptador."""
+    salida = {}
+    for tienda, productos in resultados.items():
+        if not productos:
+            continue
+        adaptador = cargar_adaptador(tienda)
+        salida[tienda] = adaptador['formatear'](deduplicar(tienda, productos), MODEL_NAME, adaptador['super_id'])
+    return salida
+
+
+def ejecutar(trabajos, opciones, concurrencia, sync, al_terminar=None, procesos=1, **servicios):
+    """servicios: diario, planificador, metricas y huellas para el runner. procesos=1 corre aquí mismo."""
+    return ejecutar_en_procesos(trabajos, opciones, procesos, sync, concurrencia,
+                                al_terminar=al_terminar, **servicios)
+
+
+def guardar_en_memoria(trabajos, opciones, concurrencia, sync, directorio, historial,
+                       metricas=None, **servicios):
+    """Devuelve las rutas de los fixtures escritos."""
+    metricas = metricas or RegistroMetricas()
+    fixtures = []
+    resultados = ejecutar(trabajos, opciones, concurrencia, sync, metricas=metricas, **servicios)
+    with metricas.globales.fase("precios"):
+        resultados = {tienda: normalizar_precios(productos) for tienda, productos in resultados.items()}
+    with metricas.globales.fase("serializacion"):
+        for tienda, final_data in serializar_resultados(resultados).items():
+            nombre_archivo = os.path.join(directorio, cargar_adaptador(tienda)['archivo_salida'])
+            with open(nombre_archivo, 'w', encoding='utf-8') as f:
+                json.dump(final_data, f, indent=2, ensure_ascii=False)
+            fixtures.append(nombre_archivo)
+            print(f"✅ {tienda}: {len(final_data)} productos -> {nombre_archivo}")
+
+    if historial:
+        for tienda, productos in resultados.items():
+            if productos:
+                adaptador = cargar_adaptador(tienda)
+                guardar_delta(deduplicar(tienda, productos), adaptador['nombre'], adaptador['formatear'],
+                              MODEL_NAME, adaptador['super_id'], os.path.join(directorio, f"{tienda}_delta.json"))
+    return fixtures
+
+
+def guardar_streaming(trabajos, opciones, concurrencia, sync, directorio, historial,
+                      metricas=None, **servicios):
+    """Cada categoría va a {tienda}_.jsonl.gz al terminar; el fixture se arma al final."""
+    metricas = metricas or RegistroMetricas()
+    fixtures = []
+    escritores = {tienda: EscritorStreaming(os.path.join(directorio, f"{tienda}_.jsonl.gz"),
+                                            cargar_adaptador(tienda)['dedup'])
+                  for tienda in dict.fromkeys(t for t, _ in trabajos)}
+
+    def escribir(tienda, productos):
+        with metricas.globales.fase("precios"):
+            productos = normalizar_precios(productos)
+        with metricas.globales.fase("serializacion"):
+            escritores[tienda].escribir_todos(productos)
+
+    try:
+        ejecutar(trabajos, opciones, concurrencia, sync, al_terminar=escribir, metricas=metricas, **servicios)
+    finally:
+        for escritor in escritores.values():
+            escritor.cerrar()
+
+    for tienda, escritor in escritores.items():
+        if not escritor.escritos:
+            continue
+        adaptador = cargar_adaptador(tienda)
+        nombre_archivo = os.path.join(directorio, adaptador['archivo_salida'])
+        with metricas.globales.fase("serializacion"):
+            total = jsonl_a_fixture(escritor.ruta, nombre_archivo, adaptador['formatear'],
+                                    MODEL_NAME, adaptador['super_id'], claves_dedup=adaptador['dedup'])
+        fixtures.append(nombre_archivo)
+        print(f"✅ {tienda}: {total} productos ({escritor.duplicados} duplicados) -> {nombre_archivo}")
+        if historial:
+            guardar_delta(leer_jsonl_unicos(escritor.ruta, adaptador['dedup']), adaptador['nombre'],
+                          adaptador['formatear'], MODEL_NAME, adaptador['super_id'],
+                          os.path.join(directorio, f"{tienda}_delta.json"))
+    return fixtures
+
+
+def leer_trabajos(args, parser):
+    trabajos = [tuple(t) for t in (args.trabajo or [])]
+    try:
+        trabajos.extend((tienda_de_url(url), url) for url in (args.categoria or []))
+    except ValueError as e:
+        parser.error(str(e))
+    if args.archivo:
+        # Archivo JSON: [["jumbo", "https://..."], ["lider", "https://..."], ...]
+        with open(args.archivo, encoding='utf-8') as f:
+            trabajos.extend(tuple(t) for t in json.load(f))
+    # Tiendas nombradas sin categorías explícitas: todas las descubiertas o las por defecto
+    con_trabajo = {tienda for tienda, _ in trabajos}
+    for tienda in args.tiendas:
+        if tienda in con_trabajo:
+            continue
+        if args.descubrir:
+            categorias = descubrir_categorias(tienda, refrescar=args.refrescar_categorias)
+        else:
+            categorias = cargar_adaptador(tienda)['categorias']
+        trabajos.extend((tienda, url) for url in categorias)
+    # La misma categoría pedida dos veces se recorre una sola vez
+    return list(dict.fromkeys(trabajos))
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Scraper de supermercados: una o varias tiendas y categorías.")
+    parser.add_argument('tiendas', nargs='*', metavar='TIENDA',
+                        help=f"Tiendas a recorrer con sus categorías por defecto ({', '.join(TIENDAS)})")
+    parser.add_argument('--categoria', action='append', metavar='URL',
+                        help="URL de categoría; la tienda se deduce del dominio")
+    parser.add_argument('--trabajo', nargs=2, action='append', metavar=('TIENDA', 'URL'))
+    parser.add_argument('--archivo', help="JSON con la lista de [tienda, url]")
+    parser.add_argument('--descubrir', action='store_true',
+                        help="Las tiendas nombradas recorren todas sus categorías (caché con TTL)")
+    parser.add_argument('--refrescar-categorias', action='store_true',
+                        help="Con --descubrir, ignora la caché de categorías")
+
+    salida = parser.add_argument_group("salida")
+    salida.add_argument('--salida', default=".", help="Directorio de los fixtures")
+    salida.add_argument('--streaming', action='store_true',
+                        help="Escribe cada categoría a {tienda}_.jsonl.gz al terminar (memoria plana)")
+    salida.add_argument('--diario', nargs='?', const=RUTA_DIARIO, metavar='RUTA',
+                        help=f"Guarda el avance por categoría y reanuda una corrida cortada (por defecto {RUTA_DIARIO})")
+    salida.add_argument('--huellas', nargs='?', const=RUTA_HUELLAS, metavar='RUTA',
+                        help=f"Reutiliza los productos de las categorías cuya primera página no cambió "
+                             f"(por defecto {RUTA_HUELLAS})")
+    salida.add_argument('--refresco-forzado', type=float, default=REFRESCO_FORZADO_HORAS, metavar='HORAS',
+                        help="Con --huellas, extrae completa igual una categoría más vieja que esto")
+    salida.add_argument('--cargar-db', metavar='DESTINO',
+                        help="Carga los fixtures directo en la base de Django (ruta SQLite o postgresql://...)")
+    salida.add_argument('--metricas', metavar='RUTA',
+                        help="Exporta tiempos, llamadas y bytes por fase (.prom: Prometheus, si no JSON)")
+    salida.add_argument('--historial', action='store_true',
+                        help="Registra la corrida en el historial SQLite y escribe {tienda}_delta.json")
+
+    motor = parser.add_argument_group("motor")
+    motor.add_argument('--sync', action='store_true', help="Trabajos en serie con la API sync")
+    motor.add_argument('--procesos', type=int, nargs='?', default=1, const=PROCESOS_POR_DEFECTO,
+                       help=f"Reparte los trabajos entre N procesos, cada uno con su navegador "
+                            f"(sin N: {PROCESOS_POR_DEFECTO}, uno por núcleo)")
+    motor.add_argument('--por-dominio', type=int, default=MAX_PAGINAS_POR_DOMINIO)
+    motor.add_argument('--total', type=int, default=MAX_PAGINAS_TOTAL)
+    motor.add_argument('--por-minuto', type=float, default=PETICIONES_POR_MINUTO,
+                       help="Navegaciones por minuto por dominio")
+    motor.add_argument('--reintentos', type=int, default=REINTENTOS, help="Reintentos ante timeouts")
+    motor.add_argument('--visible', action='store_true', help="Abre el navegador con ventana")
+    motor.add_argument('--perfil', default=PERFIL_POR_DEFECTO, choices=sorted(PERFILES_NAVEGADOR),
+                       help="Flags y viewport del navegador (motor/navegador.py)")
+    motor.add_argument('--conectar', metavar='URL',
+                       help="Usa un navegador ya abierto: http://host:9222 (CDP) o ws://... (servidor Playwright)")
+    motor.add_argument('--modo', default="lote", choices=MODOS_VALIDOS, help="Lectura de tarjetas (locator solo con --sync)")
+    motor.add_argument('--comparar', action='store_true', help="Ejecuta todos los modos e imprime los tiempos (solo con --sync)")
+    motor.add_argument('--sin-captura', action='store_true', help="No usa la API capturada, solo el DOM")
+    motor.add_argument('--sin-bloqueo', action='store_true', help="No bloquea imágenes, fuentes ni trackers")
+    motor.add_argument('--sin-cosecha', action='store_true',
+                       help="Lee las tarjetas al final del scroll y no paso a paso")
+    motor.add_argument('--sin-sesion', action='store_true', help="No reutiliza cookies/comuna guardadas")
+    motor.add_argument('--cache-red', choices=MODOS_CACHE_RED,
+                       help="grabar: guarda cada categoría en un HAR; reproducir: la sirve desde ahí "
+                            "(sin tocar la tienda) y graba las que falten")
+    motor.add_argument('--cache-red-mb', type=int, default=MAX_MB_CACHE_RED,
+                       help="Tope de la caché de red; se borran primero las entradas usadas hace más tiempo")
+    return parser
+
+
+def main(argv=None):
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    # nargs='*' con choices rechaza la lista vacía en algunas versiones de argparse
+    desconocidas = [t for t in args.tiendas if t not in TIENDAS]
+    if desconocidas:
+        parser.error(f"Tiendas desconocidas: {', '.join(desconocidas)} (disponibles: {', '.join(TIENDAS)})")
+    # Los lectores por locator de los adaptadores usan la API sync; el runner async solo lee html o lote
+    if not args.sync and (args.modo == "locator" or args.comparar):
+        parser.error("--modo locator y --comparar requieren --sync")
+
+    trabajos = leer_trabajos(args, parser)
+    if not trabajos:
+        parser.error("No hay trabajos: indica tiendas, --categoria, --trabajo o --archivo")
+
+    opciones = {
+        'headless': not args.visible,
+        'perfil': args.perfil,
+        'conectar': args.conectar,
+        'modo': args.modo,
+        'comparar': args.comparar,
+        'capturar_red': not args.sin_captura,
+        'bloquear_recursos': not args.sin_bloqueo,
+        'reutilizar_sesion': not args.sin_sesion,
+        'cosechar': not args.sin_cosecha,
+        'cache_red': args.cache_red,
+        'cache_red_mb': args.cache_red_mb,
+    }
+    concurrencia = {'max_por_dominio': args.por_dominio, 'max_total': args.total}
+    os.makedirs(args.salida, exist_ok=True)
+
+    start_time = time.time()
+    guardar = guardar_streaming if args.streaming else guardar_en_memoria
+    diario = DiarioTrabajos(args.diario) if args.diario else None
+    huellas = CacheHuellas(args.huellas, args.refresco_forzado) if args.huellas else None
+    planificador = Planificador(args.por_minuto, args.reintentos)
+    metricas = RegistroMetricas()
+    fixtures = []
+    try:
+        fixtures = guardar(trabajos, opciones, concurrencia, args.sync, args.salida, args.historial,
+                procesos=args.procesos, diario=diario, planificador=planificador, metricas=metricas,
+                huellas=huellas)
+    finally:
+        if diario:
+            diario.cerrar(trabajos)
+        if huellas:
+            huellas.cerrar()
+        planificador.imprimir_resumen()
+        planificador.guardar(os.path.join(args.salida, "resultados_corrida.json"))
+        metricas.imprimir_resumen()
+        if args.metricas:
+            metricas.guardar(args.metricas)
+    if args.cargar_db and fixtures:
+        conexion = conectar_db(args.cargar_db)
+        try:
+            for ruta in fixtures:
+                cargar_fixture(conexion, ruta)
+        finally:
+            conexion.close()
+    print(f"Tiempo: {round(time.time() - start_time, 2)}s")
+
+    fallidos = planificador.fallidos()
+    if fallidos:
+        print(f"⚠️ {len(fallidos)} de {len(planificador.resultados)} categorías sin productos "
+              f"(detalle en resultados_corrida.json)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import json
+import sqlite3
+import sys
+
+from motor import carga
+from motor.fixture import MODEL_NAME
+
+
+def objeto(url, precio):
+    return {"model": MODEL_NAME, "pk": 1, "fields": {
+        "nombre": "Arroz", "marca": "Tucapel", "tipo": "Despensa", "descripcion": "Arroz grado 1 1 kg",
+        "supermercado": 2, "precio": precio, "moneda": "CLP", "imagen_url": "",
+        "producto_url": url, "disponible": True, "fecha_actualizacion": "2026-01-01T00:00:00Z",
+    }}
+
+
+def cargar(monkeypatch, db, fixture, objetos, *extra):
+    fixture.write_text(json.dumps(objetos), encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["carga", str(fixture), "--db", str(db), *extra])
+    carga.main()
+
+
+def filas(db):
+    conexion = sqlite3.connect(db)
+    try:
+        return dict(conexion.execute(f"SELECT producto_url, precio FROM {carga.TABLA_PRODUCTOS}"))
+    finally:
+        conexion.close()
+
+
+def test_cargar_dos_veces_actualiza_sin_duplicar(tmp_path, monkeypatch):
+    db, fixture = tmp_path / "prueba.sqlite3", tmp_path / "unimarc_arroz_final.json"
+    cargar(monkeypatch, db, fixture, [objeto("https://x/1", 990), objeto("https://x/2", 1990)], "--crear-tabla")
+    assert filas(db) == {"https://x/1": 990, "https://x/2": 1990}
+
+    cargar(monkeypatch, db, fixture, [objeto("https://x/1", 890), objeto("https://x/2", 1990)])
+    assert filas(db) == {"https://x/1": 890, "https://x/2": 1990}
+
+
+def test_cargar_filas_cuenta_insertados_actualizados_y_sin_cambios(tmp_path):
+    conexion = sqlite3.connect(tmp_path / "prueba.sqlite3")
+    try:
+        carga.crear_tabla_sqlite(conexion)
+        primera = carga.cargar_filas(conexion, carga.filas_desde_fixture(
+            [objeto("https://x/1", 990), objeto("https://x/2", 1990)]))
+        segunda = carga.cargar_filas(conexion, carga.filas_desde_fixture(
+            [objeto("https://x/1", 890), objeto("https://x/2", 1990), objeto("https://x/3", 500)]))
+    finally:
+        conexion.close()
+    assert primera == {'insertados': 2, 'actualizados': 0, 'sin_cambios': 0}
+    assert segunda == {'insertados': 1, 'actualizados': 1, 'sin_cambios': 1}
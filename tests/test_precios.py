@@ -0,0 +1,67 @@
+import pytest
+
+from motor.precios import normalizar_precios
+
+
+def normalizar(texto):
+    producto = {'supermercado': "Santa Isabel", 'url_origen': "https://x/1", 'precio_texto': texto}
+    resultado = normalizar_precios([producto], ruta_historial=None)
+    assert len(resultado) == 1, f"se descartó {texto!r}"
+    return resultado[0]
+
+
+@pytest.mark.parametrize("texto, precio, unidad", [
+    ("$6.980 x kg", 6980, "kg"),
+    ("$2.190 x lt", 2190, "lt"),
+    ("$990 x kilo", 990, "kg"),
+    ("$1.990 el kg", 1990, "kg"),
+    ("$ 1.990 x 100 g", 1990, "100 g"),
+])
+def test_solo_precio_por_unidad_no_se_descarta(texto, precio, unidad):
+    p = normalizar(texto)
+    assert p['precio_clp'] == precio
+    assert p['precio_unidad'] == precio
+    assert p['unidad_precio'] == unidad
+    assert p['en_oferta'] is False
+
+
+def test_precio_por_unidad_no_cuenta_como_normal():
+    p = normalizar("$3.990 $4.590\n$797 x un")
+    assert (p['precio_clp'], p['precio_regular']) == (3990, 4590)
+    assert (p['precio_unidad'], p['unidad_precio']) == (797, "un")
+    assert p['en_oferta'] is True
+
+
+def test_unidad_antes_del_monto():
+    p = normalizar("$2.990\nPrecio x kg $5.980")
+    assert (p['precio_clp'], p['precio_regular']) == (2990, 2990)
+    assert (p['precio_unidad'], p['unidad_precio']) == (5980, "kg")
+    assert p['en_oferta'] is False
+
+
+def test_cada_unidad_y_promocion():
+    assert normalizar("$1.500 c/u")['unidad_precio'] == "un"
+    assert normalizar("2 x $5.000\n$2.990")['precio_clp'] == 2990
+
+
+@pytest.mark.parametrize("texto, precio, regular, unidad, precio_unidad", [
+    ("$1.990\nx kg $3.980", 1990, 1990, "kg", 3980),
+    ("$990\n/kg $1.980", 990, 990, "kg", 1980),
+    ("$2.190\nel kg $4.380", 2190, 2190, "kg", 4380),
+    ("$1.990\n$2.490\nx kg $3.980", 1990, 2490, "kg", 3980),
+])
+def test_unidad_en_la_linea_siguiente_es_del_monto_que_sigue(texto, precio, regular, unidad, precio_unidad):
+    p = normalizar(texto)
+    assert (p['precio_clp'], p['precio_regular']) == (precio, regular)
+    assert (p['precio_unidad'], p['unidad_precio']) == (precio_unidad, unidad)
+    assert p['en_oferta'] is (regular > precio)
+
+
+def test_tamano_de_pack_no_es_unidad():
+    p = normalizar("Pack x 6 un $3.990")
+    assert p['precio_clp'] == 3990
+    assert p['unidad_precio'] is None
+
+
+def test_coma_de_miles():
+    assert normalizar("$1,290")['precio_clp'] == 1290
@@ -0,0 +1,86 @@
+import importlib
+from functools import lru_cache, partial
+from urllib.parse import urlparse
+
+from motor.fixture import TIPO_POR_DEFECTO, formatear_a_django_serializado
+
+# --- ADAPTADORES DE TIENDA ---
+# Cada módulo de este paquete declara un dict ADAPTADOR con lo que es propio
+# de la tienda: URL base, categorías, selectores, lectura de tarjetas,
+# pasos de preparación (cookies, comuna), parseo de precio y ajustes del
+# scroll. Todo lo demás (navegador, bloqueo, captura de red, sesión, lotes,
+# formato del fixture) lo hace el motor una sola vez para todas.
+#
+# Claves del ADAPTADOR:
+#   nombre, super_id, url_base, categorias      identidad y URLs por defecto
+#   dominios                                    otros hosts de la tienda, además del de url_base
+#   selector_tarjetas, espera_tarjetas_ms       cuándo hay catálogo en pantalla
+#   ajustes_scroll                              paginación: scroll / botón "Ver más"
+#   js_lote + args_lote, campos_html,           las tres formas de leer tarjetas
+#   leer_locator                                (lote, html y locator)
+#   productos_desde_registros(registros, url)   registros crudos -> productos
+#   patrones_api + productos_desde_json         captura de la API del catálogo
+#   reglas_bloqueo, preparacion, sesion         ver motor/bloqueo, preparacion, sesion
+#   descubrimiento                              árbol de categorías (motor/descubrimiento.py)
+#   campos_huella                               campos de tarjeta para la huella (motor/huellas.py)
+#   cosecha                                     id y campos requeridos de la tarjeta para leer durante el scroll (motor/cosecha.py)
+#   archivo_salida                              nombre del fixture (por defecto {tienda}_.json)
+#   user_agent, viewport, dedup, tipo
+
+TIENDAS = {
+    'jumbo': 'tiendas.jumbo',
+    'lider': 'tiendas.lider',
+    'santa': 'tiendas.santa',
+    'unimarc': 'tiendas.unimarc',
+}
+
+CLAVES_OBLIGATORIAS = ('nombre', 'super_id', 'url_base', 'categorias', 'selector_tarjetas',
+                       'js_lote', 'productos_desde_registros')
+
+VALORES_POR_DEFECTO = {
+    'user_agent': None,
+    'viewport': None,
+    'espera_tarjetas_ms': 30000,
+    'ajustes_scroll': {},
+    'args_lote': None,
+    'campos_html': None,
+    'leer_locator': None,
+    'patrones_api': [],
+    'productos_desde_json': None,
+    'reglas_bloqueo': {},
+    'preparacion': None,
+    'sesion': None,
+    'descubrimiento': None,
+    'campos_huella': None,
+    'cosecha': None,
+    'dedup': ['url_origen'],
+    'tipo': TIPO_POR_DEFECTO,
+    'archivo_salida': None,
+    'dominios': (),
+}
+
+
+@lru_cache(maxsize=None)
+def cargar_adaptador(tienda):
+    """Devuelve el ADAPTADOR de la tienda con los valores por defecto completados."""
+    if tienda not in TIENDAS:
+        raise ValueError(f"Tienda desconocida: {tienda} (opciones: {', '.join(TIENDAS)})")
+    adaptador = dict(VALORES_POR_DEFECTO, **importlib.import_module(TIENDAS[tienda]).ADAPTADOR)
+    faltan = [clave for clave in CLAVES_OBLIGATORIAS if clave not in adaptador]
+    if faltan:
+        raise ValueError(f"Al adaptador de {tienda} le faltan: {', '.join(faltan)}")
+    adaptador['clave'] = tienda
+    adaptador['archivo_salida'] = adaptador['archivo_salida'] or f"{tienda}_.json"
+    adaptador.setdefault('formatear', partial(formatear_a_django_serializado,
+                                              supermercado=adaptador['nombre'], tipo=adaptador['tipo']))
+    return adaptador
+
+
+def tienda_de_url(url):
+    """Clave de la tienda cuyo url_base (o alguno de sus dominios) comparte host con la URL."""
+    host = urlparse(url).netloc
+    for tienda in TIENDAS:
+        adaptador = cargar_adaptador(tienda)
+        if host == urlparse(adaptador['url_base']).netloc or host in adaptador['dominios']:
+            return tienda
+    raise ValueError(f"Ninguna tienda corresponde a {url}")
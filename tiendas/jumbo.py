@@ -0,0 +1,194 @@
+from datetime import datetime
+
+from motor.captura_red import buscar_objetos
+
+# --- CONFIGURACIÓN JUMBO ---
+SUPERMERCADO_ID_JUMBO = 2
+URL_BASE_JUMBO = "https://www.jumbo.cl"
+URL_OBJETIVO_JUMBO = "https://www.jumbo.cl/lacteos-huevos-y-congelados/huevos"
+NOMBRE_SUPER_JUMBO = "Jumbo"
+
+USER_AGENT_PERSONALIZADO = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+SELECTOR_PRODUCTO_CONTAINER = 'div[data-cnstrc-item-id]'
+SELECTOR_MARCA_JUMBO = 'div.product-card-brand, .brand-name'
+
+# --- CAPTURA DE RED ---
+# Las tarjetas de Jumbo vienen del buscador de Constructor.io (data-cnstrc-*).
+PATRONES_API_JUMBO = ['cnstrc.com/search', 'cnstrc.com/browse']
+
+# --- DESCUBRIMIENTO DE CATEGORÍAS ---
+# Categorías: /departamento[/categoria[/subcategoria]]; los productos terminan en /p
+DESCUBRIMIENTO_JUMBO = {
+    'fuentes': [
+        {'tipo': 'sitemap', 'url': URL_BASE_JUMBO + "/sitemap.xml", 'incluir': 'categor'},
+        {'tipo': 'menu', 'url': URL_BASE_JUMBO, 'abrir': 'button:has-text("Categorías")',
+         'enlaces': 'nav a[href], [class*="menu"] a[href]'},
+    ],
+    'patron': r'^/(?!(?:login|mi-cuenta|ayuda|busqueda|search|checkout|carro|tiendas|locales|terminos)(?:/|$))'
+              r'(?P<ruta>[a-z0-9-]+(?:/[a-z0-9-]+){0,2})(?<!/p)$',
+}
+
+# --- BLOQUEO DE RECURSOS ---
+# El botón "Ver más" dispara XHR a Constructor.io: siempre permitido
+REGLAS_BLOQUEO_JUMBO = {
+    'permitir': ['cnstrc.com'],
+}
+
+# Se ejecuta una sola vez dentro de la página y devuelve registros planos
+JS_TARJETAS_JUMBO = """
+({contenedor, marca}) => Array.from(document.querySelectorAll(contenedor), (el) => {
+    const marcaEl = el.querySelector(marca);
+    const enlace = el.querySelector('a');
+    const img = el.querySelector('img');
+    return {
+        nombre: el.getAttribute('data-cnstrc-item-name'),
+        precio: el.getAttribute('data-cnstrc-item-price'),
+        item_id: el.getAttribute('data-cnstrc-item-id'),
+        marca: marcaEl ? marcaEl.innerText.trim() : null,
+        href: enlace ? enlace.getAttribute('href') : null,
+        imagen: img ? img.getAttribute('src') : null,
+    };
+})
+"""
+ARGS_TARJETAS_JUMBO = {
+    'contenedor': SELECTOR_PRODUCTO_CONTAINER,
+    'marca': SELECTOR_MARCA_JUMBO,
+}
+
+# Los mismos campos, declarados para el parser de HTML estático (motor/html_estatico.py)
+CAMPOS_HTML_JUMBO = {
+    'contenedor': SELECTOR_PRODUCTO_CONTAINER,
+    'campos': {
+        'nombre': ('', '@data-cnstrc-item-name'),
+        'precio': ('', '@data-cnstrc-item-price'),
+        'item_id': ('', '@data-cnstrc-item-id'),
+        'marca': (SELECTOR_MARCA_JUMBO, 'texto'),
+        'href': ('a', '@href'),
+        'imagen': ('img', '@src'),
+    },
+}
+
+# --- PAGINACIÓN ---
+# Scroll + botón "Ver más productos"
+AJUSTES_SCROLL_JUMBO = {
+    'selector_boton': 'button:has-text("Ver más productos"), button.search-results-button',
+    'plazo_total': 120,
+    'espera_max_paso': 6,
+    'pasos_sin_cambio': 2,
+    'rebote': 700,
+}
+
+# --- LECTURA DE TARJETAS ---
+def leer_tarjetas_locator(page):
+    registros = []
+    for contenedor in page.locator(SELECTOR_PRODUCTO_CONTAINER).all():
+        try:
+            marca = None
+            marca_elem = contenedor.locator(SELECTOR_MARCA_JUMBO).first
+            if marca_elem.count() > 0:
+                marca = marca_elem.inner_text().strip()
+
+            img_tag = contenedor.locator('img').first
+            registros.append({
+                'nombre': contenedor.get_attribute("data-cnstrc-item-name"),
+                'precio': contenedor.get_attribute("data-cnstrc-item-price"),
+                'item_id': contenedor.get_attribute("data-cnstrc-item-id"),
+                'marca': marca,
+                'href': contenedor.locator('a').first.get_attribute('href'),
+                'imagen': img_tag.get_attribute('src') if img_tag.count() > 0 else None,
+            })
+        except Exception:
+            continue
+    return registros
+
+def construir_producto(registro, url):
+    """Convierte un registro crudo de tarjeta en el diccionario de producto."""
+    nombre = registro.get('nombre')
+    precio_str = registro.get('precio')
+
+    if not nombre or not precio_str:
+        return None
+
+    precio_entero = int(float(precio_str))
+
+    # Filtro de seguridad
+    if precio_entero <= 0:
+        return None
+
+    # Inferencia simple desde el nombre si la tarjeta no trae marca
+    marca = registro.get('marca') or nombre.split(" ")[0]
+
+    href = registro.get('href')
+    url_producto = URL_BASE_JUMBO + href if href and not href.startswith('http') else (href or url)
+
+    return {
+        'supermercado': NOMBRE_SUPER_JUMBO,
+        'nombre': nombre,
+        'marca': marca,
+        'nombre_corto': nombre,
+        'precio_clp': precio_entero,
+        'url_origen': url_producto,
+        'imagen_url': registro.get('imagen') or "",
+        'disponible': True, # Si aparece en el listado suele estar disponible
+        'fecha_actualizacion': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+def productos_desde_registros(registros, url):
+    productos = []
+    for registro in registros:
+        try:
+            producto = construir_producto(registro, url)
+            if producto:
+                productos.append(producto)
+        except Exception:
+            continue
+    return productos
+
+# --- LECTURA DESDE LA API ---
+def productos_desde_json(payload, url):
+    """Arma los productos desde los resultados de Constructor.io (value + data)."""
+    productos = []
+    resultados = buscar_objetos(
+        payload,
+        lambda obj: 'value' in obj and isinstance(obj.get('data'), dict) and 'id' in obj['data']
+    )
+    for item in resultados:
+        data = item['data']
+        try:
+            producto = construir_producto({
+                'nombre': item.get('value'),
+                'precio': data.get('price'),
+                'item_id': data.get('id'),
+                'marca': data.get('brand'),
+                'href': data.get('url'),
+                'imagen': data.get('image_url'),
+            }, url)
+        except (TypeError, ValueError):
+            continue
+        if producto:
+            productos.append(producto)
+    return productos
+
+ADAPTADOR = {
+    'nombre': NOMBRE_SUPER_JUMBO,
+    'super_id': SUPERMERCADO_ID_JUMBO,
+    'url_base': URL_BASE_JUMBO,
+    'categorias': [URL_OBJETIVO_JUMBO],
+    'descubrimiento': DESCUBRIMIENTO_JUMBO,
+    'campos_huella': ['item_id', 'precio'],
+    'cosecha': {'campo_id': 'item_id'},
+    'user_agent': USER_AGENT_PERSONALIZADO,
+    'viewport': {'width': 1920, 'height': 1080},
+    'selector_tarjetas': SELECTOR_PRODUCTO_CONTAINER,
+    'ajustes_scroll': AJUSTES_SCROLL_JUMBO,
+    'js_lote': JS_TARJETAS_JUMBO,
+    'args_lote': ARGS_TARJETAS_JUMBO,
+    'campos_html': CAMPOS_HTML_JUMBO,
+    'leer_locator': leer_tarjetas_locator,
+    'productos_desde_registros': productos_desde_registros,
+    'patrones_api': PATRONES_API_JUMBO,
+    'productos_desde_json': productos_desde_json,
+    'reglas_bloqueo': REGLAS_BLOQUEO_JUMBO,
+    'dedup': ['url_origen'],
+}
@@ -0,0 +1,205 @@
+from datetime import datetime
+
+# --- CONFIGURACIÓN LIDER ---
+URL_BASE_LIDER = "https://super.lider.cl"
+URL_OBJETIVO_LIDER = URL_BASE_LIDER + "/browse/despensa/conservas/46589040_33283038"
+NOMBRE_SUPER_LIDER = "Lider Supermercado"
+SUPERMERCADO_ID_LIDER = 1
+
+#  CONFIGURACIÓN ANTI-BLOQUEO
+USER_AGENT_PERSONALIZADO = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Selectores
+SELECTOR_PRODUCTO_CONTAINER = 'li[data-item-id], div[data-item-id]'
+SELECTOR_MARCA_LIDER = 'div.mb1.mt2.b.f6.black'
+SELECTOR_NOMBRE_LIDER = 'span.w_q67L, span[role="heading"]'
+SELECTOR_PRECIO_LIDER = 'span[data-automation-id="product-price"], div[data-automation-id="product-price"]'
+SELECTOR_IMAGEN_LIDER = 'img'
+
+# Selectores Ubicación
+SELECTOR_MODAL_OPENER = 'div[data-testid="location-banner"]'
+SELECTOR_INPUT_UBICACION = 'input[placeholder="Buscar Comuna"]'
+SELECTOR_RESULTADO_UBICACION = 'div[data-testid="location-list"] > button'
+SELECTOR_BOTON_CERRAR_COOKIES = 'button:has-text("Aceptar todas las cookies")'
+COMUNA_LIDER = "Independencia"
+
+# --- DESCUBRIMIENTO DE CATEGORÍAS ---
+# /browse/<departamento>/<categoria>/<id>_<id>: la jerarquía está en el path, no en el id
+DESCUBRIMIENTO_LIDER = {
+    'fuentes': [
+        {'tipo': 'sitemap', 'url': URL_BASE_LIDER + "/sitemap.xml", 'incluir': 'browse'},
+        {'tipo': 'menu', 'url': URL_BASE_LIDER, 'abrir': 'button:has-text("Departamentos")',
+         'enlaces': 'a[href*="/browse/"]'},
+    ],
+    'patron': r'^/browse/(?P<ruta>[^?#]+?)/\d+(?:_\d+)*$',
+}
+
+# --- BLOQUEO DE RECURSOS ---
+# Imágenes, fuentes, media y trackers no se descargan (solo leemos el src / data-src).
+# El modal de comuna consulta la API de Lider: siempre permitida.
+REGLAS_BLOQUEO_LIDER = {
+    'permitir': ['/orchestra/', 'graphql', 'location'],
+}
+
+# Se ejecuta una sola vez dentro de la página y devuelve registros planos
+JS_TARJETAS_LIDER = """
+({contenedor, marca, nombre, precio, imagen}) => Array.from(document.querySelectorAll(contenedor), (el) => {
+    const texto = (sel) => {
+        const nodo = el.querySelector(sel);
+        return nodo ? nodo.innerText : null;
+    };
+    const enlace = el.querySelector('a');
+    const img = el.querySelector(imagen);
+    let src = img ? img.getAttribute('src') : null;
+    if (img && (!src || src.includes('data:image'))) {
+        src = img.getAttribute('data-src');
+    }
+    return {
+        texto: el.innerText,
+        marca: texto(marca),
+        nombre: texto(nombre),
+        precio: texto(precio),
+        href: enlace ? enlace.getAttribute('href') : null,
+        imagen: src,
+    };
+})
+"""
+ARGS_TARJETAS_LIDER = {
+    'contenedor': SELECTOR_PRODUCTO_CONTAINER,
+    'marca': SELECTOR_MARCA_LIDER,
+    'nombre': SELECTOR_NOMBRE_LIDER,
+    'precio': SELECTOR_PRECIO_LIDER,
+    'imagen': SELECTOR_IMAGEN_LIDER,
+}
+
+# Los mismos campos, declarados para el parser de HTML estático (motor/html_estatico.py)
+CAMPOS_HTML_LIDER = {
+    'contenedor': SELECTOR_PRODUCTO_CONTAINER,
+    'campos': {
+        'texto': ('', 'texto'),
+        'marca': (SELECTOR_MARCA_LIDER, 'texto'),
+        'nombre': (SELECTOR_NOMBRE_LIDER, 'texto'),
+        'precio': (SELECTOR_PRECIO_LIDER, 'texto'),
+        'href': ('a', '@href'),
+        'imagen': [(SELECTOR_IMAGEN_LIDER, '@src'), (SELECTOR_IMAGEN_LIDER, '@data-src')],
+    },
+}
+
+# --- PREPARACIÓN: COOKIES Y COMUNA ---
+# Se aceptan las cookies; si los precios no aparecen se elige la comuna.
+# Con una sesión vigente los precios aparecen sin banner ni modal de comuna.
+PREPARACION_LIDER = {
+    'pasos': [
+        {'accion': 'clic', 'selector': SELECTOR_BOTON_CERRAR_COOKIES, 'timeout': 4000, 'opcional': True},
+    ],
+    'listo': {'selector': SELECTOR_PRECIO_LIDER, 'timeout': 5000},
+    'si_no_listo': [
+        {'accion': 'esperar', 'selector': SELECTOR_MODAL_OPENER, 'timeout': 10000},
+        {'accion': 'clic', 'selector': SELECTOR_MODAL_OPENER},
+        {'accion': 'llenar', 'selector': SELECTOR_INPUT_UBICACION, 'texto': COMUNA_LIDER},
+        {'accion': 'clic', 'selector': SELECTOR_RESULTADO_UBICACION},
+        {'accion': 'red_inactiva', 'timeout': 15000},
+        {'accion': 'esperar', 'selector': SELECTOR_PRECIO_LIDER, 'timeout': 10000},
+    ],
+    'sesion_valida': {'presente': SELECTOR_PRECIO_LIDER, 'timeout': 8000,
+                      'ausente': SELECTOR_BOTON_CERRAR_COOKIES},
+}
+
+# --- PAGINACIÓN ---
+# Scroll infinito sin botón
+AJUSTES_SCROLL_LIDER = {
+    'plazo_total': 90,
+    'espera_max_paso': 5,
+    'pasos_sin_cambio': 2,
+    'rebote': 500,
+}
+
+# --- LECTURA DE TARJETAS ---
+def leer_tarjetas_locator(page):
+    registros = []
+    for contenedor in page.locator(SELECTOR_PRODUCTO_CONTAINER).all():
+        try:
+            marca_loc = contenedor.locator(SELECTOR_MARCA_LIDER).first
+            nombre_loc = contenedor.locator(SELECTOR_NOMBRE_LIDER).first
+            precio_loc = contenedor.locator(SELECTOR_PRECIO_LIDER).first
+            enlace_tag = contenedor.locator('a').first
+
+            img_tag = contenedor.locator(SELECTOR_IMAGEN_LIDER).first
+            imagen_url = None
+            if img_tag.count():
+                imagen_url = img_tag.get_attribute('src')
+                if not imagen_url or "data:image" in imagen_url:
+                    imagen_url = img_tag.get_attribute('data-src')
+
+            registros.append({
+                'texto': contenedor.inner_text(),
+                'marca': marca_loc.inner_text() if marca_loc.count() else None,
+                'nombre': nombre_loc.inner_text() if nombre_loc.count() else None,
+                'precio': precio_loc.inner_text() if precio_loc.count() else None,
+                'href': enlace_tag.get_attribute('href') if enlace_tag.count() else None,
+                'imagen': imagen_url,
+            })
+        except: continue
+    return registros
+
+def construir_producto(registro, url):
+    """Convierte un registro crudo de tarjeta en el diccionario de producto."""
+    disponible = False if "Agotado" in (registro.get('texto') or "") else True
+
+    marca = registro['marca'].strip() if registro.get('marca') is not None else "Genérico"
+    nombre = registro['nombre'].strip() if registro.get('nombre') is not None else "Sin nombre"
+    # El texto crudo ("$1.290", "$1.290 $1.590", "$6.450 x kg") lo parsea motor/precios.py
+    precio_texto = registro.get('precio')
+
+    href = registro.get('href')
+    url_origen = URL_BASE_LIDER + href if href else url
+
+    if not precio_texto and nombre == "Sin nombre":
+        return None
+
+    return {
+        'supermercado': NOMBRE_SUPER_LIDER,
+        'nombre': f"{marca} - {nombre}",
+        'marca': marca,
+        'nombre_corto': nombre,
+        'precio_texto': precio_texto,
+        'url_origen': url_origen,
+        'imagen_url': registro.get('imagen'),
+        'disponible': disponible,
+        'fecha_actualizacion': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+def productos_desde_registros(registros, url):
+    productos = []
+    for registro in registros:
+        try:
+            producto = construir_producto(registro, url)
+            if producto:
+                productos.append(producto)
+        except: continue
+    return productos
+
+ADAPTADOR = {
+    'nombre': NOMBRE_SUPER_LIDER,
+    'super_id': SUPERMERCADO_ID_LIDER,
+    'url_base': URL_BASE_LIDER,
+    'dominios': ('www.lider.cl', 'lider.cl'),
+    'categorias': [URL_OBJETIVO_LIDER],
+    'descubrimiento': DESCUBRIMIENTO_LIDER,
+    'campos_huella': ['href', 'precio'],
+    'cosecha': {'campo_id': 'href'},
+    'user_agent': USER_AGENT_PERSONALIZADO,
+    'viewport': {'width': 1366, 'height': 768},
+    'selector_tarjetas': SELECTOR_PRODUCTO_CONTAINER,
+    'espera_tarjetas_ms': 20000,
+    'ajustes_scroll': AJUSTES_SCROLL_LIDER,
+    'js_lote': JS_TARJETAS_LIDER,
+    'args_lote': ARGS_TARJETAS_LIDER,
+    'campos_html': CAMPOS_HTML_LIDER,
+    'leer_locator': leer_tarjetas_locator,
+    'productos_desde_registros': productos_desde_registros,
+    'reglas_bloqueo': REGLAS_BLOQUEO_LIDER,
+    'preparacion': PREPARACION_LIDER,
+    'sesion': ('lider', COMUNA_LIDER),
+    'dedup': ['url_origen'],
+}
@@ -0,0 +1,211 @@
+from datetime import datetime
+
+from motor.captura_red import buscar_objetos, precio_a_entero
+
+# --- CONFIGURACIÓN DEL SITIO WEB  ---
+URL_BASE = "https://www.santaisabel.cl"
+# --- Aqui se coloca el URL despues del .cl/ ---
+URL_OBJETIVO = URL_BASE + "/carnes-y-pescados/vacuno"
+NOMBRE_SUPER = "Santa Isabel"
+SUPERMERCADO_ID = 4
+
+SELECTOR_PRODUCTO_CLAVE = 'a.product-card'
+SELECTOR_ACEPTAR_COOKIES = 'button:has-text("Aceptar todas las cookies")'
+SELECTOR_NOMBRE = 'p.product-card-name'
+SELECTOR_MARCA = 'p.product-card-brand'
+SELECTOR_PRECIOS = 'div.product-card-prices'
+
+# --- CAPTURA DE RED ---
+# El catálogo llega como JSON estilo VTEX (productName, items, commertialOffer).
+PATRONES_API_SANTA = ['ecomm.cencosud.com', '/api/catalog_system/']
+
+# --- DESCUBRIMIENTO DE CATEGORÍAS ---
+# Sitio VTEX: el árbol sale entero de la API pública de categorías
+DESCUBRIMIENTO_SANTA = {
+    'fuentes': [
+        {'tipo': 'api', 'url': URL_BASE + "/api/catalog_system/pub/category/tree/3"},
+        {'tipo': 'menu', 'url': URL_BASE, 'abrir': 'button:has-text("Categorías")',
+         'enlaces': 'nav a[href], [class*="menu"] a[href]'},
+    ],
+    'patron': r'^/(?!(?:login|mi-cuenta|ayuda|busqueda|search|checkout|carro|tiendas|locales|terminos)(?:/|$))'
+              r'(?P<ruta>[a-z0-9-]+(?:/[a-z0-9-]+){0,2})(?<!/p)$',
+}
+
+# --- BLOQUEO DE RECURSOS ---
+REGLAS_BLOQUEO_SANTA = {
+    'permitir': PATRONES_API_SANTA,
+}
+
+# Se ejecuta una sola vez dentro de la página y devuelve registros planos
+JS_TARJETAS_SANTA = """
+({contenedor, nombre, marca, precios}) => Array.from(document.querySelectorAll(contenedor), (el) => {
+    const texto = (sel) => {
+        const nodo = el.querySelector(sel);
+        return nodo ? nodo.innerText : null;
+    };
+    const img = el.querySelector('img');
+    return {
+        nombre: texto(nombre),
+        marca: texto(marca),
+        precio: texto(precios),
+        href: el.getAttribute('href'),
+        imagen: img ? img.getAttribute('src') : null,
+    };
+})
+"""
+ARGS_TARJETAS_SANTA = {
+    'contenedor': SELECTOR_PRODUCTO_CLAVE,
+    'nombre': SELECTOR_NOMBRE,
+    'marca': SELECTOR_MARCA,
+    'precios': SELECTOR_PRECIOS,
+}
+
+# Los mismos campos, declarados para el parser de HTML estático (motor/html_estatico.py)
+CAMPOS_HTML_SANTA = {
+    'contenedor': SELECTOR_PRODUCTO_CLAVE,
+    'campos': {
+        'nombre': (SELECTOR_NOMBRE, 'texto'),
+        'marca': (SELECTOR_MARCA, 'texto'),
+        'precio': (SELECTOR_PRECIOS, 'texto'),
+        'href': ('', '@href'),
+        'imagen': ('img', '@src'),
+    },
+}
+
+# --- PREPARACIÓN: COOKIES ---
+# Con una sesión vigente el banner de cookies no vuelve a aparecer.
+PREPARACION_SANTA = {
+    'pasos': [
+        {'accion': 'clic', 'selector': SELECTOR_ACEPTAR_COOKIES, 'timeout': 10000, 'opcional': True},
+        {'accion': 'esperar_oculto', 'selector': SELECTOR_ACEPTAR_COOKIES, 'timeout': 5000},
+    ],
+    'sesion_valida': {'ausente': SELECTOR_ACEPTAR_COOKIES, 'espera_ausente': 1500},
+}
+
+# --- PAGINACIÓN ---
+# Ajustes del motor de scroll (reemplaza la espera fija de 5s tras cargar)
+AJUSTES_SCROLL_SANTA = {
+    'plazo_total': 60,
+    'espera_max_paso': 4,
+    'pasos_sin_cambio': 1,
+    'rebote': 400,
+}
+
+# --- FUNCIONES CENTRALES ---
+
+def leer_tarjetas_locator(page):
+    registros = []
+    for contenedor in page.locator(SELECTOR_PRODUCTO_CLAVE).all():
+        try:
+            registros.append({
+                'nombre': contenedor.locator(SELECTOR_NOMBRE).inner_text(),
+                'marca': contenedor.locator(SELECTOR_MARCA).inner_text(),
+                'precio': contenedor.locator(SELECTOR_PRECIOS).inner_text(),
+                'href': contenedor.get_attribute('href'),
+                'imagen': contenedor.locator('img').first.get_attribute('src'),
+            })
+        except Exception:
+            continue
+    return registros
+
+
+def construir_producto(registro):
+    """
+    Convierte un registro crudo de tarjeta en el diccionario de producto.
+    El bloque de precios (oferta, normal y por unidad) queda como texto para
+    motor/precios.py.
+    """
+    if not registro.get('nombre') or not registro.get('marca') or registro.get('precio') is None:
+        return None
+
+    # Procesamiento
+    nombre = registro['nombre'].strip()
+    marca = registro['marca'].strip()
+    url_origen = URL_BASE + registro['href']
+    imagen_url = registro.get('imagen')
+
+    return {
+        'supermercado': NOMBRE_SUPER,
+        'nombre': f"{marca} - {nombre}",
+        'marca': marca,
+        'nombre_corto': nombre,
+        'precio_texto': registro['precio'],
+        'url_origen': url_origen,
+        'imagen_url': imagen_url if imagen_url and imagen_url.startswith('http') else None,
+        'fecha_actualizacion': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def productos_desde_registros(registros, url):
+    productos = []
+    # Construir los productos a partir de los registros crudos
+    for registro in registros:
+        try:
+            producto = construir_producto(registro)
+            if producto:
+                productos.append(producto)
+        except Exception:
+            continue
+    return productos
+
+
+def productos_desde_json(payload, url):
+    """
+    Arma los productos desde el JSON del catálogo con el precio exacto
+    de commertialOffer (sin truncar).
+    """
+    productos = []
+    for item in buscar_objetos(payload, lambda obj: 'productName' in obj and 'linkText' in obj):
+        try:
+            sku = item['items'][0]
+            oferta = sku['sellers'][0]['commertialOffer']
+            precio_entero = precio_a_entero(oferta.get('Price'))
+            precio_regular = precio_a_entero(oferta.get('ListPrice'))
+            imagenes = sku.get('images') or [{}]
+        except (KeyError, IndexError, TypeError):
+            continue
+
+        if not precio_entero:
+            continue
+
+        nombre = item['productName'].strip()
+        marca = (item.get('brand') or "").strip()
+        imagen_url = imagenes[0].get('imageUrl')
+        productos.append({
+            'supermercado': NOMBRE_SUPER,
+            'nombre': f"{marca} - {nombre}",
+            'marca': marca,
+            'nombre_corto': nombre,
+            'precio_clp': precio_entero,
+            'precio_regular': precio_regular,
+            'url_origen': f"{URL_BASE}/{item['linkText']}/p",
+            'imagen_url': imagen_url if imagen_url and imagen_url.startswith('http') else None,
+            'fecha_actualizacion': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
+    return productos
+
+
+ADAPTADOR = {
+    'nombre': NOMBRE_SUPER,
+    'super_id': SUPERMERCADO_ID,
+    'url_base': URL_BASE,
+    'categorias': [URL_OBJETIVO],
+    'descubrimiento': DESCUBRIMIENTO_SANTA,
+    'campos_huella': ['href', 'precio'],
+    'cosecha': {'campo_id': 'href'},
+    'selector_tarjetas': SELECTOR_PRODUCTO_CLAVE,
+    'ajustes_scroll': AJUSTES_SCROLL_SANTA,
+    'js_lote': JS_TARJETAS_SANTA,
+    'args_lote': ARGS_TARJETAS_SANTA,
+    'campos_html': CAMPOS_HTML_SANTA,
+    'leer_locator': leer_tarjetas_locator,
+    'productos_desde_registros': productos_desde_registros,
+    'patrones_api': PATRONES_API_SANTA,
+    'productos_desde_json': productos_desde_json,
+    'reglas_bloqueo': REGLAS_BLOQUEO_SANTA,
+    'preparacion': PREPARACION_SANTA,
+    'sesion': ('santa_isabel', ''),
+    'dedup': ['url_origen'],
+    # El nombre que escribía scraper_supermercado_santa.py y que leen los procesos siguientes
+    'archivo_salida': "santa_isabel_.json",
+}
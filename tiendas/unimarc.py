@@ -0,0 +1,247 @@
+from datetime import datetime
+
+from motor.captura_red import buscar_objetos, precio_a_entero
+
+# --- CONFIGURACIÓN UNIMARC ---
+SUPERMERCADO_ID_UNIMARC = 2
+URL_BASE_UNIMARC = "https://www.unimarc.cl"
+# URL OBJETIVO (Arroz y Legumbres)
+URL_OBJETIVO_UNIMARC = "https://www.unimarc.cl/category/despensa/arroz-y-legumbres"
+NOMBRE_SUPER_UNIMARC = "Unimarc"
+
+# 🛑 USER AGENT (Vital para evitar bloqueos)
+USER_AGENT_PERSONALIZADO = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# --- SELECTORES ---
+# Buscamos enlaces que lleven a productos, ignorando banners u otros links
+SELECTOR_CARD_LINK = 'a[href^="/product/"]'
+# Selector genérico por si encontramos el ID del precio
+SELECTOR_PRECIO_ID = '[id^="ListPrice"]'
+# El link es hijo del contenedor; subimos 4 niveles para llegar al bloque con nombre y precio
+XPATH_CONTENEDOR = './ancestor::div[4]'
+
+# --- CAPTURA DE RED ---
+# La grilla se alimenta del BFF de Unimarc (productos con name, detailUrl y sellers).
+PATRONES_API_UNIMARC = ['bff-unimarc-ecommerce.unimarc.cl', '/catalog/product/search']
+
+# --- DESCUBRIMIENTO DE CATEGORÍAS ---
+DESCUBRIMIENTO_UNIMARC = {
+    'fuentes': [
+        {'tipo': 'sitemap', 'url': URL_BASE_UNIMARC + "/sitemap.xml", 'incluir': 'categor'},
+        {'tipo': 'menu', 'url': URL_BASE_UNIMARC, 'abrir': 'button:has-text("Categorías")',
+         'enlaces': 'a[href^="/category/"]'},
+    ],
+    'patron': r'^/category/(?P<ruta>[a-z0-9-]+(?:/[a-z0-9-]+)*)$',
+}
+
+# --- BLOQUEO DE RECURSOS ---
+REGLAS_BLOQUEO_UNIMARC = {
+    'permitir': PATRONES_API_UNIMARC,
+}
+
+# Se ejecuta una sola vez dentro de la página y devuelve registros planos.
+# Replica la búsqueda de precio: primero por ID y luego cualquier texto "$...".
+# Se lee el bloque que lo contiene para traer también el precio normal y el por unidad.
+JS_TARJETAS_UNIMARC = r"""
+({enlace, precioId, xpathContenedor}) => {
+    const regexPrecio = /\$\s?[\d\.]+/;
+    const buscarPrecioTexto = (raiz) => {
+        const walker = document.createTreeWalker(raiz, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            if (regexPrecio.test(walker.currentNode.textContent)) {
+                return walker.currentNode.parentElement;
+            }
+        }
+        return null;
+    };
+    return Array.from(document.querySelectorAll(enlace), (link) => {
+        const contenedor = document.evaluate(
+            xpathContenedor, link, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        let precioEl = null;
+        if (contenedor) {
+            precioEl = contenedor.querySelector(precioId) || buscarPrecioTexto(contenedor);
+        }
+        const img = link.querySelector('img');
+        return {
+            href: link.getAttribute('href'),
+            titulo: link.getAttribute('title'),
+            img_alt: img ? img.getAttribute('alt') : null,
+            precio: precioEl ? (precioEl.parentElement || precioEl).innerText : null,
+            imagen: img ? img.getAttribute('src') : null,
+        };
+    });
+}
+"""
+ARGS_TARJETAS_UNIMARC = {
+    'enlace': SELECTOR_CARD_LINK,
+    'precioId': SELECTOR_PRECIO_ID,
+    'xpathContenedor': XPATH_CONTENEDOR,
+}
+
+# Los mismos campos, declarados para el parser de HTML estático (motor/html_estatico.py)
+CAMPOS_HTML_UNIMARC = {
+    'contenedor': SELECTOR_CARD_LINK,
+    'campos': {
+        'href': ('', '@href'),
+        'titulo': ('', '@title'),
+        'img_alt': ('img', '@alt'),
+        'precio': [
+            ('xpath:' + XPATH_CONTENEDOR + '//*[starts-with(@id, "ListPrice")]/..', 'texto'),
+            ('xpath:' + XPATH_CONTENEDOR + '//*[contains(text(), "$")]/..', 'texto'),
+        ],
+        'imagen': ('img', '@src'),
+    },
+}
+
+# --- PAGINACIÓN ---
+# Lazy load puro, sin botón
+AJUSTES_SCROLL_UNIMARC = {
+    'plazo_total': 90,
+    'espera_max_paso': 4,
+    'pasos_sin_cambio': 3,
+    'rebote': 400,
+}
+
+# --- LECTURA DE TARJETAS ---
+def leer_tarjetas_locator(page):
+    registros = []
+    hrefs_vistos = set()
+    for link in page.locator(SELECTOR_CARD_LINK).all():
+        try:
+            href = link.get_attribute('href')
+            if not href or href in hrefs_vistos or "/product/" not in href:
+                continue
+            hrefs_vistos.add(href)
+
+            # --- BÚSQUEDA DEL CONTENEDOR ---
+            contenedor_padre = link.locator(f'xpath={XPATH_CONTENEDOR}').first
+
+            # Intento 1: Buscar por ID (ListPrice...)
+            precio_elem = contenedor_padre.locator(SELECTOR_PRECIO_ID).first
+            # Intento 2: Buscar visualmente cualquier texto con formato "$..."
+            # Usamos r"" y la sintaxis text=/regex/ de Playwright
+            if precio_elem.count() == 0:
+                precio_elem = contenedor_padre.locator(r"text=/\$\s?[\d\.]+/").first
+            # El bloque padre trae también el precio normal y el por unidad
+            bloque_precio = precio_elem.locator('xpath=..')
+
+            img = link.locator('img').first
+            tiene_img = img.count() > 0
+            registros.append({
+                'href': href,
+                'titulo': link.get_attribute('title'),
+                'img_alt': img.get_attribute('alt') if tiene_img else None,
+                'precio': bloque_precio.inner_text() if precio_elem.count() > 0 else None,
+                'imagen': img.get_attribute('src') if tiene_img else None,
+            })
+        except Exception:
+            continue
+    return registros
+
+def construir_producto(registro):
+    """Convierte un registro crudo de tarjeta en el diccionario de producto."""
+    full_url = URL_BASE_UNIMARC + registro['href']
+
+    # A. Nombre
+    nombre = registro.get('titulo') or registro.get('img_alt')
+    if not nombre:
+        return None
+
+    # B. Precio: el texto del bloque lo parsea motor/precios.py
+    if not registro.get('precio'):
+        return None
+
+    # C. Otros Datos
+    marca = nombre.split(" ")[0] if nombre else "Genérica"
+
+    return {
+        'supermercado': NOMBRE_SUPER_UNIMARC,
+        'nombre': nombre,
+        'marca': marca,
+        'nombre_corto': nombre,
+        'precio_texto': registro['precio'],
+        'url_origen': full_url,
+        'imagen_url': registro.get('imagen') or "",
+        'disponible': True,
+        'fecha_actualizacion': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+def productos_desde_registros(registros, url):
+    productos = []
+    urls_procesadas = set()
+
+    for registro in registros:
+        try:
+            href = registro.get('href')
+            # Filtros de seguridad para evitar duplicados o links rotos
+            if not href or href in urls_procesadas or "/product/" not in href:
+                continue
+
+            urls_procesadas.add(href)
+
+            producto = construir_producto(registro)
+            # Guardar solo si encontramos precio válido
+            if producto:
+                productos.append(producto)
+
+        except Exception:
+            continue
+    return productos
+
+# --- LECTURA DESDE LA API ---
+def productos_desde_json(payload, url):
+    """Arma los productos desde el JSON del BFF con el precio exacto del seller."""
+    productos = []
+    for item in buscar_objetos(payload, lambda obj: 'detailUrl' in obj and 'name' in obj):
+        vendedor = (item.get('sellers') or [{}])[0]
+        precio_entero = precio_a_entero(vendedor.get('price', item.get('price')))
+        precio_regular = precio_a_entero(vendedor.get('listPrice'))
+        nombre = (item.get('name') or "").strip()
+        if not nombre or not precio_entero:
+            continue
+
+        imagenes = item.get('images') or [""]
+        imagen_url = imagenes[0] if isinstance(imagenes[0], str) else imagenes[0].get('imageUrl', "")
+        disponible = vendedor.get('availableQuantity', 1) > 0
+
+        productos.append({
+            'supermercado': NOMBRE_SUPER_UNIMARC,
+            'nombre': nombre,
+            'marca': item.get('brand') or nombre.split(" ")[0],
+            'nombre_corto': nombre,
+            'precio_clp': precio_entero,
+            'precio_regular': precio_regular,
+            'url_origen': URL_BASE_UNIMARC + item['detailUrl'],
+            'imagen_url': imagen_url or "",
+            'disponible': disponible,
+            'fecha_actualizacion': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
+    return productos
+
+ADAPTADOR = {
+    'nombre': NOMBRE_SUPER_UNIMARC,
+    'super_id': SUPERMERCADO_ID_UNIMARC,
+    'url_base': URL_BASE_UNIMARC,
+    'categorias': [URL_OBJETIVO_UNIMARC],
+    'descubrimiento': DESCUBRIMIENTO_UNIMARC,
+    'campos_huella': ['href', 'precio'],
+    # El contenedor de ARGS_TARJETAS_UNIMARC se llama 'enlace'
+    'cosecha': {'campo_id': 'href', 'arg_contenedor': 'enlace'},
+    'user_agent': USER_AGENT_PERSONALIZADO,
+    'viewport': {'width': 1366, 'height': 800},
+    'selector_tarjetas': SELECTOR_CARD_LINK,
+    'espera_tarjetas_ms': 20000,
+    'ajustes_scroll': AJUSTES_SCROLL_UNIMARC,
+    'js_lote': JS_TARJETAS_UNIMARC,
+    'args_lote': ARGS_TARJETAS_UNIMARC,
+    'campos_html': CAMPOS_HTML_UNIMARC,
+    'leer_locator': leer_tarjetas_locator,
+    'productos_desde_registros': productos_desde_registros,
+    'patrones_api': PATRONES_API_UNIMARC,
+    'productos_desde_json': productos_desde_json,
+    'reglas_bloqueo': REGLAS_BLOQUEO_UNIMARC,
+    'dedup': ['nombre_corto', 'precio_clp'],
+    # El nombre que escribía scraper_supermercado_unimarc.py y que leen los procesos siguientes
+    'archivo_salida': "unimarc_arroz_final.json",
+}